@@ -16,11 +16,21 @@ Supported Models:
     - Claude Haiku 4.5 (Completion/Autocomplete)
     - Claude Haiku 3.5 (Code Apply/Edits - Cheapest)
     - Meta Llama 3 70B Instruct (Open Source Coding)
+
+Components can be switched off with the enable_bedrock, enable_budget and
+enable_monitoring config flags. Provisioned Throughput and application
+inference profiles are only created for models listed in the
+provisioned_throughput and inference_profiles config objects; invocation
+logging, the bedrock-runtime VPC endpoint, the hosted LiteLLM proxy and its
+shared cache are opt-in with enable_invocation_logging, enable_vpc_endpoint,
+enable_proxy_service and enable_cache. Each component module is imported only when it is enabled,
+so previewing one component does not load the others' provider modules.
+Set profile_imports to log an -X importtime style profile per component.
 """
 
-from components.bedrock import create_bedrock_iam_stack
-from components.budget import create_budget_stack
 from utils.config import load_config, validate_config
+from utils.models import CATALOG
+from utils.profiling import profile_imports
 
 import pulumi
 
@@ -54,56 +64,223 @@ def main():
     pulumi.log.info("  - Meta Llama 3 70B Instruct (Open Source Coding)")
     pulumi.log.info("=" * 70)
 
+    # ==========================================================================
+    # Bedrock Provisioned Throughput (optional, billed hourly)
+    # ==========================================================================
+
+    provisioned = None
+    if config["provisioned_throughput"]:
+        pulumi.log.info("Creating Bedrock Provisioned Throughput...")
+
+        with profile_imports("components.provisioned_throughput", config["profile_imports"]):
+            from components.provisioned_throughput import (
+                create_provisioned_throughput_stack,
+            )
+
+            provisioned = create_provisioned_throughput_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                throughput=config["provisioned_throughput"],
+                tags=config.get("tags", {}),
+            )
+
+    # ==========================================================================
+    # Application Inference Profiles (optional, per-model routing)
+    # ==========================================================================
+
+    profiles = None
+    if config["inference_profiles"]:
+        pulumi.log.info("Creating application inference profiles...")
+
+        with profile_imports("components.inference_profiles", config["profile_imports"]):
+            from components.inference_profiles import create_inference_profiles_stack
+
+            profiles = create_inference_profiles_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                profiles=config["inference_profiles"],
+                tags=config.get("tags", {}),
+            )
+
+    # ==========================================================================
+    # Bedrock PrivateLink Endpoint (optional)
+    # ==========================================================================
+
+    extra_grants = (provisioned["grants"] if provisioned else []) + (profiles["grants"] if profiles else [])
+    profiled_models = tuple(config["inference_profiles"])
+
+    vpc_endpoint = None
+    if config["enable_vpc_endpoint"]:
+        pulumi.log.info("Creating bedrock-runtime VPC endpoint...")
+
+        with profile_imports("components.vpc_endpoint", config["profile_imports"]):
+            from components.vpc_endpoint import create_vpc_endpoint_stack
+
+            vpc_endpoint = create_vpc_endpoint_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                network=config["network"],
+                tags=config.get("tags", {}),
+                extra_grants=extra_grants,
+                profiled_models=profiled_models,
+            )
+
     # ==========================================================================
     # AWS Bedrock IAM Setup
     # ==========================================================================
 
-    pulumi.log.info("Creating Bedrock IAM resources...")
+    bedrock = None
+    if config["enable_bedrock"]:
+        pulumi.log.info("Creating Bedrock IAM resources...")
+
+        with profile_imports("components.bedrock", config["profile_imports"]):
+            from components.bedrock import create_bedrock_iam_stack
+
+            bedrock = create_bedrock_iam_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                tags=config.get("tags", {}),
+                extra_grants=extra_grants,
+                profiled_models=profiled_models,
+                source_vpce=(
+                    vpc_endpoint["endpoint_id"] if vpc_endpoint and config["network"].get("require_source_vpce") else None
+                ),
+            )
+    else:
+        pulumi.log.info("Bedrock IAM component disabled (enable_bedrock=false)")
+
+    # ==========================================================================
+    # Shared Response Cache (optional, ElastiCache Valkey)
+    # ==========================================================================
+
+    cache = None
+    if config["enable_cache"]:
+        pulumi.log.info("Creating shared LiteLLM response cache...")
+
+        with profile_imports("components.cache", config["profile_imports"]):
+            from components.cache import create_cache_stack
+
+            cache = create_cache_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                network=config["network"],
+                settings=config["cache"],
+                tags=config.get("tags", {}),
+            )
+
+    # ==========================================================================
+    # LiteLLM Proxy Service (optional, ECS Fargate)
+    # ==========================================================================
+
+    proxy_service = None
+    if config["enable_proxy_service"]:
+        pulumi.log.info("Creating LiteLLM proxy service...")
 
-    bedrock = create_bedrock_iam_stack(
-        project_name=config["project_name"],
-        region=config["region"],
-        tags=config.get("tags", {}),
-    )
+        with profile_imports("components.proxy_service", config["profile_imports"]):
+            from components.proxy_service import create_proxy_service_stack
+
+            proxy_service = create_proxy_service_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                network=config["network"],
+                settings=config["proxy_service"],
+                bedrock_policies=bedrock["bedrock_managed_policies"],
+                tags=config.get("tags", {}),
+                environment=cache["environment"] if cache else None,
+                cache=cache is not None,
+            )
 
     # ==========================================================================
     # AWS Budget Setup
     # ==========================================================================
 
-    pulumi.log.info("Creating AWS Budget for cost monitoring...")
+    budget = None
+    if config["enable_budget"]:
+        pulumi.log.info("Creating AWS Budget for cost monitoring...")
+
+        with profile_imports("components.budget", config["profile_imports"]):
+            from components.budget import create_budget_stack
+
+            budget = create_budget_stack(
+                project_name=config["project_name"],
+                email=config["budget_alert_email"],
+                tags=config.get("tags", {}),
+            )
+    else:
+        pulumi.log.info("Budget component disabled (enable_budget=false)")
+
+    # ==========================================================================
+    # CloudWatch Monitoring
+    # ==========================================================================
+
+    monitoring = None
+    if config["enable_monitoring"]:
+        pulumi.log.info("Creating CloudWatch dashboard and alarms...")
+
+        with profile_imports("components.monitoring", config["profile_imports"]):
+            from components.monitoring import create_monitoring_stack
+
+            monitoring = create_monitoring_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                alarm_topic_arn=budget["budget_topic_arn"] if budget else None,
+                thresholds=config["monitoring"],
+                tags=config.get("tags", {}),
+            )
+    else:
+        pulumi.log.info("Monitoring component disabled (enable_monitoring=false)")
+
+    # ==========================================================================
+    # Bedrock Invocation Logging (optional)
+    # ==========================================================================
+
+    invocation_logging = None
+    if config["enable_invocation_logging"]:
+        pulumi.log.info("Creating Bedrock invocation logging pipeline...")
+
+        with profile_imports("components.invocation_logging", config["profile_imports"]):
+            from components.invocation_logging import create_invocation_logging_stack
 
-    budget = create_budget_stack(
-        project_name=config["project_name"],
-        email=config["budget_alert_email"],
-        tags=config.get("tags", {}),
-    )
+            invocation_logging = create_invocation_logging_stack(
+                project_name=config["project_name"],
+                region=config["region"],
+                settings=config["invocation_logging"],
+                tags=config.get("tags", {}),
+            )
 
     # ==========================================================================
     # Exports
     # ==========================================================================
 
-    pulumi.export("iam_user_name", bedrock["iam_user_name"])
-    pulumi.export("iam_user_arn", bedrock["iam_user_arn"])
-    pulumi.export("access_key_id", bedrock["access_key_id"])
-    pulumi.export("secret_access_key", bedrock["secret_access_key"])
+    if bedrock:
+        pulumi.export("iam_user_name", bedrock["iam_user_name"])
+        pulumi.export("iam_user_arn", bedrock["iam_user_arn"])
+        pulumi.export("access_key_id", bedrock["access_key_id"])
+        pulumi.export("secret_access_key", bedrock["secret_access_key"])
     pulumi.export("region", config["region"])
-    pulumi.export("budget_topic_arn", budget["budget_topic_arn"])
-    pulumi.export("budget_id", budget["budget_id"])
-    pulumi.export(
-        "models",
-        {
-            "opus": "anthropic.claude-opus-4-6-v1",
-            "sonnet": "anthropic.claude-sonnet-4-6",
-            "sonnet_4_5": "anthropic.claude-sonnet-4-5-20250929-v1:0",
-            "haiku": "anthropic.claude-haiku-4-5-20251001-v1:0",
-            "haiku_3_5": "anthropic.claude-3-5-haiku-20241022-v1:0",
-            "llama3_70b": "meta.llama3-70b-instruct-v1:0",
-            "titan_embed": "amazon.titan-embed-text-v2:0",
-            "titan_image": "amazon.titan-image-generator-v2:0",
-            "cohere_rerank": "cohere.rerank-v3-5:0",
-            "kimi_k2_5": "moonshotai.kimi-k2.5",
-        },
-    )
+    if provisioned:
+        pulumi.export("provisioned_model_arns", provisioned["provisioned_model_arns"])
+    if vpc_endpoint:
+        pulumi.export("bedrock_vpc_endpoint_id", vpc_endpoint["endpoint_id"])
+    if cache:
+        pulumi.export("cache_host", cache["host"])
+        pulumi.export("cache_port", cache["port"])
+    if proxy_service:
+        pulumi.export("proxy_url", proxy_service["proxy_url"])
+        pulumi.export("proxy_cluster_name", proxy_service["cluster_name"])
+        pulumi.export("proxy_service_name", proxy_service["service_name"])
+    if monitoring:
+        pulumi.export("dashboard_name", monitoring["dashboard_name"])
+    if invocation_logging:
+        pulumi.export("invocation_logs_bucket", invocation_logging["logs_bucket_name"])
+        pulumi.export("invocation_logs_database", invocation_logging["database_name"])
+        pulumi.export("invocation_logs_workgroup", invocation_logging["workgroup_name"])
+    if profiles:
+        pulumi.export("inference_profile_arns", profiles["inference_profile_arns"])
+    if budget:
+        pulumi.export("budget_topic_arn", budget["budget_topic_arn"])
+        pulumi.export("budget_id", budget["budget_id"])
+    pulumi.export("models", {model.key: model.model_id for model in CATALOG})
 
     pulumi.log.info("✓ TrailLens AI infrastructure deployment complete!")
     pulumi.log.info("")
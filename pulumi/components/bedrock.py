@@ -9,7 +9,7 @@ AWS Bedrock IAM component for TrailLens AI infrastructure.
 This component deploys:
 - IAM user for Bedrock access
 - Access keys for authentication
-- Multi-region Bedrock policies:
+- Multi-region Bedrock policies generated from the model catalog:
   - Claude Opus 4.6, Sonnet 4.6, Sonnet 4.5, Haiku 4.5 (ca-central-1)
   - Meta Llama 3 70B Instruct (ca-central-1)
   - Amazon Titan Embed Text V2 (ca-central-1)
@@ -18,14 +18,20 @@ This component deploys:
   - Amazon Titan Image Generator V2 (us-east-1)
 """
 
-import json
+from dataclasses import replace
 
 import pulumi_aws as aws
+from utils.models import CATALOG
+from utils.policy import (
+    SOURCE_VPCE_PLACEHOLDER,
+    compile_grants_document,
+    compile_policy_documents,
+)
 
 import pulumi
 
 
-def create_bedrock_iam_stack(project_name, region, tags):
+def create_bedrock_iam_stack(project_name, region, tags, extra_grants=None, profiled_models=(), source_vpce=None):
     """
     Create AWS Bedrock IAM stack for multi-region API access.
 
@@ -37,6 +43,16 @@ def create_bedrock_iam_stack(project_name, region, tags):
         project_name: The project name.
         region: Primary AWS region (ca-central-1).
         tags: Resource tags.
+        extra_grants: Optional (actions, resource ARN Output) pairs for
+            resources created by other components, such as provisioned
+            throughput or inference profiles. They get their own policy because their ARNs are
+            only known after deployment.
+        profiled_models: Catalog keys invoked through application inference
+            profiles. Their system profile grants are dropped, as are the
+            us./global. profile wildcards, so access is scoped to exactly
+            the application profiles in extra_grants.
+        source_vpce: Optional VPC endpoint ID (Output). When set, invoke
+            statements only apply to requests through that endpoint.
 
     Returns:
         dict: Dictionary containing IAM resources and credentials.
@@ -58,173 +74,87 @@ def create_bedrock_iam_stack(project_name, region, tags):
         user=bedrock_user.name,
     )
 
-    # IAM policy covering all supported Bedrock models.
-    # Supports: Opus 4.6, Sonnet 4.6, Sonnet 4.5, Haiku 4.5 (ca-central-1)
-    #           Meta Llama 3 70B Instruct (ca-central-1)
-    #           Titan Embed Text V2 (ca-central-1)
-    #           Cohere Rerank V3.5 (ca-central-1)
-    #           Moonshot Kimi K2.5 (us-east-1)
-    #           Titan Image Generator V2 (us-east-1)
+    # IAM policy covering every model in the catalog (utils/models.py).
+    # The compiler merges and de-duplicates grants and emits compact JSON,
+    # splitting into several policies only if one would exceed the limit.
     #
     # NOTE: aws.iam.UserPolicy (inline) has a hard 2048-byte limit.
-    # Use a managed policy (aws.iam.Policy) instead — limit is 6144 bytes.
-    bedrock_managed_policy = aws.iam.Policy(
-        f"{stack_name}-bedrock-policy",
-        name=f"{stack_name}-bedrock-policy",
-        description="Bedrock model access policy for TrailLens AI",
-        policy=json.dumps(
-            {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Sid": "BedrockModelAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                            "bedrock:InvokeModelWithResponseStream",
-                        ],
-                        "Resource": [
-                            # Opus 4.6
-                            f"arn:aws:bedrock:{region}::foundation-model/anthropic.claude-opus-4-6-v1",
-                            # Sonnet 4.6
-                            f"arn:aws:bedrock:{region}::foundation-model/anthropic.claude-sonnet-4-6",
-                            # Sonnet 4.5
-                            f"arn:aws:bedrock:{region}::foundation-model/anthropic.claude-sonnet-4-5-20250929-v1:0",
-                            # Haiku 4.5
-                            f"arn:aws:bedrock:{region}::foundation-model/anthropic.claude-haiku-4-5-20251001-v1:0",
-                            # Wildcard for future Claude versions
-                            f"arn:aws:bedrock:{region}::foundation-model/anthropic.claude*",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockInferenceProfileAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                            "bedrock:InvokeModelWithResponseStream",
-                        ],
-                        "Resource": [
-                            # Inference profiles (required for 4.6 models)
-                            # All regions — profiles route across regions
-                            "arn:aws:bedrock:*:*:inference-profile/us.anthropic.claude-*",
-                            "arn:aws:bedrock:*:*:inference-profile/global.anthropic.claude-*",
-                            # Underlying foundation models in all regions
-                            "arn:aws:bedrock:*::foundation-model/anthropic.claude-*",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockImageModelAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                        ],
-                        "Resource": [
-                            # Titan Image Generator V2 (us-east-1 only)
-                            "arn:aws:bedrock:us-east-1::foundation-model"
-                            "/amazon.titan-image-generator-v2:0",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockEmbeddingModelAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                        ],
-                        "Resource": [
-                            # Titan Embed Text V2 (ca-central-1)
-                            f"arn:aws:bedrock:{region}::foundation-model"
-                            f"/amazon.titan-embed-text-v2:0",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockRerankModelAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                        ],
-                        "Resource": [
-                            # Cohere Rerank V3.5 (ca-central-1)
-                            f"arn:aws:bedrock:{region}::foundation-model"
-                            f"/cohere.rerank-v3-5:0",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockRerankAccess",
-                        "Effect": "Allow",
-                        "Action": ["bedrock:Rerank"],
-                        # Rerank action requires wildcard resource
-                        "Resource": "*",
-                    },
-                    {
-                        "Sid": "BedrockLlama3Access",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                            "bedrock:InvokeModelWithResponseStream",
-                        ],
-                        "Resource": [
-                            # Meta Llama 3 70B Instruct (ca-central-1)
-                            f"arn:aws:bedrock:{region}::foundation-model"
-                            f"/meta.llama3-70b-instruct-v1:0",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockKimiModelAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:InvokeModel",
-                            "bedrock:InvokeModelWithResponseStream",
-                        ],
-                        "Resource": [
-                            # Kimi K2.5 (us-east-1 only)
-                            "arn:aws:bedrock:us-east-1::foundation-model"
-                            "/moonshotai.kimi-k2.5",
-                        ],
-                    },
-                    {
-                        "Sid": "BedrockModelList",
-                        "Effect": "Allow",
-                        "Action": [
-                            "bedrock:ListFoundationModels",
-                            "bedrock:GetFoundationModel",
-                        ],
-                        "Resource": "*",
-                    },
-                    {
-                        "Sid": "AWSMarketplaceAccess",
-                        "Effect": "Allow",
-                        "Action": [
-                            "aws-marketplace:ViewSubscriptions",
-                            "aws-marketplace:Subscribe",
-                        ],
-                        "Resource": "*",
-                    },
-                ],
-            }
-        ),
-    )
-
-    # Attach the managed policy to the user.
-    bedrock_policy = aws.iam.UserPolicyAttachment(
-        f"{stack_name}-bedrock-policy-attachment",
-        user=bedrock_user.name,
-        policy_arn=bedrock_managed_policy.arn,
-    )
+    # Use managed policies (aws.iam.Policy) instead — limit is 6144 bytes.
+    models = [replace(model, profile_prefix=None) if model.key in profiled_models else model for model in CATALOG]
+    # The endpoint ID is only known after deployment. Compile with a
+    # same-length placeholder so the number of policies is fixed now, then
+    # substitute the real ID into each document. Models pinned to another
+    # region (us-east-1) are not reachable through the endpoint, so their
+    # statements stay unconditioned.
+    condition = {"StringEquals": {"aws:SourceVpce": SOURCE_VPCE_PLACEHOLDER}} if source_vpce else None
+    documents = compile_policy_documents(models, region, condition=condition, system_profiles=not profiled_models)
+
+    bedrock_managed_policies = []
+    bedrock_policies = []
+    for index, document in enumerate(documents):
+        # The first shard keeps the original resource names so existing
+        # stacks update in place rather than replacing the policy.
+        suffix = "" if index == 0 else f"-{index + 1}"
+        managed_policy = aws.iam.Policy(
+            f"{stack_name}-bedrock-policy{suffix}",
+            name=f"{stack_name}-bedrock-policy{suffix}",
+            description="Bedrock model access policy for TrailLens AI",
+            policy=(
+                pulumi.Output.from_input(source_vpce).apply(
+                    lambda vpce, document=document: document.replace(SOURCE_VPCE_PLACEHOLDER, vpce)
+                )
+                if source_vpce
+                else document
+            ),
+        )
+        bedrock_managed_policies.append(managed_policy)
+
+        # Attach the managed policy to the user.
+        bedrock_policies.append(
+            aws.iam.UserPolicyAttachment(
+                f"{stack_name}-bedrock-policy-attachment{suffix}",
+                user=bedrock_user.name,
+                policy_arn=managed_policy.arn,
+            )
+        )
+
+    if extra_grants:
+        resource_arns = pulumi.Output.all(source_vpce, *[resource for _, resource in extra_grants])
+        resource_policy = aws.iam.Policy(
+            f"{stack_name}-bedrock-resource-policy",
+            name=f"{stack_name}-bedrock-resource-policy",
+            description="Bedrock access to TrailLens AI provisioned resources",
+            policy=resource_arns.apply(
+                lambda values: compile_grants_document(
+                    [(actions, arn) for (actions, _), arn in zip(extra_grants, values[1:])],
+                    condition={"StringEquals": {"aws:SourceVpce": values[0]}} if values[0] else None,
+                    region=region,
+                )
+            ),
+        )
+        bedrock_managed_policies.append(resource_policy)
+        bedrock_policies.append(
+            aws.iam.UserPolicyAttachment(
+                f"{stack_name}-bedrock-resource-policy-attachment",
+                user=bedrock_user.name,
+                policy_arn=resource_policy.arn,
+            )
+        )
 
     pulumi.log.info("✓ IAM user and policies created")
     bedrock_user.name.apply(lambda name: pulumi.log.info(f"  User: {name}"))
-    pulumi.log.info(
-        "  Models: Opus 4.6, Sonnet 4.6, Sonnet 4.5, Haiku 4.5, "
-        "Llama 3 70B, Titan Embed V2, Cohere Rerank V3.5, Kimi K2.5"
-    )
+    pulumi.log.info(f"  Models: {', '.join(model.name for model in CATALOG)}")
+    pulumi.log.info(f"  Policies: {len(documents)} ({', '.join(str(len(doc)) for doc in documents)} bytes)")
 
     # Return resources
     return {
         "iam_user": bedrock_user,
         "iam_user_name": bedrock_user.name,
         "iam_user_arn": bedrock_user.arn,
-        "bedrock_managed_policy": bedrock_managed_policy,
-        "bedrock_policy": bedrock_policy,
+        "bedrock_managed_policy": bedrock_managed_policies[0],
+        "bedrock_policy": bedrock_policies[0],
+        "bedrock_managed_policies": bedrock_managed_policies,
+        "bedrock_policies": bedrock_policies,
         "access_key_id": access_key.id,
         "secret_access_key": access_key.secret,
     }
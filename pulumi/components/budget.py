@@ -8,6 +8,7 @@ AWS Budget component for TrailLens AI infrastructure.
 
 This component creates:
 - SNS topic for budget alerts with correct budgets.amazonaws.com publish policy
+  (also used by the CloudWatch alarms in components/monitoring.py)
 - Email subscription for notifications
 - AWS Budget with $100/month threshold covering ALL Bedrock-billed services
 - Alerts at 40%, 60%, 80%, 100%, 150%, and 200% of budget (actual spend)
@@ -57,10 +58,10 @@ def create_budget_stack(project_name, email, tags):
         tags={**tags, "Name": f"{stack_name}-budget-alerts"},
     )
 
-    # Attach a resource policy granting both budgets.amazonaws.com and
-    # costalerts.amazonaws.com permission to publish to this topic.
-    # Only one TopicPolicy resource is allowed per SNS topic — both service
-    # principals must be in the same policy document.
+    # Attach a resource policy granting budgets.amazonaws.com,
+    # costalerts.amazonaws.com and cloudwatch.amazonaws.com permission to
+    # publish to this topic. Only one TopicPolicy resource is allowed per SNS
+    # topic — all service principals must be in the same policy document.
     budget_topic_policy = aws.sns.TopicPolicy(
         f"{stack_name}-budget-topic-policy",
         arn=budget_topic.arn,
@@ -97,6 +98,21 @@ def create_budget_stack(project_name, email, tags):
                                 },
                             },
                         },
+                        {
+                            # Latency/throttle alarms from components/monitoring.py.
+                            "Sid": "AllowCloudWatchAlarmsPublish",
+                            "Effect": "Allow",
+                            "Principal": {
+                                "Service": "cloudwatch.amazonaws.com",
+                            },
+                            "Action": "SNS:Publish",
+                            "Resource": arn,
+                            "Condition": {
+                                "StringEquals": {
+                                    "aws:SourceAccount": account_id,
+                                },
+                            },
+                        },
                         {
                             "Sid": "AllowAccountOwner",
                             "Effect": "Allow",
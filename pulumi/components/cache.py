@@ -0,0 +1,141 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Shared response cache component for TrailLens AI infrastructure.
+
+This component creates, in the network VPC:
+- An ElastiCache Valkey replication group (Redis-compatible) with TLS in
+  transit and encryption at rest
+- A parameter group carrying the eviction policy
+- A subnet group over the private subnets
+- A security group allowing port 6379 from the VPC CIDR
+
+LiteLLM's response cache (litellm_settings.cache_params) reads its host and
+port from REDIS_HOST/REDIS_PORT. The hosted proxy gets this endpoint, so every
+developer using it shares one warm cache instead of a cold local container.
+
+Settings come from the cache config object (all optional):
+
+    traillens-ai:cache:
+      node_type: cache.t4g.small
+      nodes: 2                         # primary + replicas; >1 enables failover
+      maxmemory_policy: allkeys-lru
+"""
+
+import pulumi_aws as aws
+
+import pulumi
+
+CACHE_PORT = 6379
+
+DEFAULTS = {
+    "node_type": "cache.t4g.small",
+    "nodes": 2,
+    # Every entry is a re-creatable completion, so evict rather than reject
+    # writes when memory is full.
+    "maxmemory_policy": "allkeys-lru",
+    "engine_version": "8.0",
+}
+
+
+def create_cache_stack(project_name, region, network, settings, tags):
+    """
+    Create the shared Valkey cache for the LiteLLM proxy.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        network: The network config object (vpc_id, private_subnet_ids).
+        settings: The cache config object; see DEFAULTS.
+        tags: Resource tags.
+
+    Returns:
+        dict: Dictionary containing the replication group and its endpoint.
+    """
+    stack_name = f"{project_name}-ai"
+    settings = {**DEFAULTS, **settings}
+
+    pulumi.log.info(f"Creating shared cache stack: {stack_name}")
+
+    vpc = aws.ec2.get_vpc(id=network["vpc_id"])
+
+    security_group = aws.ec2.SecurityGroup(
+        f"{stack_name}-cache-sg",
+        name=f"{stack_name}-cache",
+        description="LiteLLM response cache",
+        vpc_id=network["vpc_id"],
+        ingress=[
+            {
+                "description": "Valkey from the VPC",
+                "protocol": "tcp",
+                "from_port": CACHE_PORT,
+                "to_port": CACHE_PORT,
+                "cidr_blocks": [vpc.cidr_block],
+            }
+        ],
+        tags={**tags, "Name": f"{stack_name}-cache"},
+    )
+
+    subnet_group = aws.elasticache.SubnetGroup(
+        f"{stack_name}-cache-subnets",
+        name=f"{stack_name}-cache",
+        description="Private subnets for the LiteLLM response cache",
+        subnet_ids=network["private_subnet_ids"],
+        tags={**tags, "Name": f"{stack_name}-cache"},
+    )
+
+    major_version = settings["engine_version"].split(".")[0]
+    parameter_group = aws.elasticache.ParameterGroup(
+        f"{stack_name}-cache-params",
+        name=f"{stack_name}-cache-valkey{major_version}",
+        family=f"valkey{major_version}",
+        description="LiteLLM response cache eviction policy",
+        parameters=[{"name": "maxmemory-policy", "value": settings["maxmemory_policy"]}],
+        tags={**tags, "Name": f"{stack_name}-cache"},
+    )
+
+    failover = settings["nodes"] > 1
+    replication_group = aws.elasticache.ReplicationGroup(
+        f"{stack_name}-cache",
+        replication_group_id=f"{stack_name}-cache",
+        description="Shared LiteLLM response cache",
+        engine="valkey",
+        engine_version=settings["engine_version"],
+        node_type=settings["node_type"],
+        num_cache_clusters=settings["nodes"],
+        automatic_failover_enabled=failover,
+        multi_az_enabled=failover,
+        port=CACHE_PORT,
+        parameter_group_name=parameter_group.name,
+        subnet_group_name=subnet_group.name,
+        security_group_ids=[security_group.id],
+        transit_encryption_enabled=True,
+        transit_encryption_mode="required",
+        at_rest_encryption_enabled=True,
+        # Cached completions are disposable; no snapshots.
+        snapshot_retention_limit=0,
+        apply_immediately=True,
+        tags={**tags, "Name": f"{stack_name}-cache"},
+    )
+
+    pulumi.log.info("✓ Shared cache created")
+    pulumi.log.info(
+        f"  Valkey {settings['engine_version']}: {settings['nodes']} x {settings['node_type']}, "
+        f"{settings['maxmemory_policy']}, TLS"
+    )
+
+    return {
+        "replication_group": replication_group,
+        "security_group": security_group,
+        "host": replication_group.primary_endpoint_address,
+        "port": CACHE_PORT,
+        # Container environment for LiteLLM's cache_params.
+        "environment": {
+            "REDIS_HOST": replication_group.primary_endpoint_address,
+            "REDIS_PORT": str(CACHE_PORT),
+            "REDIS_SSL": "True",
+        },
+    }
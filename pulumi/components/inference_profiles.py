@@ -0,0 +1,90 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Application inference profile component for TrailLens AI infrastructure.
+
+This component creates:
+- One tagged application inference profile per configured catalog model
+- The IAM grants needed to invoke each profile and the foundation models it
+  routes to, returned for the Bedrock IAM component
+
+Routing is chosen per model in the inference_profiles config object:
+
+    traillens-ai:inference_profiles:
+      haiku: in-region       # ca-central-1 only: lowest latency
+      opus: cross-region     # copies the catalog's system profile (us.)
+      sonnet: global         # copies the global. system profile
+
+In-region profiles copy the foundation model in the stack region, so
+requests never leave it. Cross-region and global profiles copy a system
+inference profile and inherit its routing, trading a little latency for
+more capacity. Application profiles also tag usage per model for cost
+allocation.
+"""
+
+import pulumi_aws as aws
+from utils.models import get_model
+
+import pulumi
+
+
+def create_inference_profiles_stack(project_name, region, profiles, tags):
+    """
+    Create application inference profiles for selected catalog models.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        profiles: Dict of catalog model key to routing mode
+            ("in-region", "cross-region" or "global").
+        tags: Resource tags.
+
+    Returns:
+        dict: Dictionary containing the profiles, their ARNs by model key,
+        and the IAM grants needed to invoke them.
+    """
+    stack_name = f"{project_name}-ai"
+
+    pulumi.log.info(f"Creating inference profiles stack: {stack_name}")
+
+    # System inference profile ARNs include the account ID.
+    account_id = aws.get_caller_identity().account_id
+
+    inference_profiles = {}
+    grants = []
+    for key, routing in profiles.items():
+        model = get_model(key)
+        name = f"{stack_name}-{key.replace('_', '-')}"
+
+        if routing == "in-region":
+            source_arn = model.foundation_model_arn(region)
+            model_arns = [source_arn]
+        else:
+            prefix = "global" if routing == "global" else model.profile_prefix or "us"
+            source_arn = f"arn:aws:bedrock:{region}:{account_id}:inference-profile/{prefix}.{model.model_id}"
+            # The profile may route to the model in any of its regions.
+            model_arns = [f"arn:aws:bedrock:*::foundation-model/{model.model_id}"]
+
+        profile = aws.bedrock.InferenceProfile(
+            name,
+            name=name,
+            description=f"{model.name} ({routing}) for TrailLens AI",
+            model_source={"copy_from": source_arn},
+            tags={**tags, "Name": name, "Model": model.model_id, "Routing": routing},
+        )
+        inference_profiles[key] = profile
+        grants.append((model.actions, profile.arn))
+        grants.extend((model.actions, arn) for arn in model_arns)
+
+        pulumi.log.info(f"  {model.name}: {routing}")
+
+    pulumi.log.info("✓ Inference profiles created")
+
+    return {
+        "inference_profiles": inference_profiles,
+        "inference_profile_arns": {key: profile.arn for key, profile in inference_profiles.items()},
+        "grants": grants,
+    }
@@ -0,0 +1,452 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Bedrock model invocation logging component for TrailLens AI infrastructure.
+
+This component creates:
+- A private, encrypted S3 bucket in the stack region with lifecycle rules
+- A bucket policy letting bedrock.amazonaws.com write invocation logs
+- The account-level Bedrock model invocation logging configuration
+- A Glue database with two tables over the logs:
+  - bedrock_invocations_raw: the gzipped JSON records Bedrock writes, with
+    date partition projection, so new days need no crawler or MSCK REPAIR
+  - bedrock_invocations: Parquet, partitioned by date and model
+- An Athena workgroup with a per-query scan limit, and a named query that
+  loads yesterday's raw records into the partitioned table
+- An EventBridge Scheduler schedule that runs that query daily through
+  Athena StartQueryExecution, with a role limited to the workgroup, the
+  Glue tables and the bucket
+
+Bedrock writes logs under
+AWSLogs/<account>/BedrockModelInvocationLogs/<region>/yyyy/MM/dd/HH/, so the
+object keys carry the date but not the model. The daily load copies
+yesterday into the date+model partitioned table, and Athena registers the new
+partitions in Glue as it writes them. Athena cannot overwrite partitions of a
+Hive table, so the query inserts nothing when yesterday is already loaded.
+Re-running it, by hand or from a retried schedule, never duplicates rows.
+To reload a day, delete its curated/ prefix and drop its partitions first.
+
+Only request metadata (token counts, model, caller, errors) is kept by
+default. Prompt and completion bodies contain proprietary source code and are
+logged only when invocation_logging.log_payloads is set.
+"""
+
+import json
+
+import pulumi_aws as aws
+
+import pulumi
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_CURATED_RETENTION_DAYS = 400
+ATHENA_RESULTS_RETENTION_DAYS = 7
+# Stop runaway queries at 1 GB scanned (~$0.005).
+ATHENA_BYTES_SCANNED_CUTOFF = 1024**3
+# 02:30 UTC: Bedrock has delivered the previous day's logs by then.
+DEFAULT_LOAD_SCHEDULE = "cron(30 2 * * ? *)"
+
+LOGS_PREFIX = "invocations"
+CURATED_PREFIX = "curated"
+ATHENA_RESULTS_PREFIX = "athena-results"
+
+RAW_COLUMNS = [
+    {"name": "schematype", "type": "string"},
+    {"name": "schemaversion", "type": "string"},
+    {"name": "timestamp", "type": "string"},
+    {"name": "accountid", "type": "string"},
+    {"name": "region", "type": "string"},
+    {"name": "requestid", "type": "string"},
+    {"name": "operation", "type": "string"},
+    {"name": "modelid", "type": "string"},
+    {"name": "identity", "type": "struct<arn:string>"},
+    {"name": "input", "type": "struct<inputcontenttype:string,inputtokencount:int>"},
+    {"name": "output", "type": "struct<outputcontenttype:string,outputtokencount:int>"},
+    {"name": "errorcode", "type": "string"},
+]
+
+CURATED_COLUMNS = [
+    {"name": "request_time", "type": "timestamp"},
+    {"name": "request_id", "type": "string"},
+    {"name": "operation", "type": "string"},
+    {"name": "identity_arn", "type": "string"},
+    {"name": "region", "type": "string"},
+    {"name": "input_tokens", "type": "int"},
+    {"name": "output_tokens", "type": "int"},
+    {"name": "error_code", "type": "string"},
+]
+
+CURATED_PARTITION_KEYS = [
+    {"name": "dt", "type": "string"},
+    {"name": "model", "type": "string"},
+]
+
+
+def build_load_query(database, raw_table, curated_table):
+    """
+    Build the INSERT that copies yesterday's raw logs into the partitioned table.
+
+    Partition columns must come last, in partition key order. The NOT EXISTS
+    guard makes re-runs for an already loaded day insert nothing.
+    """
+    return f"""INSERT INTO {database}.{curated_table}
+SELECT
+  from_iso8601_timestamp("timestamp") AS request_time,
+  requestid AS request_id,
+  operation,
+  identity.arn AS identity_arn,
+  region,
+  input.inputtokencount AS input_tokens,
+  output.outputtokencount AS output_tokens,
+  errorcode AS error_code,
+  replace(dt, '/', '-') AS dt,
+  modelid AS model
+FROM {database}.{raw_table}
+WHERE dt = date_format(current_date - interval '1' day, '%Y/%m/%d')
+  AND NOT EXISTS (
+    SELECT 1 FROM {database}.{curated_table}
+    WHERE dt = date_format(current_date - interval '1' day, '%Y-%m-%d')
+  )
+"""
+
+
+def create_invocation_logging_stack(project_name, region, settings, tags):
+    """
+    Create the Bedrock invocation logging pipeline.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        settings: The invocation_logging config object with optional
+            retention_days, curated_retention_days, log_payloads and
+            load_schedule (an EventBridge Scheduler expression, in UTC).
+        tags: Resource tags.
+
+    Returns:
+        dict: Dictionary containing the bucket, logging configuration, Glue
+        tables and Athena workgroup.
+    """
+    stack_name = f"{project_name}-ai"
+
+    pulumi.log.info(f"Creating invocation logging stack: {stack_name}")
+
+    account_id = aws.get_caller_identity().account_id
+    bucket_name = f"{stack_name}-bedrock-logs-{account_id}"
+    log_payloads = bool(settings.get("log_payloads", False))
+
+    # ---------------------------------------------------------------------------
+    # S3 bucket
+    # ---------------------------------------------------------------------------
+
+    logs_bucket = aws.s3.Bucket(
+        f"{stack_name}-bedrock-logs",
+        bucket=bucket_name,
+        tags={**tags, "Name": bucket_name},
+    )
+
+    aws.s3.BucketPublicAccessBlock(
+        f"{stack_name}-bedrock-logs-public-access",
+        bucket=logs_bucket.id,
+        block_public_acls=True,
+        block_public_policy=True,
+        ignore_public_acls=True,
+        restrict_public_buckets=True,
+    )
+
+    # SSE-S3 rather than KMS, so Bedrock can write without a key policy.
+    aws.s3.BucketServerSideEncryptionConfiguration(
+        f"{stack_name}-bedrock-logs-encryption",
+        bucket=logs_bucket.id,
+        rules=[{"apply_server_side_encryption_by_default": {"sse_algorithm": "AES256"}}],
+    )
+
+    aws.s3.BucketLifecycleConfiguration(
+        f"{stack_name}-bedrock-logs-lifecycle",
+        bucket=logs_bucket.id,
+        rules=[
+            {
+                "id": "expire-raw-invocation-logs",
+                "status": "Enabled",
+                "filter": {"prefix": f"{LOGS_PREFIX}/"},
+                "transitions": [{"days": 30, "storage_class": "STANDARD_IA"}],
+                "expiration": {"days": settings.get("retention_days", DEFAULT_RETENTION_DAYS)},
+            },
+            {
+                "id": "expire-curated-invocations",
+                "status": "Enabled",
+                "filter": {"prefix": f"{CURATED_PREFIX}/"},
+                "expiration": {"days": settings.get("curated_retention_days", DEFAULT_CURATED_RETENTION_DAYS)},
+            },
+            {
+                "id": "expire-athena-results",
+                "status": "Enabled",
+                "filter": {"prefix": f"{ATHENA_RESULTS_PREFIX}/"},
+                "expiration": {"days": ATHENA_RESULTS_RETENTION_DAYS},
+            },
+        ],
+    )
+
+    # Bedrock validates write access when the logging configuration is set,
+    # so the logging configuration depends on this policy.
+    bucket_policy = aws.s3.BucketPolicy(
+        f"{stack_name}-bedrock-logs-policy",
+        bucket=logs_bucket.id,
+        policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "AllowBedrockInvocationLogs",
+                        "Effect": "Allow",
+                        "Principal": {"Service": "bedrock.amazonaws.com"},
+                        "Action": "s3:PutObject",
+                        "Resource": f"arn:aws:s3:::{bucket_name}/{LOGS_PREFIX}/AWSLogs/{account_id}/*",
+                        "Condition": {
+                            "StringEquals": {"aws:SourceAccount": account_id},
+                            "ArnLike": {"aws:SourceArn": f"arn:aws:bedrock:{region}:{account_id}:*"},
+                        },
+                    },
+                    {
+                        "Sid": "DenyInsecureTransport",
+                        "Effect": "Deny",
+                        "Principal": "*",
+                        "Action": "s3:*",
+                        "Resource": [f"arn:aws:s3:::{bucket_name}", f"arn:aws:s3:::{bucket_name}/*"],
+                        "Condition": {"Bool": {"aws:SecureTransport": "false"}},
+                    },
+                ],
+            }
+        ),
+    )
+
+    # ---------------------------------------------------------------------------
+    # Bedrock invocation logging (one per account and region)
+    # ---------------------------------------------------------------------------
+
+    logging_configuration = aws.bedrockmodel.InvocationLoggingConfiguration(
+        f"{stack_name}-invocation-logging",
+        logging_config={
+            "s3_config": {"bucket_name": bucket_name, "key_prefix": LOGS_PREFIX},
+            "text_data_delivery_enabled": log_payloads,
+            "embedding_data_delivery_enabled": False,
+            "image_data_delivery_enabled": False,
+            "video_data_delivery_enabled": False,
+        },
+        opts=pulumi.ResourceOptions(depends_on=[bucket_policy]),
+    )
+
+    # ---------------------------------------------------------------------------
+    # Glue tables and Athena
+    # ---------------------------------------------------------------------------
+
+    database_name = f"{stack_name}-bedrock-logs".replace("-", "_")
+    raw_table_name = "bedrock_invocations_raw"
+    curated_table_name = "bedrock_invocations"
+    raw_location = f"s3://{bucket_name}/{LOGS_PREFIX}/AWSLogs/{account_id}/BedrockModelInvocationLogs/{region}"
+
+    database = aws.glue.CatalogDatabase(
+        f"{stack_name}-bedrock-logs-db",
+        name=database_name,
+        description="Bedrock model invocation logs for TrailLens AI",
+        tags={**tags, "Name": database_name},
+    )
+
+    raw_table = aws.glue.CatalogTable(
+        f"{stack_name}-bedrock-invocations-raw",
+        name=raw_table_name,
+        database_name=database.name,
+        description="Raw Bedrock invocation logs (gzipped JSON), partitioned by day",
+        table_type="EXTERNAL_TABLE",
+        partition_keys=[{"name": "dt", "type": "string"}],
+        parameters={
+            "EXTERNAL": "TRUE",
+            "classification": "json",
+            "compressionType": "gzip",
+            # Partition projection: Athena derives dt partitions from the
+            # key layout instead of reading them from the catalog.
+            "projection.enabled": "true",
+            "projection.dt.type": "date",
+            "projection.dt.format": "yyyy/MM/dd",
+            "projection.dt.range": "2026/01/01,NOW",
+            "projection.dt.interval": "1",
+            "projection.dt.interval.unit": "DAYS",
+            "storage.location.template": f"{raw_location}/${{dt}}/",
+        },
+        storage_descriptor={
+            "location": f"{raw_location}/",
+            "input_format": "org.apache.hadoop.mapred.TextInputFormat",
+            "output_format": "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat",
+            "ser_de_info": {
+                "serialization_library": "org.openx.data.jsonserde.JsonSerDe",
+                "parameters": {"case.insensitive": "true"},
+            },
+            "columns": RAW_COLUMNS,
+        },
+    )
+
+    curated_table = aws.glue.CatalogTable(
+        f"{stack_name}-bedrock-invocations",
+        name=curated_table_name,
+        database_name=database.name,
+        description="Bedrock invocations (Parquet), partitioned by day and model",
+        table_type="EXTERNAL_TABLE",
+        partition_keys=CURATED_PARTITION_KEYS,
+        parameters={
+            "EXTERNAL": "TRUE",
+            "classification": "parquet",
+            "parquet.compression": "SNAPPY",
+        },
+        storage_descriptor={
+            "location": f"s3://{bucket_name}/{CURATED_PREFIX}/{curated_table_name}/",
+            "input_format": "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat",
+            "output_format": "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat",
+            "ser_de_info": {"serialization_library": "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe"},
+            "columns": CURATED_COLUMNS,
+        },
+    )
+
+    workgroup = aws.athena.Workgroup(
+        f"{stack_name}-bedrock-logs",
+        name=f"{stack_name}-bedrock-logs",
+        description="Queries over Bedrock invocation logs",
+        configuration={
+            "enforce_workgroup_configuration": True,
+            "publish_cloudwatch_metrics_enabled": True,
+            "bytes_scanned_cutoff_per_query": ATHENA_BYTES_SCANNED_CUTOFF,
+            "result_configuration": {
+                "output_location": f"s3://{bucket_name}/{ATHENA_RESULTS_PREFIX}/",
+                "encryption_configuration": {"encryption_option": "SSE_S3"},
+            },
+        },
+        tags={**tags, "Name": f"{stack_name}-bedrock-logs"},
+    )
+
+    load_query = aws.athena.NamedQuery(
+        f"{stack_name}-load-bedrock-invocations",
+        name="load-yesterday-bedrock-invocations",
+        description="Copy yesterday's raw invocation logs into the date/model partitioned table",
+        database=database.name,
+        workgroup=workgroup.name,
+        query=build_load_query(database_name, raw_table_name, curated_table_name),
+    )
+
+    # ---------------------------------------------------------------------------
+    # Daily load
+    # ---------------------------------------------------------------------------
+
+    scheduler_role = aws.iam.Role(
+        f"{stack_name}-bedrock-logs-load-role",
+        name=f"{stack_name}-bedrock-logs-load",
+        assume_role_policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Principal": {"Service": "scheduler.amazonaws.com"},
+                        "Action": "sts:AssumeRole",
+                        "Condition": {"StringEquals": {"aws:SourceAccount": account_id}},
+                    }
+                ],
+            }
+        ),
+        tags={**tags, "Name": f"{stack_name}-bedrock-logs-load"},
+    )
+
+    # Athena runs the query with the scheduler's credentials, so the role
+    # needs the Glue and S3 access of the query itself.
+    glue_arn = f"arn:aws:glue:{region}:{account_id}"
+    aws.iam.RolePolicy(
+        f"{stack_name}-bedrock-logs-load-policy",
+        role=scheduler_role.id,
+        policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": ["athena:StartQueryExecution", "athena:GetQueryExecution"],
+                        "Resource": f"arn:aws:athena:{region}:{account_id}:workgroup/{stack_name}-bedrock-logs",
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": [
+                            "glue:GetDatabase",
+                            "glue:GetTable",
+                            "glue:GetPartition",
+                            "glue:GetPartitions",
+                            "glue:CreatePartition",
+                            "glue:BatchCreatePartition",
+                        ],
+                        "Resource": [
+                            f"{glue_arn}:catalog",
+                            f"{glue_arn}:database/{database_name}",
+                            f"{glue_arn}:table/{database_name}/*",
+                        ],
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": ["s3:GetBucketLocation", "s3:ListBucket"],
+                        "Resource": f"arn:aws:s3:::{bucket_name}",
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": "s3:GetObject",
+                        "Resource": f"arn:aws:s3:::{bucket_name}/*",
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": ["s3:PutObject", "s3:AbortMultipartUpload", "s3:DeleteObject"],
+                        "Resource": [
+                            f"arn:aws:s3:::{bucket_name}/{CURATED_PREFIX}/*",
+                            f"arn:aws:s3:::{bucket_name}/{ATHENA_RESULTS_PREFIX}/*",
+                        ],
+                    },
+                ],
+            }
+        ),
+    )
+
+    load_schedule = aws.scheduler.Schedule(
+        f"{stack_name}-load-bedrock-invocations",
+        name=f"{stack_name}-load-bedrock-invocations",
+        description="Daily load of yesterday's Bedrock invocation logs into the Parquet table",
+        schedule_expression=settings.get("load_schedule", DEFAULT_LOAD_SCHEDULE),
+        schedule_expression_timezone="UTC",
+        flexible_time_window={"mode": "OFF"},
+        target={
+            "arn": "arn:aws:scheduler:::aws-sdk:athena:startQueryExecution",
+            "role_arn": scheduler_role.arn,
+            "input": json.dumps(
+                {
+                    "QueryString": build_load_query(database_name, raw_table_name, curated_table_name),
+                    "QueryExecutionContext": {"Database": database_name},
+                    "WorkGroup": f"{stack_name}-bedrock-logs",
+                }
+            ),
+            # The query is idempotent, so retries are safe.
+            "retry_policy": {"maximum_retry_attempts": 3},
+        },
+        opts=pulumi.ResourceOptions(depends_on=[workgroup, curated_table]),
+    )
+
+    pulumi.log.info("✓ Invocation logging pipeline created")
+    pulumi.log.info(f"  Bucket: {bucket_name}")
+    pulumi.log.info(f"  Athena: {database_name}.{curated_table_name} (workgroup {stack_name}-bedrock-logs)")
+    pulumi.log.info(f"  Payload bodies logged: {'yes' if log_payloads else 'no (metadata only)'}")
+
+    return {
+        "logs_bucket": logs_bucket,
+        "logs_bucket_name": logs_bucket.bucket,
+        "logging_configuration": logging_configuration,
+        "database": database,
+        "database_name": database.name,
+        "raw_table": raw_table,
+        "curated_table": curated_table,
+        "workgroup": workgroup,
+        "workgroup_name": workgroup.name,
+        "load_query": load_query,
+        "load_schedule": load_schedule,
+    }
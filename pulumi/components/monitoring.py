@@ -0,0 +1,207 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+CloudWatch monitoring component for TrailLens AI infrastructure.
+
+This component creates:
+- A CloudWatch dashboard with one row per catalog model: InvocationLatency
+  p50/p90/p99, invocations/throttles/client errors, and input/output tokens
+- Alarms per model on p99 latency, throttles and client errors, publishing
+  to the budget SNS topic
+
+Bedrock publishes AWS/Bedrock metrics in the region a request is sent to,
+keyed by the ModelId used in the request (the inference profile ID for
+profile invocations). Dashboard widgets therefore carry each model's own
+region. Alarms are only created for models invoked in the stack region:
+CloudWatch alarm actions cannot publish to an SNS topic in another region.
+
+Thresholds come from the monitoring config object:
+
+    traillens-ai:monitoring:
+      throttles: 5          # per 5 minutes
+      client_errors: 10     # per 5 minutes
+      latency_p99_ms:
+        haiku: 4000         # per catalog model key
+"""
+
+import json
+
+import pulumi_aws as aws
+from utils.models import CATALOG
+
+import pulumi
+
+NAMESPACE = "AWS/Bedrock"
+PERIOD = 300
+
+# Default p99 InvocationLatency thresholds by model mode. Streaming chat
+# latency covers the whole response, so it is far higher than embeddings.
+DEFAULT_LATENCY_P99_MS = {
+    "chat": 60000,
+    "embedding": 2000,
+    "rerank": 2000,
+    "image": 30000,
+}
+DEFAULT_THROTTLES = 5
+DEFAULT_CLIENT_ERRORS = 10
+
+WIDGET_WIDTH = 8
+WIDGET_HEIGHT = 6
+
+
+def _metric(name, model_id, region, stat, label):
+    return [NAMESPACE, name, "ModelId", model_id, {"stat": stat, "region": region, "label": label}]
+
+
+def _widget(title, region, metrics, x, y):
+    return {
+        "type": "metric",
+        "x": x,
+        "y": y,
+        "width": WIDGET_WIDTH,
+        "height": WIDGET_HEIGHT,
+        "properties": {
+            "title": title,
+            "region": region,
+            "view": "timeSeries",
+            "period": PERIOD,
+            "metrics": metrics,
+        },
+    }
+
+
+def build_dashboard_body(models, region):
+    """
+    Build the dashboard body with one row of widgets per model.
+
+    Args:
+        models: Iterable of BedrockModel.
+        region: Stack region, used for models without their own region.
+
+    Returns:
+        str: Compact dashboard body JSON.
+    """
+    widgets = []
+    for row, model in enumerate(models):
+        model_region = model.region or region
+        model_id = model.invocation_id
+        y = row * WIDGET_HEIGHT
+
+        latency = [_metric("InvocationLatency", model_id, model_region, stat, stat) for stat in ("p50", "p90", "p99")]
+        requests = [
+            _metric("Invocations", model_id, model_region, "Sum", "Invocations"),
+            _metric("InvocationThrottles", model_id, model_region, "Sum", "Throttles"),
+            _metric("InvocationClientErrors", model_id, model_region, "Sum", "Client errors"),
+            _metric("InvocationServerErrors", model_id, model_region, "Sum", "Server errors"),
+        ]
+        tokens = [
+            _metric("InputTokenCount", model_id, model_region, "Sum", "Input tokens"),
+            _metric("OutputTokenCount", model_id, model_region, "Sum", "Output tokens"),
+        ]
+
+        widgets.append(_widget(f"{model.name} latency (ms)", model_region, latency, 0, y))
+        widgets.append(_widget(f"{model.name} requests", model_region, requests, WIDGET_WIDTH, y))
+        widgets.append(_widget(f"{model.name} tokens", model_region, tokens, 2 * WIDGET_WIDTH, y))
+
+    return json.dumps({"widgets": widgets}, separators=(",", ":"))
+
+
+def create_monitoring_stack(project_name, region, alarm_topic_arn, thresholds, tags):
+    """
+    Create the CloudWatch dashboard and per-model alarms.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        alarm_topic_arn: SNS topic ARN for alarm notifications, or None to
+            create alarms without actions.
+        thresholds: The monitoring config object (see module docstring).
+        tags: Resource tags.
+
+    Returns:
+        dict: Dictionary containing the dashboard and alarms by model key.
+    """
+    stack_name = f"{project_name}-ai"
+
+    pulumi.log.info(f"Creating monitoring stack: {stack_name}")
+
+    dashboard = aws.cloudwatch.Dashboard(
+        f"{stack_name}-bedrock-dashboard",
+        dashboard_name=f"{stack_name}-bedrock",
+        dashboard_body=build_dashboard_body(CATALOG, region),
+    )
+
+    latency_overrides = thresholds.get("latency_p99_ms", {})
+    throttles_threshold = thresholds.get("throttles", DEFAULT_THROTTLES)
+    client_errors_threshold = thresholds.get("client_errors", DEFAULT_CLIENT_ERRORS)
+    alarm_actions = [alarm_topic_arn] if alarm_topic_arn else []
+
+    alarms = {}
+    for model in CATALOG:
+        if model.region not in (None, region):
+            pulumi.log.info(f"  {model.name}: dashboard only (metrics in {model.region})")
+            continue
+
+        name = f"{stack_name}-{model.key.replace('_', '-')}"
+        common = {
+            "namespace": NAMESPACE,
+            "dimensions": {"ModelId": model.invocation_id},
+            "period": PERIOD,
+            "comparison_operator": "GreaterThanThreshold",
+            # Idle models publish no datapoints; that is not an incident.
+            "treat_missing_data": "notBreaching",
+            "alarm_actions": alarm_actions,
+        }
+        latency_threshold = latency_overrides.get(model.key, DEFAULT_LATENCY_P99_MS[model.mode])
+
+        alarms[model.key] = {
+            "latency": aws.cloudwatch.MetricAlarm(
+                f"{name}-latency-p99",
+                name=f"{name}-latency-p99",
+                alarm_description=f"{model.name} p99 InvocationLatency above {latency_threshold} ms",
+                metric_name="InvocationLatency",
+                extended_statistic="p99",
+                threshold=latency_threshold,
+                # Two of three 5-minute periods, so a single slow request does not page.
+                evaluation_periods=3,
+                datapoints_to_alarm=2,
+                tags={**tags, "Name": f"{name}-latency-p99"},
+                **common,
+            ),
+            "throttles": aws.cloudwatch.MetricAlarm(
+                f"{name}-throttles",
+                name=f"{name}-throttles",
+                alarm_description=f"{model.name} InvocationThrottles above {throttles_threshold} per 5 minutes",
+                metric_name="InvocationThrottles",
+                statistic="Sum",
+                threshold=throttles_threshold,
+                evaluation_periods=1,
+                tags={**tags, "Name": f"{name}-throttles"},
+                **common,
+            ),
+            "client_errors": aws.cloudwatch.MetricAlarm(
+                f"{name}-client-errors",
+                name=f"{name}-client-errors",
+                alarm_description=f"{model.name} InvocationClientErrors above {client_errors_threshold} per 5 minutes",
+                metric_name="InvocationClientErrors",
+                statistic="Sum",
+                threshold=client_errors_threshold,
+                evaluation_periods=1,
+                tags={**tags, "Name": f"{name}-client-errors"},
+                **common,
+            ),
+        }
+
+    pulumi.log.info("✓ Dashboard and alarms created")
+    pulumi.log.info(f"  Alarms: {len(alarms)} model(s) x p99 latency, throttles, client errors")
+    if not alarm_topic_arn:
+        pulumi.log.warn("  Budget component disabled: alarms have no notification actions")
+
+    return {
+        "dashboard": dashboard,
+        "dashboard_name": dashboard.dashboard_name,
+        "alarms": alarms,
+    }
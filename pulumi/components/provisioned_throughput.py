@@ -0,0 +1,80 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+AWS Bedrock Provisioned Throughput component for TrailLens AI infrastructure.
+
+This component creates:
+- One Provisioned Throughput per configured catalog model (e.g. the Haiku
+  4.5 autocomplete lane), with model units and commitment from stack config
+- The IAM grants needed to invoke the provisioned models, returned for the
+  Bedrock IAM component to add to the user's policy
+
+Provisioned Throughput bills hourly for every model unit whether or not it
+is used, so nothing is created unless the provisioned_throughput config
+object names at least one model:
+
+    traillens-ai:provisioned_throughput:
+      haiku:
+        model_units: 1
+        commitment: OneMonth   # OneMonth, SixMonths, or omit for no commitment
+
+LiteLLM targets a provisioned model by setting ``model_id`` to its ARN
+(exported as provisioned_model_arns).
+"""
+
+import pulumi_aws as aws
+from utils.models import get_model
+
+import pulumi
+
+
+def create_provisioned_throughput_stack(project_name, region, throughput, tags):
+    """
+    Create Bedrock Provisioned Throughput for selected catalog models.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        throughput: Dict of catalog model key to {"model_units", "commitment"}.
+        tags: Resource tags.
+
+    Returns:
+        dict: Dictionary containing provisioned throughputs, their ARNs by
+        model key, and the IAM grants needed to invoke them.
+    """
+    stack_name = f"{project_name}-ai"
+
+    pulumi.log.info(f"Creating Provisioned Throughput stack: {stack_name}")
+
+    throughputs = {}
+    grants = []
+    for key, settings in throughput.items():
+        model = get_model(key)
+        name = f"{stack_name}-{key.replace('_', '-')}-provisioned"
+
+        provisioned = aws.bedrock.ProvisionedModelThroughput(
+            name,
+            provisioned_model_name=name,
+            model_arn=model.foundation_model_arn(region),
+            model_units=settings["model_units"],
+            commitment_duration=settings.get("commitment"),
+            tags={**tags, "Name": name, "Model": model.model_id},
+        )
+        throughputs[key] = provisioned
+        grants.append((model.actions, provisioned.provisioned_model_arn))
+
+        pulumi.log.info(
+            f"  {model.name}: {settings['model_units']} model unit(s), "
+            f"commitment {settings.get('commitment') or 'none (hourly)'}"
+        )
+
+    pulumi.log.info("✓ Provisioned Throughput created")
+
+    return {
+        "provisioned_throughputs": throughputs,
+        "provisioned_model_arns": {key: provisioned.provisioned_model_arn for key, provisioned in throughputs.items()},
+        "grants": grants,
+    }
@@ -0,0 +1,604 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Cloud-hosted LiteLLM proxy component for TrailLens AI infrastructure.
+
+This component runs the same litellm-database image as
+server/podman-compose.yaml on ECS Fargate in the stack region:
+- S3 bucket holding a production rendering of
+  server/config/litellm-config.yaml (see render_config), which LiteLLM loads
+  at startup via LITELLM_CONFIG_BUCKET_NAME/LITELLM_CONFIG_BUCKET_OBJECT_KEY
+  (Fargate has no bind mounts)
+- Task role with the catalog Bedrock policies, so no static access keys
+- Master key, salt key and DATABASE_URL injected from SSM parameters
+- Application Load Balancer in front of the tasks
+- Target-tracking autoscaling on ALB requests per target and on p95
+  TargetResponseTime (time to the first response byte, which for streamed
+  completions tracks time-to-first-token)
+
+The SSM parameters are not managed by Pulumi, so their values stay out of
+stack state. Create them once:
+
+    aws ssm put-parameter --type SecureString --name /traillens-ai/litellm/master-key --value sk-...
+    aws ssm put-parameter --type SecureString --name /traillens-ai/litellm/salt-key --value sk-...
+    aws ssm put-parameter --type SecureString --name /traillens-ai/litellm/database-url --value postgresql://...
+
+Settings come from the proxy_service config object (all optional):
+
+    traillens-ai:proxy_service:
+      workers: 4                  # uvicorn workers per task (--num_workers)
+      cpu: 1024
+      memory: 2048
+      min_tasks: 1
+      max_tasks: 4
+      requests_per_target: 300    # ALB requests per task per minute
+      p95_response_time: 3.0      # seconds
+      certificate_arn: arn:aws:acm:...   # HTTPS listener; HTTP on 80 without it
+      internal: false
+      allowed_cidrs: ["203.0.113.0/24"]
+      image: <registry>/litellm-hooks:<tag>   # with server/hooks at /app/hooks
+      hooks: false                # load the server/hooks callbacks
+
+The stock image only has the YAML config, so the hooks.* callbacks are
+left out of the uploaded config unless hooks is set, which needs an image
+with server/hooks baked in at /app/hooks and the shared cache (the hooks
+keep their state in Redis).
+
+A public load balancer needs certificate_arn or allowed_cidrs narrower than
+0.0.0.0/0 (checked by utils/config.py), so the master key never crosses the
+internet in plain HTTP.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pulumi_aws as aws
+import yaml
+
+import pulumi
+
+LITELLM_CONFIG_PATH = Path(__file__).resolve().parents[2] / "server" / "config" / "litellm-config.yaml"
+CONFIG_OBJECT_KEY = "litellm-config.yaml"
+CONTAINER_NAME = "litellm"
+CONTAINER_PORT = 4000
+
+DEFAULTS = {
+    "image": "docker.litellm.ai/berriai/litellm-database:main-stable",
+    "workers": 4,
+    "cpu": 1024,
+    "memory": 2048,
+    "min_tasks": 1,
+    "max_tasks": 4,
+    "requests_per_target": 300,
+    "p95_response_time": 3.0,
+    "certificate_arn": None,
+    "internal": False,
+    "allowed_cidrs": ["0.0.0.0/0"],
+    "log_retention_days": 30,
+    "hooks": False,
+}
+
+# general_settings in litellm-config.yaml that are only for local testing.
+LOCAL_ONLY_SETTINGS = ("set_verbose", "mock_response", "cors_origin")
+
+# SSM parameter names (under /<stack>/litellm/) for container secrets.
+SECRETS = {
+    "LITELLM_MASTER_KEY": "master-key",
+    "LITELLM_SALT_KEY": "salt-key",
+    "DATABASE_URL": "database-url",
+}
+
+
+def render_config(source, cache=False, hooks=False):
+    """
+    Render the hosted proxy's LiteLLM config from litellm-config.yaml.
+
+    The file in the repo is written for podman-compose: it has a test
+    master key, verbose logging and wildcard CORS. The hosted copy reads the
+    master key from LITELLM_MASTER_KEY (the SSM parameter), which a
+    master_key in the file would otherwise override, and drops the
+    LOCAL_ONLY_SETTINGS. The Redis cache reads REDIS_HOST, which only the
+    shared cache (components/cache.py) provides, so it is dropped without one.
+    The hooks.* callbacks are dropped unless the image ships server/hooks.
+
+    Args:
+        source: litellm-config.yaml contents.
+        cache: Whether the stack has the shared cache.
+        hooks: Whether the image has server/hooks at /app/hooks.
+
+    Returns:
+        str: The rendered YAML.
+    """
+    config = yaml.safe_load(source) or {}
+    general_settings = {
+        key: value for key, value in (config.get("general_settings") or {}).items() if key not in LOCAL_ONLY_SETTINGS
+    }
+    general_settings["master_key"] = "os.environ/LITELLM_MASTER_KEY"
+    config["general_settings"] = general_settings
+    litellm_settings = config.get("litellm_settings")
+    if litellm_settings and not cache:
+        litellm_settings.pop("cache", None)
+        litellm_settings.pop("cache_params", None)
+    if litellm_settings and not hooks and litellm_settings.get("callbacks"):
+        callbacks = [callback for callback in litellm_settings["callbacks"] if not callback.startswith("hooks.")]
+        if callbacks:
+            litellm_settings["callbacks"] = callbacks
+        else:
+            del litellm_settings["callbacks"]
+    return yaml.safe_dump(config, sort_keys=False)
+
+
+def build_container_definitions(settings, region, bucket_name, log_group_name, parameter_arns, environment, config):
+    """
+    Build the LiteLLM container definition JSON.
+
+    Args:
+        settings: Proxy settings merged with DEFAULTS.
+        region: AWS region.
+        bucket_name: Config bucket name.
+        log_group_name: CloudWatch log group for the container.
+        parameter_arns: Dict of environment variable to SSM parameter ARN.
+        environment: Extra environment variables (e.g. REDIS_HOST).
+        config: The rendered LiteLLM config uploaded to the bucket.
+
+    Returns:
+        str: Container definitions JSON.
+    """
+    config_digest = hashlib.sha256(config.encode()).hexdigest()
+    variables = {
+        "AWS_REGION": region,
+        "AWS_DEFAULT_REGION": region,
+        "LITELLM_CONFIG_BUCKET_NAME": bucket_name,
+        "LITELLM_CONFIG_BUCKET_OBJECT_KEY": CONFIG_OBJECT_KEY,
+        # LiteLLM only reads the config at startup. Changing the digest
+        # creates a new task definition revision, which rolls the tasks.
+        "LITELLM_CONFIG_SHA256": config_digest,
+        "STORE_MODEL_IN_DB": "True",
+        # Lets the hooks in /app/hooks import each other.
+        **({"PYTHONPATH": "/app"} if settings["hooks"] else {}),
+        **(environment or {}),
+    }
+
+    return json.dumps(
+        [
+            {
+                "name": CONTAINER_NAME,
+                "image": settings["image"],
+                "essential": True,
+                "command": ["--port", str(CONTAINER_PORT), "--num_workers", str(settings["workers"])],
+                "portMappings": [{"containerPort": CONTAINER_PORT, "protocol": "tcp"}],
+                "environment": [{"name": name, "value": str(value)} for name, value in sorted(variables.items())],
+                "secrets": [{"name": name, "valueFrom": arn} for name, arn in sorted(parameter_arns.items())],
+                "healthCheck": {
+                    "command": ["CMD-SHELL", f"curl -f http://localhost:{CONTAINER_PORT}/health/liveliness || exit 1"],
+                    "interval": 30,
+                    "timeout": 10,
+                    "retries": 3,
+                    "startPeriod": 60,
+                },
+                "logConfiguration": {
+                    "logDriver": "awslogs",
+                    "options": {
+                        "awslogs-group": log_group_name,
+                        "awslogs-region": region,
+                        "awslogs-stream-prefix": CONTAINER_NAME,
+                    },
+                },
+            }
+        ]
+    )
+
+
+def create_proxy_service_stack(
+    project_name, region, network, settings, bedrock_policies, tags, environment=None, cache=False
+):
+    """
+    Create the LiteLLM proxy service on ECS Fargate behind an ALB.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        network: The network config object (vpc_id, private_subnet_ids,
+            public_subnet_ids).
+        settings: The proxy_service config object; see DEFAULTS.
+        bedrock_policies: Bedrock managed policies (from
+            create_bedrock_iam_stack) to attach to the task role.
+        tags: Resource tags.
+        environment: Extra container environment variables, which may be
+            Outputs (e.g. the shared cache endpoint).
+        cache: Whether environment points at the shared cache. Without it,
+            LiteLLM's Redis cache is left out of the config.
+
+    Returns:
+        dict: Dictionary containing the cluster, service, load balancer and
+        proxy URL.
+    """
+    stack_name = f"{project_name}-ai"
+    settings = {**DEFAULTS, **settings}
+
+    pulumi.log.info(f"Creating LiteLLM proxy service stack: {stack_name}")
+
+    account_id = aws.get_caller_identity().account_id
+    vpc = aws.ec2.get_vpc(id=network["vpc_id"])
+
+    # ---------------------------------------------------------------------------
+    # LiteLLM config in S3
+    # ---------------------------------------------------------------------------
+
+    bucket_name = f"{stack_name}-proxy-config-{account_id}"
+    config_bucket = aws.s3.Bucket(
+        f"{stack_name}-proxy-config",
+        bucket=bucket_name,
+        tags={**tags, "Name": bucket_name},
+    )
+
+    aws.s3.BucketPublicAccessBlock(
+        f"{stack_name}-proxy-config-public-access",
+        bucket=config_bucket.id,
+        block_public_acls=True,
+        block_public_policy=True,
+        ignore_public_acls=True,
+        restrict_public_buckets=True,
+    )
+
+    config = render_config(LITELLM_CONFIG_PATH.read_text(), cache=cache, hooks=settings["hooks"])
+    aws.s3.BucketObjectv2(
+        f"{stack_name}-proxy-config-object",
+        bucket=config_bucket.id,
+        key=CONFIG_OBJECT_KEY,
+        content=config,
+        content_type="application/yaml",
+        server_side_encryption="AES256",
+    )
+
+    # ---------------------------------------------------------------------------
+    # IAM roles
+    # ---------------------------------------------------------------------------
+
+    assume_role_policy = json.dumps(
+        {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Principal": {"Service": "ecs-tasks.amazonaws.com"},
+                    "Action": "sts:AssumeRole",
+                }
+            ],
+        }
+    )
+
+    parameter_arns = {
+        name: f"arn:aws:ssm:{region}:{account_id}:parameter/{stack_name}/litellm/{parameter}"
+        for name, parameter in SECRETS.items()
+    }
+
+    # Execution role: pulls the image, writes logs, reads the secrets.
+    execution_role = aws.iam.Role(
+        f"{stack_name}-proxy-execution-role",
+        name=f"{stack_name}-proxy-execution",
+        assume_role_policy=assume_role_policy,
+        tags={**tags, "Name": f"{stack_name}-proxy-execution"},
+    )
+    aws.iam.RolePolicyAttachment(
+        f"{stack_name}-proxy-execution-policy",
+        role=execution_role.name,
+        policy_arn="arn:aws:iam::aws:policy/service-role/AmazonECSTaskExecutionRolePolicy",
+    )
+    aws.iam.RolePolicy(
+        f"{stack_name}-proxy-execution-secrets",
+        role=execution_role.id,
+        policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": "ssm:GetParameters",
+                        "Resource": sorted(parameter_arns.values()),
+                    }
+                ],
+            }
+        ),
+    )
+
+    # Task role: what LiteLLM itself calls AWS with. Replaces the IAM user's
+    # static access keys.
+    task_role = aws.iam.Role(
+        f"{stack_name}-proxy-task-role",
+        name=f"{stack_name}-proxy-task",
+        assume_role_policy=assume_role_policy,
+        tags={**tags, "Name": f"{stack_name}-proxy-task"},
+    )
+    for index, policy in enumerate(bedrock_policies):
+        aws.iam.RolePolicyAttachment(
+            f"{stack_name}-proxy-task-bedrock-{index + 1}",
+            role=task_role.name,
+            policy_arn=policy.arn,
+        )
+    aws.iam.RolePolicy(
+        f"{stack_name}-proxy-task-config",
+        role=task_role.id,
+        policy=json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": "s3:GetObject",
+                        "Resource": f"arn:aws:s3:::{bucket_name}/{CONFIG_OBJECT_KEY}",
+                    }
+                ],
+            }
+        ),
+    )
+
+    # ---------------------------------------------------------------------------
+    # Networking
+    # ---------------------------------------------------------------------------
+
+    alb_security_group = aws.ec2.SecurityGroup(
+        f"{stack_name}-proxy-alb-sg",
+        name=f"{stack_name}-proxy-alb",
+        description="Clients to the LiteLLM proxy load balancer",
+        vpc_id=network["vpc_id"],
+        ingress=[
+            {
+                "description": "HTTPS" if settings["certificate_arn"] else "HTTP",
+                "protocol": "tcp",
+                "from_port": 443 if settings["certificate_arn"] else 80,
+                "to_port": 443 if settings["certificate_arn"] else 80,
+                "cidr_blocks": settings["allowed_cidrs"],
+            }
+        ],
+        egress=[
+            {
+                "description": "LiteLLM tasks",
+                "protocol": "tcp",
+                "from_port": CONTAINER_PORT,
+                "to_port": CONTAINER_PORT,
+                "cidr_blocks": [vpc.cidr_block],
+            }
+        ],
+        tags={**tags, "Name": f"{stack_name}-proxy-alb"},
+    )
+
+    task_security_group = aws.ec2.SecurityGroup(
+        f"{stack_name}-proxy-task-sg",
+        name=f"{stack_name}-proxy-task",
+        description="LiteLLM proxy tasks",
+        vpc_id=network["vpc_id"],
+        ingress=[
+            {
+                "description": "From the load balancer",
+                "protocol": "tcp",
+                "from_port": CONTAINER_PORT,
+                "to_port": CONTAINER_PORT,
+                "security_groups": [alb_security_group.id],
+            }
+        ],
+        egress=[
+            {
+                "description": "Bedrock, S3, SSM, ECR and the database",
+                "protocol": "-1",
+                "from_port": 0,
+                "to_port": 0,
+                "cidr_blocks": ["0.0.0.0/0"],
+            }
+        ],
+        tags={**tags, "Name": f"{stack_name}-proxy-task"},
+    )
+
+    load_balancer = aws.lb.LoadBalancer(
+        f"{stack_name}-proxy-alb",
+        name=f"{stack_name}-proxy",
+        load_balancer_type="application",
+        internal=settings["internal"],
+        subnets=network["private_subnet_ids"] if settings["internal"] else network["public_subnet_ids"],
+        security_groups=[alb_security_group.id],
+        # Streamed completions can pause for a long time between tokens.
+        idle_timeout=300,
+        drop_invalid_header_fields=True,
+        tags={**tags, "Name": f"{stack_name}-proxy"},
+    )
+
+    target_group = aws.lb.TargetGroup(
+        f"{stack_name}-proxy-tg",
+        name=f"{stack_name}-proxy",
+        port=CONTAINER_PORT,
+        protocol="HTTP",
+        target_type="ip",
+        vpc_id=network["vpc_id"],
+        # Let in-flight streams finish when tasks scale in.
+        deregistration_delay=120,
+        health_check={
+            "path": "/health/liveliness",
+            "matcher": "200",
+            "interval": 15,
+            "healthy_threshold": 2,
+            "unhealthy_threshold": 3,
+        },
+        tags={**tags, "Name": f"{stack_name}-proxy"},
+    )
+
+    if settings["certificate_arn"]:
+        listener = aws.lb.Listener(
+            f"{stack_name}-proxy-https",
+            load_balancer_arn=load_balancer.arn,
+            port=443,
+            protocol="HTTPS",
+            ssl_policy="ELBSecurityPolicy-TLS13-1-2-2021-06",
+            certificate_arn=settings["certificate_arn"],
+            default_actions=[{"type": "forward", "target_group_arn": target_group.arn}],
+        )
+        scheme = "https"
+    else:
+        pulumi.log.warn("  No proxy_service.certificate_arn: the proxy listens on plain HTTP")
+        listener = aws.lb.Listener(
+            f"{stack_name}-proxy-http",
+            load_balancer_arn=load_balancer.arn,
+            port=80,
+            protocol="HTTP",
+            default_actions=[{"type": "forward", "target_group_arn": target_group.arn}],
+        )
+        scheme = "http"
+
+    # ---------------------------------------------------------------------------
+    # ECS
+    # ---------------------------------------------------------------------------
+
+    log_group_name = f"/ecs/{stack_name}-proxy"
+    aws.cloudwatch.LogGroup(
+        f"{stack_name}-proxy-logs",
+        name=log_group_name,
+        retention_in_days=settings["log_retention_days"],
+        tags={**tags, "Name": log_group_name},
+    )
+
+    cluster_name = f"{stack_name}-proxy"
+    cluster = aws.ecs.Cluster(
+        f"{stack_name}-proxy-cluster",
+        name=cluster_name,
+        settings=[{"name": "containerInsights", "value": "enabled"}],
+        tags={**tags, "Name": cluster_name},
+    )
+
+    task_definition = aws.ecs.TaskDefinition(
+        f"{stack_name}-proxy-task",
+        family=f"{stack_name}-proxy",
+        requires_compatibilities=["FARGATE"],
+        network_mode="awsvpc",
+        cpu=str(settings["cpu"]),
+        memory=str(settings["memory"]),
+        execution_role_arn=execution_role.arn,
+        task_role_arn=task_role.arn,
+        container_definitions=pulumi.Output.from_input(environment or {}).apply(
+            lambda variables: build_container_definitions(
+                settings, region, bucket_name, log_group_name, parameter_arns, variables, config
+            )
+        ),
+        tags={**tags, "Name": f"{stack_name}-proxy"},
+    )
+
+    service_name = f"{stack_name}-proxy"
+    service = aws.ecs.Service(
+        f"{stack_name}-proxy-service",
+        name=service_name,
+        cluster=cluster.arn,
+        task_definition=task_definition.arn,
+        launch_type="FARGATE",
+        desired_count=settings["min_tasks"],
+        health_check_grace_period_seconds=90,
+        deployment_circuit_breaker={"enable": True, "rollback": True},
+        network_configuration={
+            "subnets": network["private_subnet_ids"],
+            "security_groups": [task_security_group.id],
+            "assign_public_ip": False,
+        },
+        load_balancers=[
+            {
+                "target_group_arn": target_group.arn,
+                "container_name": CONTAINER_NAME,
+                "container_port": CONTAINER_PORT,
+            }
+        ],
+        propagate_tags="SERVICE",
+        tags={**tags, "Name": service_name},
+        # Autoscaling owns the task count after creation.
+        opts=pulumi.ResourceOptions(depends_on=[listener], ignore_changes=["desiredCount"]),
+    )
+
+    # ---------------------------------------------------------------------------
+    # Autoscaling
+    # ---------------------------------------------------------------------------
+
+    scaling_target = aws.appautoscaling.Target(
+        f"{stack_name}-proxy-scaling-target",
+        service_namespace="ecs",
+        scalable_dimension="ecs:service:DesiredCount",
+        resource_id=f"service/{cluster_name}/{service_name}",
+        min_capacity=settings["min_tasks"],
+        max_capacity=settings["max_tasks"],
+        opts=pulumi.ResourceOptions(depends_on=[service]),
+    )
+
+    scaling = {
+        "service_namespace": scaling_target.service_namespace,
+        "scalable_dimension": scaling_target.scalable_dimension,
+        "resource_id": scaling_target.resource_id,
+        "policy_type": "TargetTrackingScaling",
+    }
+
+    aws.appautoscaling.Policy(
+        f"{stack_name}-proxy-scale-requests",
+        name=f"{stack_name}-proxy-requests-per-target",
+        target_tracking_scaling_policy_configuration={
+            "target_value": settings["requests_per_target"],
+            "predefined_metric_specification": {
+                "predefined_metric_type": "ALBRequestCountPerTarget",
+                "resource_label": pulumi.Output.concat(load_balancer.arn_suffix, "/", target_group.arn_suffix),
+            },
+            "scale_out_cooldown": 60,
+            "scale_in_cooldown": 300,
+        },
+        **scaling,
+    )
+
+    # p95 is an extended statistic, which the plain customized metric
+    # specification does not accept, so it goes through a metric query.
+    aws.appautoscaling.Policy(
+        f"{stack_name}-proxy-scale-latency",
+        name=f"{stack_name}-proxy-p95-response-time",
+        target_tracking_scaling_policy_configuration={
+            "target_value": settings["p95_response_time"],
+            "customized_metric_specification": {
+                "metrics": [
+                    {
+                        "id": "p95",
+                        "label": "p95 TargetResponseTime",
+                        "return_data": True,
+                        "metric_stat": {
+                            "stat": "p95",
+                            "metric": {
+                                "namespace": "AWS/ApplicationELB",
+                                "metric_name": "TargetResponseTime",
+                                "dimensions": [
+                                    {"name": "LoadBalancer", "value": load_balancer.arn_suffix},
+                                    {"name": "TargetGroup", "value": target_group.arn_suffix},
+                                ],
+                            },
+                        },
+                    }
+                ],
+            },
+            "scale_out_cooldown": 60,
+            "scale_in_cooldown": 300,
+        },
+        **scaling,
+    )
+
+    proxy_url = pulumi.Output.concat(scheme, "://", load_balancer.dns_name)
+
+    pulumi.log.info("✓ LiteLLM proxy service created")
+    pulumi.log.info(
+        f"  Tasks: {settings['min_tasks']}-{settings['max_tasks']} x {settings['workers']} worker(s), "
+        f"{settings['cpu']} CPU / {settings['memory']} MB"
+    )
+    pulumi.log.info(
+        f"  Scaling: {settings['requests_per_target']} requests/target/min, "
+        f"p95 response time {settings['p95_response_time']}s"
+    )
+
+    return {
+        "cluster": cluster,
+        "service": service,
+        "load_balancer": load_balancer,
+        "task_role": task_role,
+        "proxy_url": proxy_url,
+        "cluster_name": cluster.name,
+        "service_name": service.name,
+    }
@@ -0,0 +1,108 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+PrivateLink VPC endpoint component for TrailLens AI infrastructure.
+
+This component creates, in an existing VPC:
+- A security group allowing HTTPS from the VPC CIDR
+- An interface VPC endpoint for com.amazonaws.<region>.bedrock-runtime with
+  private DNS, so the regular bedrock-runtime hostname resolves to private
+  IPs inside the VPC
+- An endpoint policy that only allows invoking catalog models (plus any
+  provisioned throughput or application inference profiles)
+
+Proxies running in the VPC then reach Bedrock without NAT gateways or
+internet egress charges on streamed tokens. The VPC comes from the network
+config object:
+
+    traillens-ai:network:
+      vpc_id: vpc-0123456789abcdef0
+      private_subnet_ids: [subnet-aaa, subnet-bbb]
+      require_source_vpce: false   # true: IAM only allows invokes via the endpoint
+
+With require_source_vpce, the Bedrock IAM policy adds an aws:SourceVpce
+condition to its invoke statements for stack-region models. The exported
+access key then stops working for them from outside the VPC. Models pinned
+to another region (us-east-1) are invoked through that region's public
+endpoint, so their grants stay unconditioned.
+"""
+
+from dataclasses import replace
+
+import pulumi_aws as aws
+from utils.models import CATALOG
+from utils.policy import compile_endpoint_policy, model_grants
+
+import pulumi
+
+
+def create_vpc_endpoint_stack(project_name, region, network, tags, extra_grants=None, profiled_models=()):
+    """
+    Create the bedrock-runtime interface endpoint.
+
+    Args:
+        project_name: The project name.
+        region: Primary AWS region (ca-central-1).
+        network: The network config object (vpc_id, private_subnet_ids).
+        tags: Resource tags.
+        extra_grants: Optional (actions, resource ARN Output) pairs for
+            provisioned throughput or inference profiles.
+        profiled_models: Catalog keys invoked through application inference
+            profiles (see create_bedrock_iam_stack).
+
+    Returns:
+        dict: Dictionary containing the endpoint, its ID and security group.
+    """
+    stack_name = f"{project_name}-ai"
+
+    pulumi.log.info(f"Creating Bedrock VPC endpoint stack: {stack_name}")
+
+    vpc = aws.ec2.get_vpc(id=network["vpc_id"])
+
+    security_group = aws.ec2.SecurityGroup(
+        f"{stack_name}-bedrock-endpoint-sg",
+        name=f"{stack_name}-bedrock-endpoint",
+        description="HTTPS from the VPC to the bedrock-runtime endpoint",
+        vpc_id=network["vpc_id"],
+        ingress=[
+            {
+                "description": "HTTPS from the VPC",
+                "protocol": "tcp",
+                "from_port": 443,
+                "to_port": 443,
+                "cidr_blocks": [vpc.cidr_block],
+            }
+        ],
+        tags={**tags, "Name": f"{stack_name}-bedrock-endpoint"},
+    )
+
+    # Same model grants as the Bedrock IAM policy.
+    models = [replace(model, profile_prefix=None) if model.key in profiled_models else model for model in CATALOG]
+    grants = model_grants(models, region, system_profiles=not profiled_models) + list(extra_grants or [])
+    resources = pulumi.Output.all(*[resource for _, resource in grants])
+    endpoint = aws.ec2.VpcEndpoint(
+        f"{stack_name}-bedrock-runtime-endpoint",
+        vpc_id=network["vpc_id"],
+        service_name=f"com.amazonaws.{region}.bedrock-runtime",
+        vpc_endpoint_type="Interface",
+        private_dns_enabled=True,
+        subnet_ids=network["private_subnet_ids"],
+        security_group_ids=[security_group.id],
+        policy=resources.apply(
+            lambda arns: compile_endpoint_policy([(actions, arn) for (actions, _), arn in zip(grants, arns)])
+        ),
+        tags={**tags, "Name": f"{stack_name}-bedrock-runtime"},
+    )
+
+    pulumi.log.info("✓ Bedrock VPC endpoint created")
+    pulumi.log.info(f"  Service: com.amazonaws.{region}.bedrock-runtime (private DNS)")
+    pulumi.log.info(f"  Subnets: {', '.join(network['private_subnet_ids'])}")
+
+    return {
+        "endpoint": endpoint,
+        "endpoint_id": endpoint.id,
+        "security_group": security_group,
+    }
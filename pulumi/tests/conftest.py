@@ -0,0 +1,252 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline test harness for the TrailLens AI Pulumi program.
+
+Runs __main__.py under pulumi.runtime.set_mocks so the whole program can be
+evaluated without AWS credentials or a Pulumi backend. Resource
+registrations and provider invokes (aws.get_caller_identity) are answered
+by BedrockMocks, which records every resource for assertions.
+
+Usage (from the pulumi/ directory):
+    python -m pytest
+    python -m pytest --benchmark [--benchmark-rounds 20] [--benchmark-max-ms 500]
+"""
+
+import importlib.util
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+import pytest
+
+import pulumi
+
+PROJECT = "traillens-ai"
+STACK = "test"
+ACCOUNT_ID = "123456789012"
+VPC_CIDR = "10.20.0.0/16"
+
+# Stack config equivalent to Pulumi.prod.yaml.
+DEFAULT_CONFIG = {
+    "project_name": "traillens",
+    "region": "ca-central-1",
+    "domain": "ai.traillenshq.com",
+    "zone_name": "traillenshq.com",
+    "budget_alert_email": "alerts@example.com",
+}
+
+PROGRAM_PATH = Path(__file__).resolve().parent.parent / "__main__.py"
+
+
+class BedrockMocks(pulumi.runtime.Mocks):
+    """Pulumi mocks that answer AWS calls with a stand-in account."""
+
+    def __init__(self):
+        self.resources = []
+
+    def new_resource(self, args):
+        outputs = dict(args.inputs)
+        outputs.setdefault("arn", f"arn:aws:mock:{DEFAULT_CONFIG['region']}:{ACCOUNT_ID}:{args.typ}/{args.name}")
+        if args.typ == "aws:iam/user:User":
+            outputs["arn"] = f"arn:aws:iam::{ACCOUNT_ID}:user/{args.inputs['name']}"
+        elif args.typ == "aws:iam/policy:Policy":
+            outputs["arn"] = f"arn:aws:iam::{ACCOUNT_ID}:policy/{args.inputs['name']}"
+        elif args.typ == "aws:bedrock/provisionedModelThroughput:ProvisionedModelThroughput":
+            outputs["provisionedModelArn"] = (
+                f"arn:aws:bedrock:{DEFAULT_CONFIG['region']}:{ACCOUNT_ID}:provisioned-model/{args.name}"
+            )
+        elif args.typ == "aws:bedrock/inferenceProfile:InferenceProfile":
+            outputs["arn"] = (
+                f"arn:aws:bedrock:{DEFAULT_CONFIG['region']}:{ACCOUNT_ID}:application-inference-profile/{args.name}"
+            )
+        elif args.typ == "aws:s3/bucket:Bucket":
+            outputs["arn"] = f"arn:aws:s3:::{args.inputs['bucket']}"
+        elif args.typ == "aws:lb/loadBalancer:LoadBalancer":
+            outputs["arnSuffix"] = f"app/{args.inputs['name']}/0123456789abcdef"
+            outputs["dnsName"] = f"{args.inputs['name']}-123456789.{DEFAULT_CONFIG['region']}.elb.amazonaws.com"
+        elif args.typ == "aws:lb/targetGroup:TargetGroup":
+            outputs["arnSuffix"] = f"targetgroup/{args.inputs['name']}/0123456789abcdef"
+        elif args.typ == "aws:elasticache/replicationGroup:ReplicationGroup":
+            outputs["primaryEndpointAddress"] = f"master.{args.inputs['replicationGroupId']}.abc123.cac1.cache.amazonaws.com"
+        elif args.typ == "aws:iam/accessKey:AccessKey":
+            outputs["secret"] = "mock-secret-access-key"
+
+        self.resources.append(args)
+        return [f"{args.name}-id", outputs]
+
+    def call(self, args):
+        if args.token == "aws:index/getCallerIdentity:getCallerIdentity":
+            return {
+                "accountId": ACCOUNT_ID,
+                "arn": f"arn:aws:iam::{ACCOUNT_ID}:user/mock",
+                "userId": "AIDAMOCK",
+                "id": ACCOUNT_ID,
+            }
+        if args.token == "aws:ec2/getVpc:getVpc":
+            return {"id": args.args["id"], "cidrBlock": VPC_CIDR}
+        return {}
+
+    def of_type(self, typ):
+        """Return the inputs of every registered resource of a given type."""
+        return [resource.inputs for resource in self.resources if resource.typ == typ]
+
+
+def load_program():
+    """Import __main__.py under a module name that does not run main()."""
+    spec = importlib.util.spec_from_file_location("traillens_program", PROGRAM_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_program(config=None, exports=None):
+    """Evaluate the Pulumi program once against fresh mocks.
+
+    Args:
+        config: Stack config overrides, without the project prefix.
+        exports: Optional dict that collects pulumi.export() calls.
+
+    Returns:
+        BedrockMocks: The mocks, holding every registered resource.
+    """
+    mocks = BedrockMocks()
+    values = {**DEFAULT_CONFIG, **(config or {})}
+    pulumi.runtime.set_all_config({f"{PROJECT}:{key}": str(value) for key, value in values.items()})
+    pulumi.runtime.set_mocks(mocks, project=PROJECT, stack=STACK, preview=False)
+
+    program = load_program()
+
+    @pulumi.runtime.test
+    def evaluate():
+        program.main()
+
+    if exports is None:
+        evaluate()
+    else:
+        original_export = pulumi.export
+        pulumi.export = exports.__setitem__
+        try:
+            evaluate()
+        finally:
+            pulumi.export = original_export
+
+    return mocks
+
+
+def resolve(output):
+    """Block until a Pulumi Output (or plain value) resolves and return it."""
+    result = {}
+
+    @pulumi.runtime.test
+    def wait():
+        return pulumi.Output.from_input(output).apply(lambda value: result.setdefault("value", value))
+
+    wait()
+    return result.get("value")
+
+
+def allowed_actions(documents, arn):
+    """Actions the policy documents allow on arn, honouring IAM wildcards."""
+    actions = set()
+    for document in documents:
+        for statement in document["Statement"]:
+            assert statement["Effect"] == "Allow"
+            resources = statement["Resource"]
+            for resource in [resources] if isinstance(resources, str) else resources:
+                if fnmatchcase(arn, resource):
+                    granted = statement["Action"]
+                    actions.update([granted] if isinstance(granted, str) else granted)
+    return actions
+
+
+@pytest.fixture
+def program():
+    """Run the program with the default config and return (mocks, exports)."""
+    exports = {}
+    mocks = run_program(exports=exports)
+    return mocks, exports
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "Pulumi program evaluation benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="time offline evaluation of the Pulumi program",
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=10,
+        help="number of program evaluations to time (default: 10)",
+    )
+    group.addoption(
+        "--benchmark-max-ms",
+        type=float,
+        default=None,
+        help="fail if the median evaluation takes longer than this many milliseconds",
+    )
+
+
+BENCHMARK_RESULTS = []
+
+
+@pytest.fixture
+def benchmark_program(request):
+    """Time repeated evaluations of the program; skipped without --benchmark."""
+    if not request.config.getoption("--benchmark"):
+        pytest.skip("pass --benchmark to time program evaluation")
+
+    def run(name, config=None):
+        rounds = request.config.getoption("--benchmark-rounds")
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            mocks = run_program(config)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        result = {
+            "name": name,
+            "rounds": rounds,
+            "min_ms": timings[0],
+            "median_ms": timings[len(timings) // 2],
+            "max_ms": timings[-1],
+            "resources": len(mocks.resources),
+            "by_type": _count_types(mocks),
+        }
+        BENCHMARK_RESULTS.append(result)
+
+        max_ms = request.config.getoption("--benchmark-max-ms")
+        if max_ms is not None:
+            assert result["median_ms"] <= max_ms, f"{name}: median {result['median_ms']:.1f} ms > {max_ms} ms"
+        return result
+
+    return run
+
+
+def _count_types(mocks):
+    counts = {}
+    for resource in mocks.resources:
+        counts[resource.typ] = counts.get(resource.typ, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARK_RESULTS:
+        return
+
+    terminalreporter.section("Pulumi program evaluation")
+    for result in BENCHMARK_RESULTS:
+        terminalreporter.write_line(
+            f"{result['name']}: median {result['median_ms']:.1f} ms "
+            f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f}, {result['rounds']} rounds), "
+            f"{result['resources']} resources"
+        )
+        for typ, count in result["by_type"].items():
+            terminalreporter.write_line(f"  {count:3d}  {typ}")
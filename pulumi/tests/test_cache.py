@@ -0,0 +1,121 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the shared response cache component.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from conftest import VPC_CIDR, resolve, run_program
+
+NETWORK = {
+    "vpc_id": "vpc-0123456789abcdef0",
+    "private_subnet_ids": ["subnet-aaa", "subnet-bbb"],
+    "public_subnet_ids": ["subnet-ccc", "subnet-ddd"],
+}
+LITELLM_CONFIG = Path(__file__).resolve().parents[2] / "server" / "config" / "litellm-config.yaml"
+HOST = "master.traillens-ai-cache.abc123.cac1.cache.amazonaws.com"
+
+
+@pytest.fixture(scope="module")
+def cached():
+    exports = {}
+    mocks = run_program(
+        {
+            "enable_cache": "true",
+            "enable_proxy_service": "true",
+            "network": json.dumps(NETWORK),
+            "proxy_service": json.dumps({"allowed_cidrs": ["203.0.113.0/24"]}),
+            "cache": json.dumps({"node_type": "cache.r7g.large", "maxmemory_policy": "allkeys-lfu"}),
+        },
+        exports=exports,
+    )
+    return mocks, exports
+
+
+def test_replication_group_is_encrypted_valkey(cached):
+    mocks, _ = cached
+
+    (group,) = mocks.of_type("aws:elasticache/replicationGroup:ReplicationGroup")
+    assert group["engine"] == "valkey"
+    assert group["nodeType"] == "cache.r7g.large"
+    assert group["transitEncryptionEnabled"] is True
+    assert group["atRestEncryptionEnabled"] is True
+    assert group["numCacheClusters"] == 2
+    assert group["automaticFailoverEnabled"] is True
+
+
+def test_parameter_group_sets_eviction_policy(cached):
+    mocks, _ = cached
+
+    (parameters,) = mocks.of_type("aws:elasticache/parameterGroup:ParameterGroup")
+    assert parameters["family"] == "valkey8"
+    assert parameters["parameters"] == [{"name": "maxmemory-policy", "value": "allkeys-lfu"}]
+
+
+def test_only_the_vpc_reaches_the_cache(cached):
+    mocks, _ = cached
+
+    (security_group,) = [
+        group for group in mocks.of_type("aws:ec2/securityGroup:SecurityGroup") if group["name"] == "traillens-ai-cache"
+    ]
+    (rule,) = security_group["ingress"]
+    assert (rule["fromPort"], rule["cidrBlocks"]) == (6379, [VPC_CIDR])
+
+
+def test_proxy_receives_cache_endpoint(cached):
+    mocks, exports = cached
+
+    (task_definition,) = mocks.of_type("aws:ecs/taskDefinition:TaskDefinition")
+    (container,) = json.loads(task_definition["containerDefinitions"])
+    environment = {variable["name"]: variable["value"] for variable in container["environment"]}
+    assert (environment["REDIS_HOST"], environment["REDIS_PORT"], environment["REDIS_SSL"]) == (HOST, "6379", "True")
+    assert resolve(exports["cache_host"]) == HOST
+    assert exports["cache_port"] == 6379
+
+
+def test_proxy_config_keeps_redis_cache(cached):
+    mocks, _ = cached
+
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    litellm_settings = yaml.safe_load(config_object["content"])["litellm_settings"]
+    assert litellm_settings["cache"] is True
+    assert litellm_settings["cache_params"]["host"] == "os.environ/REDIS_HOST"
+
+
+def test_hooks_image_keeps_the_hook_callbacks():
+    image = "registry.example.com/litellm-hooks:1"
+    mocks = run_program(
+        {
+            "enable_cache": "true",
+            "enable_proxy_service": "true",
+            "network": json.dumps(NETWORK),
+            "proxy_service": json.dumps({"allowed_cidrs": ["203.0.113.0/24"], "image": image, "hooks": True}),
+        }
+    )
+
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    callbacks = yaml.safe_load(config_object["content"])["litellm_settings"]["callbacks"]
+    assert callbacks == yaml.safe_load(LITELLM_CONFIG.read_text())["litellm_settings"]["callbacks"]
+    (task_definition,) = mocks.of_type("aws:ecs/taskDefinition:TaskDefinition")
+    (container,) = json.loads(task_definition["containerDefinitions"])
+    environment = {variable["name"]: variable["value"] for variable in container["environment"]}
+    assert (container["image"], environment["PYTHONPATH"]) == (image, "/app")
+
+
+def test_litellm_config_reads_cache_from_environment():
+    cache_params = yaml.safe_load(LITELLM_CONFIG.read_text())["litellm_settings"]["cache_params"]
+    assert (cache_params["host"], cache_params["port"]) == ("os.environ/REDIS_HOST", "os.environ/REDIS_PORT")
+
+
+def test_rejects_unknown_eviction_policy():
+    with pytest.raises(Exception, match="cache.maxmemory_policy"):
+        run_program(
+            {"enable_cache": "true", "network": json.dumps(NETWORK), "cache": json.dumps({"maxmemory_policy": "lru"})}
+        )
@@ -0,0 +1,86 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the application inference profile component.
+"""
+
+import json
+
+import pytest
+from conftest import ACCOUNT_ID, allowed_actions, resolve, run_program
+
+PROFILES = {"haiku": "in-region", "opus": "cross-region", "sonnet": "global"}
+STREAM = {"bedrock:InvokeModel", "bedrock:InvokeModelWithResponseStream"}
+
+
+def _profile_arn(key):
+    return f"arn:aws:bedrock:ca-central-1:{ACCOUNT_ID}:application-inference-profile/traillens-ai-{key}"
+
+
+@pytest.fixture(scope="module")
+def profiled():
+    exports = {}
+    mocks = run_program({"inference_profiles": json.dumps(PROFILES)}, exports=exports)
+    documents = [json.loads(policy["policy"]) for policy in mocks.of_type("aws:iam/policy:Policy")]
+    return mocks, exports, documents
+
+
+def test_profiles_copy_the_configured_source(profiled):
+    mocks, _, _ = profiled
+
+    sources = {
+        profile["name"]: profile["modelSource"]["copyFrom"]
+        for profile in mocks.of_type("aws:bedrock/inferenceProfile:InferenceProfile")
+    }
+    system_profile = f"arn:aws:bedrock:ca-central-1:{ACCOUNT_ID}:inference-profile"
+    assert sources == {
+        "traillens-ai-haiku": "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-haiku-4-5-20251001-v1:0",
+        "traillens-ai-opus": f"{system_profile}/us.anthropic.claude-opus-4-6-v1",
+        "traillens-ai-sonnet": f"{system_profile}/global.anthropic.claude-sonnet-4-6",
+    }
+
+
+def test_profiles_are_tagged(profiled):
+    mocks, _, _ = profiled
+
+    for profile in mocks.of_type("aws:bedrock/inferenceProfile:InferenceProfile"):
+        assert profile["tags"]["Routing"] in {"in-region", "cross-region", "global"}
+        assert profile["tags"]["Project"] == "TrailLens"
+
+
+def test_policy_is_scoped_to_application_profiles(profiled):
+    _, _, documents = profiled
+
+    for key in PROFILES:
+        assert STREAM <= allowed_actions(documents, _profile_arn(key))
+    # System profiles are no longer granted, neither explicitly nor by wildcard.
+    for system_profile in ("us.anthropic.claude-opus-4-6-v1", "global.anthropic.claude-x"):
+        arn = f"arn:aws:bedrock:us-east-1:{ACCOUNT_ID}:inference-profile/{system_profile}"
+        assert "bedrock:InvokeModel" not in allowed_actions(documents, arn)
+    # Cross-region profiles still reach the underlying model in other regions.
+    assert STREAM <= allowed_actions(documents, "arn:aws:bedrock:us-west-2::foundation-model/anthropic.claude-opus-4-6-v1")
+
+
+def test_exports_profile_arns(profiled):
+    _, exports, _ = profiled
+
+    assert resolve(exports["inference_profile_arns"]) == {key: _profile_arn(key) for key in PROFILES}
+
+
+def test_system_profiles_granted_without_application_profiles(program):
+    mocks, exports = program
+    documents = [json.loads(policy["policy"]) for policy in mocks.of_type("aws:iam/policy:Policy")]
+
+    assert not mocks.of_type("aws:bedrock/inferenceProfile:InferenceProfile")
+    assert "inference_profile_arns" not in exports
+    assert allowed_actions(
+        documents, f"arn:aws:bedrock:us-east-1:{ACCOUNT_ID}:inference-profile/us.anthropic.claude-opus-4-6-v1"
+    )
+
+
+def test_rejects_unknown_routing():
+    with pytest.raises(Exception, match="inference_profiles.haiku"):
+        run_program({"inference_profiles": json.dumps({"haiku": "nearest"})})
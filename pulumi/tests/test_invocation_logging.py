@@ -0,0 +1,161 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the Bedrock invocation logging component.
+"""
+
+import json
+
+import pytest
+from conftest import ACCOUNT_ID, resolve, run_program
+
+BUCKET = f"traillens-ai-bedrock-logs-{ACCOUNT_ID}"
+RAW_LOCATION = f"s3://{BUCKET}/invocations/AWSLogs/{ACCOUNT_ID}/BedrockModelInvocationLogs/ca-central-1"
+
+
+@pytest.fixture(scope="module")
+def logging_program():
+    exports = {}
+    mocks = run_program({"enable_invocation_logging": "true"}, exports=exports)
+    return mocks, exports
+
+
+def _tables(mocks):
+    return {table["name"]: table for table in mocks.of_type("aws:glue/catalogTable:CatalogTable")}
+
+
+def test_disabled_by_default(program):
+    mocks, exports = program
+
+    assert not mocks.of_type("aws:bedrockmodel/invocationLoggingConfiguration:InvocationLoggingConfiguration")
+    assert "invocation_logs_bucket" not in exports
+
+
+def test_logging_writes_metadata_to_the_bucket(logging_program):
+    mocks, _ = logging_program
+
+    (configuration,) = mocks.of_type("aws:bedrockmodel/invocationLoggingConfiguration:InvocationLoggingConfiguration")
+    logging_config = configuration["loggingConfig"]
+    assert logging_config["s3Config"] == {"bucketName": BUCKET, "keyPrefix": "invocations"}
+    assert logging_config["textDataDeliveryEnabled"] is False
+
+
+def test_bucket_is_private_encrypted_and_expires_logs(logging_program):
+    mocks, _ = logging_program
+
+    (block,) = mocks.of_type("aws:s3/bucketPublicAccessBlock:BucketPublicAccessBlock")
+    assert all(block[flag] for flag in ("blockPublicAcls", "blockPublicPolicy", "ignorePublicAcls", "restrictPublicBuckets"))
+
+    (encryption,) = mocks.of_type("aws:s3/bucketServerSideEncryptionConfiguration:BucketServerSideEncryptionConfiguration")
+    assert encryption["rules"][0]["applyServerSideEncryptionByDefault"]["sseAlgorithm"] == "AES256"
+
+    (lifecycle,) = mocks.of_type("aws:s3/bucketLifecycleConfiguration:BucketLifecycleConfiguration")
+    expirations = {rule["filter"]["prefix"]: rule["expiration"]["days"] for rule in lifecycle["rules"]}
+    assert expirations == {"invocations/": 90, "curated/": 400, "athena-results/": 7}
+
+
+def test_bucket_policy_scopes_bedrock_writes_to_the_account(logging_program):
+    mocks, _ = logging_program
+
+    (policy,) = mocks.of_type("aws:s3/bucketPolicy:BucketPolicy")
+    statements = {statement["Sid"]: statement for statement in json.loads(policy["policy"])["Statement"]}
+    write = statements["AllowBedrockInvocationLogs"]
+    assert write["Principal"] == {"Service": "bedrock.amazonaws.com"}
+    assert write["Resource"] == f"arn:aws:s3:::{BUCKET}/invocations/AWSLogs/{ACCOUNT_ID}/*"
+    assert write["Condition"]["StringEquals"] == {"aws:SourceAccount": ACCOUNT_ID}
+    assert statements["DenyInsecureTransport"]["Effect"] == "Deny"
+
+
+def test_raw_table_projects_date_partitions(logging_program):
+    mocks, _ = logging_program
+
+    raw = _tables(mocks)["bedrock_invocations_raw"]
+    assert raw["partitionKeys"] == [{"name": "dt", "type": "string"}]
+    assert raw["parameters"]["projection.dt.format"] == "yyyy/MM/dd"
+    assert raw["parameters"]["storage.location.template"] == RAW_LOCATION + "/${dt}/"
+    assert raw["storageDescriptor"]["serDeInfo"]["serializationLibrary"] == "org.openx.data.jsonserde.JsonSerDe"
+
+
+def test_curated_table_is_partitioned_by_date_and_model(logging_program):
+    mocks, _ = logging_program
+
+    curated = _tables(mocks)["bedrock_invocations"]
+    assert [key["name"] for key in curated["partitionKeys"]] == ["dt", "model"]
+    assert curated["storageDescriptor"]["location"] == f"s3://{BUCKET}/curated/bedrock_invocations/"
+
+    (query,) = mocks.of_type("aws:athena/namedQuery:NamedQuery")
+    # Partition columns must be selected last, in partition key order.
+    assert query["query"].index("AS dt") < query["query"].index("AS model") < query["query"].index("FROM")
+    assert "INSERT INTO traillens_ai_bedrock_logs.bedrock_invocations" in query["query"]
+
+
+def test_workgroup_limits_scans_and_stores_results_in_the_bucket(logging_program):
+    mocks, exports = logging_program
+
+    (workgroup,) = mocks.of_type("aws:athena/workgroup:Workgroup")
+    configuration = workgroup["configuration"]
+    assert configuration["bytesScannedCutoffPerQuery"] == 1024**3
+    assert configuration["resultConfiguration"]["outputLocation"] == f"s3://{BUCKET}/athena-results/"
+    assert resolve(exports["invocation_logs_bucket"]) == BUCKET
+    assert resolve(exports["invocation_logs_workgroup"]) == "traillens-ai-bedrock-logs"
+
+
+def test_settings_override_retention_and_payload_logging():
+    mocks = run_program(
+        {
+            "enable_invocation_logging": "true",
+            "invocation_logging": json.dumps({"retention_days": 30, "log_payloads": True}),
+        }
+    )
+
+    (lifecycle,) = mocks.of_type("aws:s3/bucketLifecycleConfiguration:BucketLifecycleConfiguration")
+    assert lifecycle["rules"][0]["expiration"]["days"] == 30
+    (configuration,) = mocks.of_type("aws:bedrockmodel/invocationLoggingConfiguration:InvocationLoggingConfiguration")
+    assert configuration["loggingConfig"]["textDataDeliveryEnabled"] is True
+
+
+def test_daily_load_is_scheduled_and_guarded_against_reruns(logging_program):
+    mocks, _ = logging_program
+
+    (schedule,) = mocks.of_type("aws:scheduler/schedule:Schedule")
+    assert schedule["scheduleExpression"] == "cron(30 2 * * ? *)"
+    assert schedule["scheduleExpressionTimezone"] == "UTC"
+    target = schedule["target"]
+    assert target["arn"] == "arn:aws:scheduler:::aws-sdk:athena:startQueryExecution"
+    request = json.loads(target["input"])
+    assert request["WorkGroup"] == "traillens-ai-bedrock-logs"
+    assert request["QueryExecutionContext"] == {"Database": "traillens_ai_bedrock_logs"}
+    assert request["QueryString"].startswith("INSERT INTO traillens_ai_bedrock_logs.bedrock_invocations")
+    assert "AND NOT EXISTS" in request["QueryString"]
+
+    (named_query,) = mocks.of_type("aws:athena/namedQuery:NamedQuery")
+    assert named_query["query"] == request["QueryString"]
+
+
+def test_load_role_is_limited_to_the_workgroup_tables_and_bucket(logging_program):
+    mocks, _ = logging_program
+
+    (role,) = [role for role in mocks.of_type("aws:iam/role:Role") if role["name"] == "traillens-ai-bedrock-logs-load"]
+    (principal,) = [statement["Principal"] for statement in json.loads(role["assumeRolePolicy"])["Statement"]]
+    assert principal == {"Service": "scheduler.amazonaws.com"}
+
+    (policy,) = mocks.of_type("aws:iam/rolePolicy:RolePolicy")
+    statements = json.loads(policy["policy"])["Statement"]
+    assert statements[0]["Resource"] == f"arn:aws:athena:ca-central-1:{ACCOUNT_ID}:workgroup/traillens-ai-bedrock-logs"
+    writes = next(statement for statement in statements if "s3:PutObject" in statement["Action"])
+    assert writes["Resource"] == [f"arn:aws:s3:::{BUCKET}/curated/*", f"arn:aws:s3:::{BUCKET}/athena-results/*"]
+
+
+def test_load_schedule_can_be_overridden():
+    mocks = run_program(
+        {
+            "enable_invocation_logging": "true",
+            "invocation_logging": json.dumps({"load_schedule": "cron(0 6 * * ? *)"}),
+        }
+    )
+
+    (schedule,) = mocks.of_type("aws:scheduler/schedule:Schedule")
+    assert schedule["scheduleExpression"] == "cron(0 6 * * ? *)"
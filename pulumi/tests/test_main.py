@@ -0,0 +1,175 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the TrailLens AI Pulumi program (__main__.py).
+"""
+
+import json
+import sys
+
+import pytest
+from conftest import ACCOUNT_ID, allowed_actions, resolve, run_program
+
+import pulumi
+
+# IAM managed policy documents are limited to 6144 characters.
+MANAGED_POLICY_LIMIT = 6144
+
+
+def test_program_registers_expected_resources(program):
+    mocks, _ = program
+
+    counts = {}
+    for resource in mocks.resources:
+        counts[resource.typ] = counts.get(resource.typ, 0) + 1
+
+    assert counts == {
+        "aws:iam/user:User": 1,
+        "aws:iam/accessKey:AccessKey": 1,
+        "aws:iam/policy:Policy": 1,
+        "aws:iam/userPolicyAttachment:UserPolicyAttachment": 1,
+        "aws:sns/topic:Topic": 1,
+        "aws:sns/topicPolicy:TopicPolicy": 1,
+        "aws:sns/topicSubscription:TopicSubscription": 1,
+        "aws:budgets/budget:Budget": 1,
+        "aws:costexplorer/anomalySubscription:AnomalySubscription": 1,
+    }
+
+
+def test_bedrock_policy_grants_every_model(program):
+    mocks, _ = program
+    policies = mocks.of_type("aws:iam/policy:Policy")
+    documents = [json.loads(policy["policy"]) for policy in policies]
+
+    invoke = {"bedrock:InvokeModel"}
+    stream = {"bedrock:InvokeModel", "bedrock:InvokeModelWithResponseStream"}
+    expected = {
+        "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-opus-4-6-v1": stream,
+        "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-sonnet-4-6": stream,
+        "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-haiku-4-5-20251001-v1:0": stream,
+        "arn:aws:bedrock:*:*:inference-profile/us.anthropic.claude-*": stream,
+        "arn:aws:bedrock:*:*:inference-profile/global.anthropic.claude-*": stream,
+        "arn:aws:bedrock:ca-central-1::foundation-model/meta.llama3-70b-instruct-v1:0": stream,
+        "arn:aws:bedrock:ca-central-1::foundation-model/amazon.titan-embed-text-v2:0": invoke,
+        "arn:aws:bedrock:ca-central-1::foundation-model/cohere.rerank-v3-5:0": invoke,
+        "arn:aws:bedrock:us-east-1::foundation-model/amazon.titan-image-generator-v2:0": invoke,
+        "arn:aws:bedrock:us-east-1::foundation-model/moonshotai.kimi-k2.5": stream,
+    }
+    for arn, actions in expected.items():
+        assert actions <= allowed_actions(documents, arn), arn
+
+    assert "bedrock:Rerank" in allowed_actions(documents, "*")
+    for policy in policies:
+        assert len(policy["policy"]) <= MANAGED_POLICY_LIMIT
+
+
+def test_bedrock_policy_is_attached_to_user(program):
+    mocks, _ = program
+    (user,) = mocks.of_type("aws:iam/user:User")
+    (attachment,) = mocks.of_type("aws:iam/userPolicyAttachment:UserPolicyAttachment")
+    (policy,) = mocks.of_type("aws:iam/policy:Policy")
+
+    assert user["name"] == "traillens-ai-bedrock-user"
+    assert attachment["user"] == user["name"]
+    assert attachment["policyArn"] == f"arn:aws:iam::{ACCOUNT_ID}:policy/{policy['name']}"
+
+
+def test_budget_notifications(program):
+    mocks, _ = program
+    (topic,) = mocks.of_type("aws:sns/topic:Topic")
+    (budget,) = mocks.of_type("aws:budgets/budget:Budget")
+
+    assert budget["limitAmount"] == "100"
+    assert budget["timeUnit"] == "MONTHLY"
+    assert budget["costFilters"] == [{"name": "LinkedAccount", "values": [ACCOUNT_ID]}]
+
+    thresholds = {"ACTUAL": [], "FORECASTED": []}
+    for notification in budget["notifications"]:
+        assert notification["comparisonOperator"] == "GREATER_THAN"
+        assert notification["thresholdType"] == "PERCENTAGE"
+        assert notification["subscriberSnsTopicArns"] == [
+            f"arn:aws:mock:ca-central-1:{ACCOUNT_ID}:aws:sns/topic:Topic/{topic['name']}"
+        ]
+        thresholds[notification["notificationType"]].append(notification["threshold"])
+
+    assert thresholds == {"ACTUAL": [40, 60, 80, 100, 150, 200], "FORECASTED": [100]}
+
+
+def test_budget_topic_policy_allows_alert_publishers(program):
+    mocks, _ = program
+    (topic_policy,) = mocks.of_type("aws:sns/topicPolicy:TopicPolicy")
+    statements = {statement["Sid"]: statement for statement in json.loads(topic_policy["policy"])["Statement"]}
+
+    assert statements["AllowBudgetsPublish"]["Principal"] == {"Service": "budgets.amazonaws.com"}
+    assert statements["AllowCostExplorerPublish"]["Principal"] == {"Service": "costalerts.amazonaws.com"}
+    assert statements["AllowCloudWatchAlarmsPublish"]["Principal"] == {"Service": "cloudwatch.amazonaws.com"}
+    for sid in ("AllowBudgetsPublish", "AllowCostExplorerPublish", "AllowCloudWatchAlarmsPublish"):
+        assert statements[sid]["Condition"] == {"StringEquals": {"aws:SourceAccount": ACCOUNT_ID}}
+    assert statements["AllowAccountOwner"]["Principal"] == {"AWS": f"arn:aws:iam::{ACCOUNT_ID}:root"}
+
+
+def test_anomaly_subscription(program):
+    mocks, _ = program
+    (subscription,) = mocks.of_type("aws:costexplorer/anomalySubscription:AnomalySubscription")
+
+    assert subscription["frequency"] == "IMMEDIATE"
+    assert subscription["monitorArnLists"][0].startswith(f"arn:aws:ce::{ACCOUNT_ID}:anomalymonitor/")
+    assert [subscriber["type"] for subscriber in subscription["subscribers"]] == ["SNS"]
+    assert subscription["thresholdExpression"]["dimension"] == {
+        "key": "ANOMALY_TOTAL_IMPACT_ABSOLUTE",
+        "matchOptions": ["GREATER_THAN_OR_EQUAL"],
+        "values": ["50"],
+    }
+
+
+def test_exports(program):
+    _, exports = program
+
+    assert resolve(exports["iam_user_name"]) == "traillens-ai-bedrock-user"
+    assert resolve(exports["secret_access_key"]) == "mock-secret-access-key"
+    assert exports["region"] == "ca-central-1"
+    assert exports["models"]["haiku"] == "anthropic.claude-haiku-4-5-20251001-v1:0"
+    assert len(exports["models"]) == 10
+
+
+def test_rejects_region_outside_canada():
+    with pytest.raises(Exception, match="Invalid region"):
+        run_program({"region": "us-east-1"})
+
+
+def test_benchmark_program_evaluation(benchmark_program):
+    full = benchmark_program("full program", {"enable_monitoring": "true"})
+    only = {"enable_bedrock": "false", "enable_budget": "false", "enable_monitoring": "false"}
+    bedrock_only = benchmark_program("bedrock only", {**only, "enable_bedrock": "true"})
+    budget_only = benchmark_program("budget only", {**only, "enable_budget": "true"})
+    monitoring_only = benchmark_program("monitoring only", {**only, "enable_monitoring": "true", "budget_alert_email": ""})
+
+    assert bedrock_only["resources"] + budget_only["resources"] + monitoring_only["resources"] == full["resources"]
+
+
+def test_disabled_component_is_not_imported(monkeypatch):
+    monkeypatch.delitem(sys.modules, "components.budget", raising=False)
+    exports = {}
+
+    mocks = run_program({"enable_budget": "false", "budget_alert_email": ""}, exports=exports)
+
+    assert "components.budget" not in sys.modules
+    assert not mocks.of_type("aws:budgets/budget:Budget")
+    assert not mocks.of_type("aws:sns/topic:Topic")
+    assert mocks.of_type("aws:iam/user:User")
+    assert "budget_id" not in exports
+
+
+def test_import_profile_is_logged(monkeypatch):
+    monkeypatch.delitem(sys.modules, "components.bedrock", raising=False)
+    messages = []
+    monkeypatch.setattr(pulumi.log, "info", lambda message, *args, **kwargs: messages.append(message))
+
+    run_program({"profile_imports": "true", "enable_budget": "false"})
+
+    assert any(message.startswith("components.bedrock: imported") for message in messages)
+    assert "import time: self [us] | cumulative | imported package" in messages
+    assert any(message.endswith("components.bedrock") and message.startswith("import time:") for message in messages)
@@ -0,0 +1,76 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the CloudWatch monitoring component.
+"""
+
+import json
+
+from conftest import ACCOUNT_ID, run_program
+
+TOPIC_ARN = f"arn:aws:mock:ca-central-1:{ACCOUNT_ID}:aws:sns/topic:Topic/traillens-ai-budget-alerts"
+MONITORING = {"enable_monitoring": "true"}
+
+
+def _alarms(mocks):
+    return {alarm["name"]: alarm for alarm in mocks.of_type("aws:cloudwatch/metricAlarm:MetricAlarm")}
+
+
+def test_dashboard_has_a_row_per_model_in_its_region():
+    mocks = run_program(MONITORING)
+
+    (dashboard,) = mocks.of_type("aws:cloudwatch/dashboard:Dashboard")
+    widgets = json.loads(dashboard["dashboardBody"])["widgets"]
+    regions = {widget["properties"]["title"]: widget["properties"]["region"] for widget in widgets}
+
+    assert len(widgets) == 3 * 10
+    assert regions["Moonshot Kimi K2.5 latency (ms)"] == "us-east-1"
+    assert regions["Claude Haiku 4.5 latency (ms)"] == "ca-central-1"
+
+    latency = next(widget for widget in widgets if widget["properties"]["title"] == "Claude Haiku 4.5 latency (ms)")
+    assert [metric[3] for metric in latency["properties"]["metrics"]] == ["us.anthropic.claude-haiku-4-5-20251001-v1:0"] * 3
+    assert [metric[4]["stat"] for metric in latency["properties"]["metrics"]] == ["p50", "p90", "p99"]
+
+
+def test_alarms_only_for_stack_region_models():
+    mocks = run_program(MONITORING)
+    alarms = _alarms(mocks)
+
+    # 8 of the 10 catalog models are invoked in ca-central-1.
+    assert len(alarms) == 8 * 3
+    assert "traillens-ai-kimi-k2-5-throttles" not in alarms
+    for alarm in alarms.values():
+        assert alarm["alarmActions"] == [TOPIC_ARN]
+        # Recoveries are not sent to the budget topic.
+        assert not alarm.get("okActions")
+        assert alarm["treatMissingData"] == "notBreaching"
+
+
+def test_latency_thresholds_default_by_mode_and_can_be_overridden():
+    mocks = run_program({**MONITORING, "monitoring": json.dumps({"latency_p99_ms": {"haiku": 4000}, "throttles": 1})})
+    alarms = _alarms(mocks)
+
+    assert alarms["traillens-ai-haiku-latency-p99"]["threshold"] == 4000
+    assert alarms["traillens-ai-haiku-latency-p99"]["extendedStatistic"] == "p99"
+    assert alarms["traillens-ai-opus-latency-p99"]["threshold"] == 60000
+    assert alarms["traillens-ai-titan-embed-latency-p99"]["threshold"] == 2000
+    assert alarms["traillens-ai-sonnet-throttles"]["threshold"] == 1
+    assert alarms["traillens-ai-sonnet-throttles"]["dimensions"] == {"ModelId": "us.anthropic.claude-sonnet-4-6"}
+
+
+def test_alarms_without_budget_have_no_actions():
+    mocks = run_program({**MONITORING, "enable_budget": "false", "budget_alert_email": ""})
+
+    assert all(alarm["alarmActions"] == [] for alarm in _alarms(mocks).values())
+
+
+def test_monitoring_is_off_by_default():
+    exports = {}
+    mocks = run_program(exports=exports)
+
+    assert not mocks.of_type("aws:cloudwatch/dashboard:Dashboard")
+    assert not _alarms(mocks)
+    assert "dashboard_name" not in exports
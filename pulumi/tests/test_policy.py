@@ -0,0 +1,156 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for the model catalog and the IAM policy compiler (utils/policy.py).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from conftest import allowed_actions
+from utils.models import CATALOG, STREAM_ACTIONS, BedrockModel, get_model
+from utils.policy import (
+    MANAGED_POLICY_MAX_BYTES,
+    build_statements,
+    compile_policy_documents,
+    shard_statements,
+)
+
+LITELLM_CONFIG = Path(__file__).resolve().parents[2] / "server" / "config" / "litellm-config.yaml"
+REGION = "ca-central-1"
+
+
+def _documents(models, **kwargs):
+    return [json.loads(document) for document in compile_policy_documents(models, REGION, **kwargs)]
+
+
+def test_catalog_policy_is_compact():
+    (document,) = compile_policy_documents(CATALOG, REGION)
+
+    assert " " not in document
+    assert "\n" not in document
+    assert len(document) < 2048
+
+
+def test_every_catalog_model_is_granted():
+    documents = _documents(CATALOG)
+
+    for model in CATALOG:
+        assert set(model.actions) <= allowed_actions(documents, model.foundation_model_arn(REGION)), model.key
+        if model.profile_prefix:
+            arn = f"arn:aws:bedrock:us-west-2:{'1' * 12}:inference-profile/{model.invocation_id}"
+            assert set(model.actions) <= allowed_actions(documents, arn), model.key
+        for action in model.unscoped_actions:
+            assert action in allowed_actions(documents, "*")
+
+
+def test_statements_merge_by_action_set():
+    statements = build_statements(
+        [
+            (("bedrock:InvokeModel",), "arn:a"),
+            (("bedrock:InvokeModel",), "arn:b"),
+            (("bedrock:InvokeModelWithResponseStream",), "arn:b"),
+            (("bedrock:InvokeModel",), "arn:a"),
+        ]
+    )
+
+    assert statements == [
+        {"Effect": "Allow", "Action": "bedrock:InvokeModel", "Resource": "arn:a"},
+        {"Effect": "Allow", "Action": list(STREAM_ACTIONS), "Resource": "arn:b"},
+    ]
+
+
+def test_wildcards_absorb_covered_resources_with_fewer_actions():
+    statements = build_statements(
+        [
+            (STREAM_ACTIONS, "arn:aws:bedrock:*::foundation-model/anthropic.claude-*"),
+            (STREAM_ACTIONS, "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-opus"),
+            (("bedrock:InvokeModel",), "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-haiku"),
+            # A wildcard granting fewer actions must not absorb a resource.
+            (("bedrock:InvokeModel",), "arn:aws:bedrock:*::foundation-model/meta.*"),
+            (STREAM_ACTIONS, "arn:aws:bedrock:ca-central-1::foundation-model/meta.llama"),
+        ]
+    )
+
+    resources = [statement["Resource"] for statement in statements]
+    assert resources == [
+        "arn:aws:bedrock:*::foundation-model/meta.*",
+        [
+            "arn:aws:bedrock:*::foundation-model/anthropic.claude-*",
+            "arn:aws:bedrock:ca-central-1::foundation-model/meta.llama",
+        ],
+    ]
+
+
+def test_condition_only_applies_to_invoke_statements():
+    condition = {"StringEquals": {"aws:SourceVpce": "vpce-123"}}
+    statements = build_statements([(("bedrock:InvokeModel",), "arn:a"), (("bedrock:ListFoundationModels",), "*")], condition)
+
+    assert statements[0]["Condition"] == condition
+    assert "Condition" not in statements[1]
+
+
+def test_condition_skips_models_pinned_to_another_region():
+    condition = {"StringEquals": {"aws:SourceVpce": "vpce-123"}}
+    documents = _documents(CATALOG, condition=condition)
+    statements = [statement for document in documents for statement in document["Statement"]]
+
+    def conditions_for(resource):
+        return [
+            statement.get("Condition")
+            for statement in statements
+            if resource in (statement["Resource"] if isinstance(statement["Resource"], list) else [statement["Resource"]])
+        ]
+
+    pinned = [model for model in CATALOG if model.region and model.region != REGION]
+    assert pinned
+    for model in pinned:
+        assert conditions_for(model.foundation_model_arn(REGION)) == [None]
+    local = get_model("titan_embed")
+    assert conditions_for(local.foundation_model_arn(REGION)) == [condition]
+    assert conditions_for("arn:aws:bedrock:*::foundation-model/anthropic.claude-*") == [condition]
+
+
+def test_large_catalog_is_sharded_under_the_limit():
+    models = [
+        BedrockModel(
+            key=f"m{index}", name=f"Model {index}", model_id=f"vendor.model-{index:04d}-v1:0", streaming=index % 2 == 0
+        )
+        for index in range(400)
+    ]
+
+    compiled = compile_policy_documents(models, REGION)
+    documents = [json.loads(document) for document in compiled]
+
+    assert len(compiled) > 1
+    assert all(len(document) <= MANAGED_POLICY_MAX_BYTES for document in compiled)
+    for model in models:
+        assert set(model.actions) <= allowed_actions(documents, model.foundation_model_arn(REGION)), model.key
+
+
+def test_oversized_single_resource_is_rejected():
+    statement = {"Effect": "Allow", "Action": "bedrock:InvokeModel", "Resource": "arn:" + "x" * 200}
+
+    with pytest.raises(Exception, match="exceeds"):
+        shard_statements([statement], max_bytes=100)
+
+
+def test_catalog_matches_litellm_config():
+    model_list = yaml.safe_load(LITELLM_CONFIG.read_text())["model_list"]
+    deployments = {entry["model_name"]: entry["litellm_params"]["model"] for entry in model_list}
+    catalog = {model.litellm_name: model for model in CATALOG if model.litellm_name}
+
+    assert set(deployments) == set(catalog)
+    for name, model in catalog.items():
+        assert deployments[name].endswith(model.invocation_id), name
+
+
+def test_get_model():
+    assert get_model("haiku").model_id == "anthropic.claude-haiku-4-5-20251001-v1:0"
+    with pytest.raises(Exception, match="Unknown model"):
+        get_model("gpt-4")
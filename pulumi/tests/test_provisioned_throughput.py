@@ -0,0 +1,74 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the Bedrock Provisioned Throughput component.
+"""
+
+import json
+import sys
+
+import pytest
+from conftest import ACCOUNT_ID, allowed_actions, resolve, run_program
+
+THROUGHPUT = {"haiku": {"model_units": 2, "commitment": "OneMonth"}}
+PROVISIONED_ARN = f"arn:aws:bedrock:ca-central-1:{ACCOUNT_ID}:provisioned-model/traillens-ai-haiku-provisioned"
+
+
+def test_disabled_by_default(program):
+    mocks, exports = program
+
+    assert not mocks.of_type("aws:bedrock/provisionedModelThroughput:ProvisionedModelThroughput")
+    assert "provisioned_model_arns" not in exports
+
+
+def test_disabled_component_is_not_imported(monkeypatch):
+    monkeypatch.delitem(sys.modules, "components.provisioned_throughput", raising=False)
+
+    run_program()
+
+    assert "components.provisioned_throughput" not in sys.modules
+
+
+def test_provisions_configured_models():
+    exports = {}
+    mocks = run_program({"provisioned_throughput": json.dumps(THROUGHPUT)}, exports=exports)
+
+    (throughput,) = mocks.of_type("aws:bedrock/provisionedModelThroughput:ProvisionedModelThroughput")
+    assert throughput["modelArn"] == (
+        "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-haiku-4-5-20251001-v1:0"
+    )
+    assert throughput["modelUnits"] == 2
+    assert throughput["commitmentDuration"] == "OneMonth"
+    assert resolve(exports["provisioned_model_arns"]) == {"haiku": PROVISIONED_ARN}
+
+
+def test_provisioned_models_are_granted_to_the_bedrock_user():
+    mocks = run_program({"provisioned_throughput": json.dumps(THROUGHPUT)})
+
+    policies = {policy["name"]: policy for policy in mocks.of_type("aws:iam/policy:Policy")}
+    document = json.loads(policies["traillens-ai-bedrock-resource-policy"]["policy"])
+    assert allowed_actions([document], PROVISIONED_ARN) == {
+        "bedrock:InvokeModel",
+        "bedrock:InvokeModelWithResponseStream",
+    }
+
+    attachments = mocks.of_type("aws:iam/userPolicyAttachment:UserPolicyAttachment")
+    assert f"arn:aws:iam::{ACCOUNT_ID}:policy/traillens-ai-bedrock-resource-policy" in {
+        attachment["policyArn"] for attachment in attachments
+    }
+
+
+@pytest.mark.parametrize(
+    "throughput, message",
+    [
+        ({"gpt-4": {"model_units": 1}}, "Unknown model"),
+        ({"haiku": {"model_units": 0}}, "model_units"),
+        ({"haiku": {"model_units": 1, "commitment": "OneYear"}}, "commitment"),
+    ],
+)
+def test_rejects_invalid_config(throughput, message):
+    with pytest.raises(Exception, match=message):
+        run_program({"provisioned_throughput": json.dumps(throughput)})
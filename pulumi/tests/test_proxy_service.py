@@ -0,0 +1,207 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the LiteLLM proxy service component.
+"""
+
+import hashlib
+import json
+
+import pytest
+import yaml
+from conftest import ACCOUNT_ID, resolve, run_program
+
+NETWORK = {
+    "vpc_id": "vpc-0123456789abcdef0",
+    "private_subnet_ids": ["subnet-aaa", "subnet-bbb"],
+    "public_subnet_ids": ["subnet-ccc", "subnet-ddd"],
+}
+PROXY = {"workers": 2, "min_tasks": 2, "max_tasks": 6, "p95_response_time": 2.5, "allowed_cidrs": ["203.0.113.0/24"]}
+
+
+@pytest.fixture(scope="module")
+def proxied():
+    exports = {}
+    mocks = run_program(
+        {"enable_proxy_service": "true", "network": json.dumps(NETWORK), "proxy_service": json.dumps(PROXY)},
+        exports=exports,
+    )
+    return mocks, exports
+
+
+def _container(mocks):
+    (task_definition,) = mocks.of_type("aws:ecs/taskDefinition:TaskDefinition")
+    (container,) = json.loads(task_definition["containerDefinitions"])
+    return task_definition, container
+
+
+def test_task_runs_litellm_with_configured_workers(proxied):
+    mocks, _ = proxied
+    task_definition, container = _container(mocks)
+
+    assert task_definition["requiresCompatibilities"] == ["FARGATE"]
+    assert container["command"] == ["--port", "4000", "--num_workers", "2"]
+    assert container["image"].startswith("docker.litellm.ai/berriai/litellm-database")
+    environment = {variable["name"]: variable["value"] for variable in container["environment"]}
+    assert environment["LITELLM_CONFIG_BUCKET_NAME"] == f"traillens-ai-proxy-config-{ACCOUNT_ID}"
+    assert environment["LITELLM_CONFIG_BUCKET_OBJECT_KEY"] == "litellm-config.yaml"
+    assert len(environment["LITELLM_CONFIG_SHA256"]) == 64
+
+
+def test_task_uses_role_and_ssm_secrets_instead_of_access_keys(proxied):
+    mocks, _ = proxied
+    _, container = _container(mocks)
+
+    assert {secret["name"] for secret in container["secrets"]} == {
+        "LITELLM_MASTER_KEY",
+        "LITELLM_SALT_KEY",
+        "DATABASE_URL",
+    }
+    assert not any(variable["name"].startswith("AWS_ACCESS_KEY") for variable in container["environment"])
+
+    attachments = mocks.of_type("aws:iam/rolePolicyAttachment:RolePolicyAttachment")
+    bedrock_arns = {attachment["policyArn"] for attachment in attachments if attachment["role"] == "traillens-ai-proxy-task"}
+    assert bedrock_arns == {f"arn:aws:iam::{ACCOUNT_ID}:policy/traillens-ai-bedrock-policy"}
+
+
+def test_config_object_is_rendered_for_production(proxied):
+    mocks, _ = proxied
+
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    assert config_object["key"] == "litellm-config.yaml"
+    config = yaml.safe_load(config_object["content"])
+    assert config["general_settings"]["master_key"] == "os.environ/LITELLM_MASTER_KEY"
+    assert not {"set_verbose", "mock_response", "cors_origin"} & set(config["general_settings"])
+    assert config["model_list"]
+
+
+def test_config_drops_redis_cache_without_shared_cache(proxied):
+    mocks, _ = proxied
+
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    _, container = _container(mocks)
+    litellm_settings = yaml.safe_load(config_object["content"])["litellm_settings"]
+    assert not {"cache", "cache_params"} & set(litellm_settings)
+    assert not any(variable["name"] == "REDIS_HOST" for variable in container["environment"])
+
+
+def test_config_drops_hooks_the_stock_image_cannot_load(proxied):
+    mocks, _ = proxied
+
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    litellm_settings = yaml.safe_load(config_object["content"])["litellm_settings"]
+    assert not any(callback.startswith("hooks.") for callback in litellm_settings.get("callbacks", []))
+
+
+def test_config_digest_tracks_the_rendered_config(proxied):
+    mocks, _ = proxied
+    (config_object,) = mocks.of_type("aws:s3/bucketObjectv2:BucketObjectv2")
+    _, container = _container(mocks)
+
+    environment = {variable["name"]: variable["value"] for variable in container["environment"]}
+    assert environment["LITELLM_CONFIG_SHA256"] == hashlib.sha256(config_object["content"].encode()).hexdigest()
+
+
+def test_load_balancer_fronts_private_tasks(proxied):
+    mocks, _ = proxied
+
+    (load_balancer,) = mocks.of_type("aws:lb/loadBalancer:LoadBalancer")
+    assert load_balancer["subnets"] == NETWORK["public_subnet_ids"]
+    assert load_balancer["idleTimeout"] == 300
+    (target_group,) = mocks.of_type("aws:lb/targetGroup:TargetGroup")
+    assert target_group["targetType"] == "ip"
+    assert target_group["healthCheck"]["path"] == "/health/liveliness"
+    (service,) = mocks.of_type("aws:ecs/service:Service")
+    assert service["networkConfiguration"]["subnets"] == NETWORK["private_subnet_ids"]
+    assert service["networkConfiguration"]["assignPublicIp"] is False
+
+
+def test_scales_on_request_count_and_p95_latency(proxied):
+    mocks, _ = proxied
+
+    (target,) = mocks.of_type("aws:appautoscaling/target:Target")
+    assert (target["minCapacity"], target["maxCapacity"]) == (2, 6)
+    assert target["resourceId"] == "service/traillens-ai-proxy/traillens-ai-proxy"
+
+    policies = {
+        policy["name"]: policy["targetTrackingScalingPolicyConfiguration"]
+        for policy in mocks.of_type("aws:appautoscaling/policy:Policy")
+    }
+    requests = policies["traillens-ai-proxy-requests-per-target"]
+    assert requests["predefinedMetricSpecification"]["resourceLabel"] == (
+        "app/traillens-ai-proxy/0123456789abcdef/targetgroup/traillens-ai-proxy/0123456789abcdef"
+    )
+    latency = policies["traillens-ai-proxy-p95-response-time"]
+    assert latency["targetValue"] == 2.5
+    (metric,) = latency["customizedMetricSpecification"]["metrics"]
+    assert metric["metricStat"]["stat"] == "p95"
+    assert metric["metricStat"]["metric"]["metricName"] == "TargetResponseTime"
+
+
+def test_exports_proxy_url(proxied):
+    _, exports = proxied
+
+    assert resolve(exports["proxy_url"]) == "http://traillens-ai-proxy-123456789.ca-central-1.elb.amazonaws.com"
+
+
+def test_https_listener_with_certificate():
+    certificate = f"arn:aws:acm:ca-central-1:{ACCOUNT_ID}:certificate/abc"
+    mocks = run_program(
+        {
+            "enable_proxy_service": "true",
+            "network": json.dumps(NETWORK),
+            "proxy_service": json.dumps({"certificate_arn": certificate}),
+        }
+    )
+
+    (listener,) = mocks.of_type("aws:lb/listener:Listener")
+    assert (listener["port"], listener["protocol"], listener["certificateArn"]) == (443, "HTTPS", certificate)
+
+
+def test_proxy_service_disabled_by_default(program):
+    mocks, exports = program
+
+    assert not mocks.of_type("aws:ecs/service:Service")
+    assert "proxy_url" not in exports
+
+
+@pytest.mark.parametrize("proxy", [{}, {"allowed_cidrs": ["10.0.0.0/8", "0.0.0.0/0"]}])
+def test_rejects_plain_http_open_to_the_internet(proxy):
+    with pytest.raises(Exception, match="certificate_arn or allowed_cidrs"):
+        run_program({"enable_proxy_service": "true", "network": json.dumps(NETWORK), "proxy_service": json.dumps(proxy)})
+
+
+def test_internal_proxy_may_use_plain_http():
+    mocks = run_program(
+        {"enable_proxy_service": "true", "network": json.dumps(NETWORK), "proxy_service": json.dumps({"internal": True})}
+    )
+
+    (listener,) = mocks.of_type("aws:lb/listener:Listener")
+    assert listener["protocol"] == "HTTP"
+
+
+@pytest.mark.parametrize(
+    ("proxy", "message"),
+    [
+        ({"hooks": True}, "requires proxy_service.image"),
+        ({"hooks": True, "image": "registry.example.com/litellm-hooks:1"}, "requires enable_cache"),
+    ],
+)
+def test_hooks_require_an_image_and_the_cache(proxy, message):
+    with pytest.raises(Exception, match=message):
+        run_program(
+            {
+                "enable_proxy_service": "true",
+                "network": json.dumps(NETWORK),
+                "proxy_service": json.dumps({**PROXY, **proxy}),
+            }
+        )
+
+
+def test_requires_public_subnets_unless_internal():
+    network = {key: value for key, value in NETWORK.items() if key != "public_subnet_ids"}
+    with pytest.raises(Exception, match="network.public_subnet_ids"):
+        run_program({"enable_proxy_service": "true", "network": json.dumps(network)})
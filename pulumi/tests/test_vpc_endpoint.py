@@ -0,0 +1,91 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline tests for the bedrock-runtime VPC endpoint component.
+"""
+
+import json
+
+import pytest
+from conftest import VPC_CIDR, allowed_actions, resolve, run_program
+
+NETWORK = {"vpc_id": "vpc-0123456789abcdef0", "private_subnet_ids": ["subnet-a", "subnet-b"]}
+ENDPOINT_ID = "traillens-ai-bedrock-runtime-endpoint-id"
+HAIKU_ARN = "arn:aws:bedrock:ca-central-1::foundation-model/anthropic.claude-haiku-4-5-20251001-v1:0"
+
+
+def _run(network=None, **config):
+    exports = {}
+    mocks = run_program(
+        {"enable_vpc_endpoint": "true", "network": json.dumps(network or NETWORK), **config}, exports=exports
+    )
+    return mocks, exports
+
+
+def _invoke_conditions(mocks):
+    conditions = []
+    for policy in mocks.of_type("aws:iam/policy:Policy"):
+        for statement in json.loads(policy["policy"])["Statement"]:
+            actions = statement["Action"] if isinstance(statement["Action"], list) else [statement["Action"]]
+            if any(action.startswith("bedrock:Invoke") for action in actions):
+                conditions.append(statement.get("Condition"))
+    return conditions
+
+
+def test_endpoint_is_private_dns_interface_in_the_vpc():
+    mocks, exports = _run()
+
+    (endpoint,) = mocks.of_type("aws:ec2/vpcEndpoint:VpcEndpoint")
+    assert endpoint["serviceName"] == "com.amazonaws.ca-central-1.bedrock-runtime"
+    assert endpoint["vpcEndpointType"] == "Interface"
+    assert endpoint["privateDnsEnabled"] is True
+    assert endpoint["subnetIds"] == ["subnet-a", "subnet-b"]
+    assert resolve(exports["bedrock_vpc_endpoint_id"]) == ENDPOINT_ID
+
+    (group,) = mocks.of_type("aws:ec2/securityGroup:SecurityGroup")
+    (rule,) = group["ingress"]
+    assert (rule["fromPort"], rule["toPort"], rule["cidrBlocks"]) == (443, 443, [VPC_CIDR])
+
+
+def test_endpoint_policy_only_allows_catalog_invokes():
+    mocks, _ = _run()
+
+    (endpoint,) = mocks.of_type("aws:ec2/vpcEndpoint:VpcEndpoint")
+    document = json.loads(endpoint["policy"])
+    assert all(statement["Principal"] == "*" for statement in document["Statement"])
+    assert "bedrock:InvokeModelWithResponseStream" in allowed_actions([document], HAIKU_ARN)
+    assert not allowed_actions([document], "arn:aws:bedrock:ca-central-1::foundation-model/mistral.large")
+    assert not allowed_actions([document], "*")
+
+
+def test_iam_is_unconditional_by_default():
+    mocks, _ = _run()
+
+    assert all(condition is None for condition in _invoke_conditions(mocks))
+
+
+def test_require_source_vpce_conditions_iam_invokes_on_the_endpoint():
+    mocks, _ = _run({**NETWORK, "require_source_vpce": True})
+
+    conditions = _invoke_conditions(mocks)
+    assert {"StringEquals": {"aws:SourceVpce": ENDPOINT_ID}} in conditions
+    assert all(condition in (None, {"StringEquals": {"aws:SourceVpce": ENDPOINT_ID}}) for condition in conditions)
+
+
+def test_require_source_vpce_covers_provisioned_resources():
+    mocks, _ = _run(
+        {**NETWORK, "require_source_vpce": True},
+        provisioned_throughput=json.dumps({"haiku": {"model_units": 1}}),
+    )
+
+    policies = {policy["name"]: policy for policy in mocks.of_type("aws:iam/policy:Policy")}
+    (statement,) = json.loads(policies["traillens-ai-bedrock-resource-policy"]["policy"])["Statement"]
+    assert statement["Condition"] == {"StringEquals": {"aws:SourceVpce": ENDPOINT_ID}}
+
+
+def test_requires_network():
+    with pytest.raises(Exception, match="network.private_subnet_ids"):
+        _run({"vpc_id": "vpc-0123456789abcdef0"})
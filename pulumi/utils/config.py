@@ -9,8 +9,28 @@ Configuration utilities for TrailLens AI infrastructure.
 Simplified configuration for production-only deployment.
 """
 
+from utils.models import get_model
+
 import pulumi
 
+# Provisioned Throughput commitment terms; omit for hourly, no-commitment.
+COMMITMENT_DURATIONS = ("OneMonth", "SixMonths")
+
+# Application inference profile routing modes.
+PROFILE_ROUTING = ("in-region", "cross-region", "global")
+
+# Eviction policies accepted by the cache's maxmemory-policy parameter.
+MAXMEMORY_POLICIES = (
+    "allkeys-lru",
+    "allkeys-lfu",
+    "allkeys-random",
+    "volatile-lru",
+    "volatile-lfu",
+    "volatile-random",
+    "volatile-ttl",
+    "noeviction",
+)
+
 
 def load_config():
     """
@@ -26,7 +46,8 @@ def load_config():
     region = config.require("region")
     domain = config.require("domain")
     zone_name = config.require("zone_name")
-    budget_alert_email = config.require("budget_alert_email")
+    # Only required when the budget component is enabled; see validate_config.
+    budget_alert_email = config.get("budget_alert_email")
 
     # Load configuration values
     config_dict = {
@@ -35,6 +56,41 @@ def load_config():
         "domain": domain,
         "zone_name": zone_name,
         "budget_alert_email": budget_alert_email,
+        # Component toggles. Disabled components are never imported, so
+        # previewing a single component skips the others' provider modules.
+        "enable_bedrock": config.get_bool("enable_bedrock", True),
+        "enable_budget": config.get_bool("enable_budget", True),
+        # Opt-in: adds a dashboard and ~24 alarms to the stack.
+        "enable_monitoring": config.get_bool("enable_monitoring", False),
+        # Invocation logging is account-wide for the region, so it is opt-in.
+        "enable_invocation_logging": config.get_bool("enable_invocation_logging", False),
+        # retention_days, curated_retention_days, log_payloads, load_schedule.
+        "invocation_logging": config.get_object("invocation_logging") or {},
+        # Alarm thresholds for components/monitoring.py; defaults apply
+        # to anything not set.
+        "monitoring": config.get_object("monitoring") or {},
+        # Provisioned Throughput per catalog model key, e.g.
+        # {"haiku": {"model_units": 1, "commitment": "OneMonth"}}.
+        # Empty (the default) creates nothing.
+        "provisioned_throughput": config.get_object("provisioned_throughput") or {},
+        # Application inference profile routing per catalog model key:
+        # "in-region", "cross-region" or "global". Empty creates nothing.
+        "inference_profiles": config.get_object("inference_profiles") or {},
+        # Existing VPC for in-VPC components: vpc_id, private_subnet_ids,
+        # public_subnet_ids, require_source_vpce.
+        "network": config.get_object("network") or {},
+        # Interface endpoint for bedrock-runtime in the network VPC.
+        "enable_vpc_endpoint": config.get_bool("enable_vpc_endpoint", False),
+        # LiteLLM proxy on ECS Fargate behind an ALB; see
+        # components/proxy_service.py for the proxy_service settings.
+        "enable_proxy_service": config.get_bool("enable_proxy_service", False),
+        "proxy_service": config.get_object("proxy_service") or {},
+        # Shared ElastiCache (Valkey) response cache in the network VPC;
+        # see components/cache.py for the cache settings.
+        "enable_cache": config.get_bool("enable_cache", False),
+        "cache": config.get_object("cache") or {},
+        # Log -X importtime style detail for each component's imports.
+        "profile_imports": config.get_bool("profile_imports", False),
         "tags": {
             "Project": config.get("tag_project") or "TrailLens",
             "Environment": config.get("tag_environment") or "prod",
@@ -65,8 +121,9 @@ def validate_config(config):
         "region",
         "domain",
         "zone_name",
-        "budget_alert_email",
     ]
+    if config.get("enable_budget", True):
+        required_keys.append("budget_alert_email")
 
     for key in required_keys:
         if key not in config or not config[key]:
@@ -78,4 +135,128 @@ def validate_config(config):
             f"Invalid region: {config['region']}. " "All TrailLens infrastructure must be deployed to ca-central-1"
         )
 
+    validate_provisioned_throughput(config.get("provisioned_throughput") or {})
+    validate_inference_profiles(config.get("inference_profiles") or {})
+    if config.get("enable_vpc_endpoint"):
+        validate_network(config.get("network") or {}, ["vpc_id", "private_subnet_ids"])
+    if config.get("enable_proxy_service"):
+        validate_proxy_service(config)
+    if config.get("enable_cache"):
+        validate_network(config.get("network") or {}, ["vpc_id", "private_subnet_ids"])
+        validate_cache(config.get("cache") or {})
+
     pulumi.log.info("✓ Configuration validation passed")
+
+
+def validate_provisioned_throughput(throughput):
+    """
+    Validate the provisioned_throughput config object.
+
+    Args:
+        throughput: Dict of catalog model key to settings.
+
+    Raises:
+        Exception: If a model is unknown or its settings are invalid.
+    """
+    for key, settings in throughput.items():
+        get_model(key)
+        model_units = settings.get("model_units")
+        if not isinstance(model_units, int) or isinstance(model_units, bool) or model_units < 1:
+            raise Exception(f"Invalid provisioned_throughput.{key}.model_units: {model_units!r}. Must be an integer >= 1")
+        commitment = settings.get("commitment")
+        if commitment is not None and commitment not in COMMITMENT_DURATIONS:
+            raise Exception(
+                f"Invalid provisioned_throughput.{key}.commitment: {commitment}. "
+                f"Must be one of {', '.join(COMMITMENT_DURATIONS)} or omitted"
+            )
+
+
+def validate_inference_profiles(profiles):
+    """
+    Validate the inference_profiles config object.
+
+    Args:
+        profiles: Dict of catalog model key to routing mode.
+
+    Raises:
+        Exception: If a model is unknown or its routing mode is invalid.
+    """
+    for key, routing in profiles.items():
+        get_model(key)
+        if routing not in PROFILE_ROUTING:
+            raise Exception(f"Invalid inference_profiles.{key}: {routing}. Must be one of {', '.join(PROFILE_ROUTING)}")
+
+
+def validate_network(network, required_keys):
+    """
+    Validate the network config object for components that need a VPC.
+
+    Args:
+        network: The network config object.
+        required_keys: Keys the enabled components need.
+
+    Raises:
+        Exception: If a required key is missing.
+    """
+    for key in required_keys:
+        if not network.get(key):
+            raise Exception(f"Missing required configuration: network.{key}")
+
+
+def validate_proxy_service(config):
+    """
+    Validate the settings the LiteLLM proxy service needs.
+
+    Args:
+        config: Configuration dictionary.
+
+    Raises:
+        Exception: If a dependency or setting is missing or invalid.
+    """
+    if not config.get("enable_bedrock", True):
+        raise Exception("enable_proxy_service requires enable_bedrock: the proxy task role uses its policies")
+
+    settings = config.get("proxy_service") or {}
+    required_keys = ["vpc_id", "private_subnet_ids"]
+    if not settings.get("internal"):
+        required_keys.append("public_subnet_ids")
+    validate_network(config.get("network") or {}, required_keys)
+
+    for key in ("workers", "min_tasks", "max_tasks"):
+        value = settings.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise Exception(f"Invalid proxy_service.{key}: {value!r}. Must be an integer >= 1")
+    # Defaults match components/proxy_service.py.
+    if settings.get("min_tasks", 1) > settings.get("max_tasks", 4):
+        raise Exception("Invalid proxy_service: min_tasks must not exceed max_tasks")
+    if settings.get("hooks"):
+        if not settings.get("image"):
+            raise Exception("proxy_service.hooks requires proxy_service.image: the stock image has no /app/hooks")
+        if not config.get("enable_cache"):
+            raise Exception("proxy_service.hooks requires enable_cache: the hooks keep their state in Redis")
+
+    # Without HTTPS, the master key would cross the internet in plain HTTP.
+    open_cidrs = {"0.0.0.0/0", "::/0"} & set(settings.get("allowed_cidrs", ["0.0.0.0/0"]))
+    if not settings.get("internal") and not settings.get("certificate_arn") and open_cidrs:
+        raise Exception(
+            "A public proxy_service needs certificate_arn or allowed_cidrs narrower than "
+            f"{', '.join(sorted(open_cidrs))}: it would otherwise serve plain HTTP to the internet"
+        )
+
+
+def validate_cache(cache):
+    """
+    Validate the cache config object.
+
+    Args:
+        cache: The cache config object.
+
+    Raises:
+        Exception: If a setting is invalid.
+    """
+    nodes = cache.get("nodes", 1)
+    if not isinstance(nodes, int) or isinstance(nodes, bool) or not 1 <= nodes <= 6:
+        raise Exception(f"Invalid cache.nodes: {nodes!r}. Must be an integer from 1 to 6")
+    policy = cache.get("maxmemory_policy")
+    if policy is not None and policy not in MAXMEMORY_POLICIES:
+        raise Exception(f"Invalid cache.maxmemory_policy: {policy}. Must be one of {', '.join(MAXMEMORY_POLICIES)}")
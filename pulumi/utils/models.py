@@ -0,0 +1,170 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Bedrock model catalog for TrailLens AI infrastructure.
+
+Single source of truth for the models the stack grants access to. The IAM
+policy (utils/policy.py), the ``models`` stack export and the per-model
+components are all generated from CATALOG, so adding a model is one entry
+here. The ``litellm_name`` of each entry must match a ``model_name`` in
+server/config/litellm-config.yaml (checked by tests/test_policy.py).
+"""
+
+from dataclasses import dataclass
+
+INVOKE_ACTIONS = ("bedrock:InvokeModel",)
+STREAM_ACTIONS = ("bedrock:InvokeModel", "bedrock:InvokeModelWithResponseStream")
+
+
+@dataclass(frozen=True)
+class BedrockModel:
+    """
+    One Bedrock model the stack grants access to.
+
+    Attributes:
+        key: Short name used in stack exports and config (e.g. "haiku").
+        name: Human-readable model name for logs.
+        model_id: Bedrock foundation model ID.
+        region: Region the model is invoked in; None means the stack region.
+        streaming: Whether InvokeModelWithResponseStream is granted.
+        profile_prefix: System inference profile prefix ("us", "global")
+            used to invoke the model, or None for direct invocation.
+        litellm_name: model_name of the LiteLLM deployment, if any.
+        mode: "chat", "embedding", "image" or "rerank".
+        unscoped_actions: Extra actions that only accept Resource "*".
+    """
+
+    key: str
+    name: str
+    model_id: str
+    region: str = None
+    streaming: bool = True
+    profile_prefix: str = None
+    litellm_name: str = None
+    mode: str = "chat"
+    unscoped_actions: tuple = ()
+
+    @property
+    def actions(self):
+        """IAM actions needed to invoke the model."""
+        return STREAM_ACTIONS if self.streaming else INVOKE_ACTIONS
+
+    @property
+    def invocation_id(self):
+        """Model ID as sent to Bedrock, including any inference profile prefix."""
+        if self.profile_prefix:
+            return f"{self.profile_prefix}.{self.model_id}"
+        return self.model_id
+
+    def foundation_model_arn(self, region):
+        """ARN of the foundation model in its region (or the stack region)."""
+        return f"arn:aws:bedrock:{self.region or region}::foundation-model/{self.model_id}"
+
+
+CATALOG = (
+    BedrockModel(
+        key="opus",
+        name="Claude Opus 4.6",
+        model_id="anthropic.claude-opus-4-6-v1",
+        profile_prefix="us",
+        litellm_name="claude-opus-4-6",
+    ),
+    BedrockModel(
+        key="sonnet",
+        name="Claude Sonnet 4.6",
+        model_id="anthropic.claude-sonnet-4-6",
+        profile_prefix="us",
+        litellm_name="claude-sonnet-4-6",
+    ),
+    BedrockModel(
+        key="sonnet_4_5",
+        name="Claude Sonnet 4.5",
+        model_id="anthropic.claude-sonnet-4-5-20250929-v1:0",
+        litellm_name="claude-sonnet-4-5",
+    ),
+    BedrockModel(
+        key="haiku",
+        name="Claude Haiku 4.5",
+        model_id="anthropic.claude-haiku-4-5-20251001-v1:0",
+        profile_prefix="us",
+        litellm_name="claude-haiku-4-5",
+    ),
+    BedrockModel(
+        key="haiku_3_5",
+        name="Claude Haiku 3.5",
+        model_id="anthropic.claude-3-5-haiku-20241022-v1:0",
+    ),
+    BedrockModel(
+        key="llama3_70b",
+        name="Meta Llama 3 70B Instruct",
+        model_id="meta.llama3-70b-instruct-v1:0",
+        litellm_name="llama3-70b",
+    ),
+    BedrockModel(
+        key="titan_embed",
+        name="Amazon Titan Embed Text V2",
+        model_id="amazon.titan-embed-text-v2:0",
+        streaming=False,
+        litellm_name="titan-embed-v2",
+        mode="embedding",
+    ),
+    BedrockModel(
+        key="titan_image",
+        name="Amazon Titan Image Generator V2",
+        model_id="amazon.titan-image-generator-v2:0",
+        region="us-east-1",
+        streaming=False,
+        litellm_name="titan-image-v2",
+        mode="image",
+    ),
+    BedrockModel(
+        key="cohere_rerank",
+        name="Cohere Rerank V3.5",
+        model_id="cohere.rerank-v3-5:0",
+        streaming=False,
+        litellm_name="cohere-rerank-v3-5",
+        mode="rerank",
+        # The Rerank action requires a wildcard resource.
+        unscoped_actions=("bedrock:Rerank",),
+    ),
+    BedrockModel(
+        key="kimi_k2_5",
+        name="Moonshot Kimi K2.5",
+        model_id="moonshotai.kimi-k2.5",
+        region="us-east-1",
+        litellm_name="kimi-k2-5",
+    ),
+)
+
+# Family wildcards so new Claude versions work before they are added to
+# the catalog. "{region}" is replaced with the stack region.
+WILDCARD_GRANTS = (
+    (STREAM_ACTIONS, "arn:aws:bedrock:{region}::foundation-model/anthropic.claude*"),
+    # Inference profiles route across regions, so allow them (and the
+    # underlying foundation models) everywhere.
+    (STREAM_ACTIONS, "arn:aws:bedrock:*:*:inference-profile/us.anthropic.claude-*"),
+    (STREAM_ACTIONS, "arn:aws:bedrock:*:*:inference-profile/global.anthropic.claude-*"),
+    (STREAM_ACTIONS, "arn:aws:bedrock:*::foundation-model/anthropic.claude-*"),
+)
+
+# Account-level grants that are not tied to a model.
+ACCOUNT_GRANTS = (
+    (("bedrock:ListFoundationModels", "bedrock:GetFoundationModel"), "*"),
+    (("aws-marketplace:ViewSubscriptions", "aws-marketplace:Subscribe"), "*"),
+)
+
+
+def get_model(key):
+    """
+    Look up a catalog entry by key.
+
+    Raises:
+        Exception: If no model has that key.
+    """
+    for model in CATALOG:
+        if model.key == key:
+            return model
+    raise Exception(f"Unknown model: {key}. Known models: {', '.join(model.key for model in CATALOG)}")
@@ -0,0 +1,259 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+IAM policy compiler for the Bedrock model catalog.
+
+Turns catalog entries into the smallest policy documents that grant them:
+
+1. Every (action, resource) grant is collected, and each resource gets the
+   union of the actions granted on it.
+2. Resources already matched by a wildcard with at least the same actions
+   are dropped.
+3. Resources with identical action sets share one statement.
+4. Documents are serialized as compact JSON (IAM ignores whitespace when it
+   checks the size limit, but Pulumi sends what we give it).
+5. When a document exceeds the managed policy limit, statements are packed
+   into several documents, splitting a statement's resources if needed.
+"""
+
+import json
+from fnmatch import fnmatchcase
+
+from utils.models import ACCOUNT_GRANTS, WILDCARD_GRANTS
+
+# aws.iam.Policy (managed) documents are capped at 6144 characters.
+# aws.iam.UserPolicy (inline) would only allow 2048.
+MANAGED_POLICY_MAX_BYTES = 6144
+
+# VPC endpoint policies are capped at 20480 characters.
+ENDPOINT_POLICY_MAX_BYTES = 20480
+
+# Stand-in for a VPC endpoint ID while compiling aws:SourceVpce conditions.
+# Endpoint IDs are "vpce-" plus 17 hex digits, so documents keep their size
+# when the real ID (only known after deployment) is substituted.
+SOURCE_VPCE_PLACEHOLDER = "vpce-00000000000000000"
+
+POLICY_VERSION = "2012-10-17"
+
+
+def model_grants(models, region, wildcards=True, system_profiles=True):
+    """
+    Collect the (actions, resource) grants needed to invoke models.
+
+    Args:
+        models: Iterable of BedrockModel.
+        region: Stack region, used for models without their own region.
+        wildcards: Include WILDCARD_GRANTS and ACCOUNT_GRANTS.
+        system_profiles: Include the wildcard grants on system inference
+            profiles. Disabled when application inference profiles are used.
+
+    Returns:
+        list: (actions tuple, resource ARN) pairs.
+    """
+    grants = []
+    for model in models:
+        grants.append((model.actions, model.foundation_model_arn(region)))
+        if model.profile_prefix:
+            # Cross-region profiles invoke the model in any region they route to.
+            grants.append((model.actions, f"arn:aws:bedrock:*:*:inference-profile/{model.invocation_id}"))
+            grants.append((model.actions, f"arn:aws:bedrock:*::foundation-model/{model.model_id}"))
+        if model.unscoped_actions:
+            grants.append((model.unscoped_actions, "*"))
+
+    if wildcards:
+        grants.extend(
+            (actions, resource.format(region=region))
+            for actions, resource in WILDCARD_GRANTS
+            if system_profiles or ":inference-profile/" not in resource
+        )
+        grants.extend(ACCOUNT_GRANTS)
+    return grants
+
+
+def _arn_region(resource):
+    """Region field of an ARN ("*" for any region), or None for "*" itself."""
+    parts = resource.split(":")
+    return parts[3] if resource.startswith("arn:") and len(parts) > 3 else None
+
+
+def build_statements(grants, condition=None, region=None):
+    """
+    Merge grants into the fewest statements.
+
+    Args:
+        grants: (actions, resource) pairs.
+        condition: Optional IAM Condition block added to every statement
+            that grants a bedrock:Invoke* action.
+        region: Stack region. When given, the condition only applies to
+            resources in this region (or any region). Models pinned to
+            another region are invoked through that region's public
+            endpoint, so an aws:SourceVpce condition would deny them.
+
+    Returns:
+        list: IAM statement dicts, in a stable order.
+    """
+    actions_by_resource = {}
+    for actions, resource in grants:
+        actions_by_resource.setdefault(resource, set()).update(actions)
+
+    # Drop resources covered by a wildcard granting at least the same actions.
+    patterns = [(resource, actions) for resource, actions in actions_by_resource.items() if "*" in resource]
+    kept = {
+        resource: actions
+        for resource, actions in actions_by_resource.items()
+        if not any(
+            pattern != resource and fnmatchcase(resource, pattern) and pattern_actions >= actions
+            for pattern, pattern_actions in patterns
+        )
+    }
+
+    resources_by_key = {}
+    for resource, actions in kept.items():
+        conditioned = bool(condition) and any(action.startswith("bedrock:Invoke") for action in actions)
+        if conditioned and region is not None:
+            conditioned = _arn_region(resource) in (None, "*", region)
+        resources_by_key.setdefault((tuple(sorted(actions)), conditioned), []).append(resource)
+
+    statements = []
+    for (actions, conditioned), resources in sorted(resources_by_key.items()):
+        statement = {
+            "Effect": "Allow",
+            "Action": list(actions) if len(actions) > 1 else actions[0],
+            "Resource": sorted(resources) if len(resources) > 1 else resources[0],
+        }
+        if conditioned:
+            statement["Condition"] = condition
+        statements.append(statement)
+    return statements
+
+
+def _document(statements):
+    return {"Version": POLICY_VERSION, "Statement": statements}
+
+
+def _size(value):
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def _split_statement(statement, max_bytes):
+    """Split a statement's resources so each part fits in its own document."""
+    resources = statement["Resource"] if isinstance(statement["Resource"], list) else [statement["Resource"]]
+    parts, current = [], []
+    for resource in resources:
+        candidate = {**statement, "Resource": current + [resource]}
+        if current and _size(_document([candidate])) > max_bytes:
+            parts.append({**statement, "Resource": current})
+            current = []
+        current.append(resource)
+    parts.append({**statement, "Resource": current})
+
+    for part in parts:
+        if _size(_document([part])) > max_bytes:
+            raise Exception(f"Policy statement for {part['Resource'][0]} exceeds {max_bytes} bytes on its own")
+    return parts
+
+
+def shard_statements(statements, max_bytes=MANAGED_POLICY_MAX_BYTES):
+    """
+    Pack statements into as few documents as fit under max_bytes.
+
+    Uses first-fit decreasing on the compact JSON size of each statement.
+
+    Returns:
+        list: Policy document dicts.
+    """
+    pieces = []
+    for statement in statements:
+        if _size(_document([statement])) > max_bytes:
+            pieces.extend(_split_statement(statement, max_bytes))
+        else:
+            pieces.append(statement)
+
+    documents = []
+    for piece in sorted(pieces, key=_size, reverse=True):
+        for document in documents:
+            if _size(_document(document + [piece])) <= max_bytes:
+                document.append(piece)
+                break
+        else:
+            documents.append([piece])
+    return [_document(document) for document in documents]
+
+
+def compile_policy_documents(
+    models, region, extra_grants=(), condition=None, max_bytes=MANAGED_POLICY_MAX_BYTES, system_profiles=True
+):
+    """
+    Compile catalog models into compact IAM policy documents.
+
+    Args:
+        models: Iterable of BedrockModel.
+        region: Stack region.
+        extra_grants: Additional (actions, resource) pairs.
+        condition: Optional Condition block for bedrock:Invoke* statements
+            on stack-region resources.
+        max_bytes: Size limit per document.
+        system_profiles: Include the system inference profile wildcards.
+
+    Returns:
+        list: Policy documents as compact JSON strings, each within max_bytes.
+    """
+    grants = model_grants(models, region, system_profiles=system_profiles) + list(extra_grants)
+    documents = shard_statements(build_statements(grants, condition, region), max_bytes)
+    return [json.dumps(document, separators=(",", ":")) for document in documents]
+
+
+def compile_grants_document(grants, condition=None, region=None, max_bytes=MANAGED_POLICY_MAX_BYTES):
+    """
+    Compile grants on resources created by other components into one document.
+
+    Used inside an Output.apply once the resource ARNs are known, where the
+    number of policies can no longer change, so the grants must fit in a
+    single document.
+
+    Args:
+        grants: (actions, resource ARN) pairs.
+        condition: Optional Condition block for bedrock:Invoke* statements.
+        region: Stack region; the condition only applies to resources in it.
+        max_bytes: Size limit for the document.
+
+    Returns:
+        str: Compact JSON policy document.
+
+    Raises:
+        Exception: If the grants do not fit in one document.
+    """
+    documents = shard_statements(build_statements(grants, condition, region), max_bytes)
+    if len(documents) > 1:
+        raise Exception(f"Resource grants need {len(documents)} policies; at most one ({max_bytes} bytes) is supported")
+    return json.dumps(documents[0], separators=(",", ":"))
+
+
+def compile_endpoint_policy(grants, max_bytes=ENDPOINT_POLICY_MAX_BYTES):
+    """
+    Compile grants into a VPC endpoint policy.
+
+    Only bedrock:Invoke* grants are kept: the endpoint serves
+    bedrock-runtime, and anything not allowed here is denied through it.
+
+    Args:
+        grants: (actions, resource ARN) pairs.
+        max_bytes: Size limit for the document.
+
+    Returns:
+        str: Compact JSON endpoint policy document.
+    """
+    invoke_grants = []
+    for actions, resource in grants:
+        invoke_actions = tuple(action for action in actions if action.startswith("bedrock:Invoke"))
+        if invoke_actions:
+            invoke_grants.append((invoke_actions, resource))
+
+    statements = [{**statement, "Principal": "*"} for statement in build_statements(invoke_grants)]
+    document = json.dumps(_document(statements), separators=(",", ":"))
+    if len(document) > max_bytes:
+        raise Exception(f"Endpoint policy is {len(document)} bytes; the limit is {max_bytes}")
+    return document
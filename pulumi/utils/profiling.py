@@ -0,0 +1,112 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Import-time profiling for TrailLens AI infrastructure.
+
+Components are imported lazily so a disabled component never loads its
+provider modules. profile_imports() measures those deferred imports and logs
+them in the same format as ``python -X importtime``:
+
+    import time: self [us] | cumulative | imported package
+"""
+
+import contextlib
+import sys
+import time
+
+import pulumi
+
+
+class _TimedLoader:
+    """Loader wrapper that times exec_module() for one module."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.leave(module.__name__)
+
+
+class ImportProfiler:
+    """Meta path finder that records self and cumulative import times.
+
+    While installed, every module found by the remaining finders is loaded
+    through _TimedLoader. Time spent importing nested modules counts towards
+    the parent's cumulative time but not its self time, as with -X importtime.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        started, nested = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        self.records.append((name, cumulative - nested, cumulative, len(self._stack)))
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    def lines(self):
+        """Return the profile as -X importtime style lines, in import order."""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for name, self_s, cumulative_s, depth in self.records:
+            lines.append(f"import time: {self_s * 1e6:9.0f} | {cumulative_s * 1e6:10.0f} | {'  ' * depth}{name}")
+        return lines
+
+
+@contextlib.contextmanager
+def profile_imports(label, enabled=False):
+    """Log an import-time profile of the imports made inside the block.
+
+    Wrap both the deferred import and the component call: pulumi_aws loads
+    its service submodules (iam, sns, ...) on first attribute access.
+
+    Args:
+        label: Name shown in the log (usually the component module).
+        enabled: When False the block runs unprofiled.
+
+    Yields:
+        ImportProfiler or None.
+    """
+    if not enabled:
+        yield None
+        return
+
+    profiler = ImportProfiler()
+    sys.meta_path.insert(0, profiler)
+    try:
+        yield profiler
+    finally:
+        sys.meta_path.remove(profiler)
+        total_ms = sum(cumulative for _, _, cumulative, depth in profiler.records if depth == 0) * 1000
+        pulumi.log.info(f"{label}: imported {len(profiler.records)} modules in {total_ms:.1f} ms")
+        for line in profiler.lines():
+            pulumi.log.info(line)
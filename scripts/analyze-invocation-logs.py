@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Invocation Log Analyzer for TrailLens AI
+
+Streams gzipped (or plain) JSON-lines request logs and reports, per model:
+- Request and error counts
+- Latency p50/p90/p99 and time-to-first-token p50/p99 (streamed requests)
+- Output tokens per second
+- Cache-hit ratio
+- Cost per 1k tokens
+
+Two log formats are recognised record by record, so they can be mixed:
+- Bedrock model invocation logs, as written to S3 by
+  pulumi/components/invocation_logging.py (aws s3 sync the prefix locally)
+- LiteLLM spend rows exported from the litellm-db Postgres, camelCase column
+  names or snake_case:
+
+      podman exec litellm-db psql -U llmproxy -d litellm -At \\
+        -c 'SELECT row_to_json(s) FROM "LiteLLM_SpendLogs" s' | gzip > spend.jsonl.gz
+
+Memory stays constant regardless of input size. Files are read one line at a
+time, and percentiles come from a mergeable log-bucket sketch (DDSketch)
+with 1% relative error whose size depends only on the value range. Each file
+is a shard: shards are summarised in parallel worker processes and the
+sketches merged exactly.
+
+Usage:
+    python scripts/analyze-invocation-logs.py PATH [PATH ...] [--jobs N] [--json]
+
+Options:
+    PATH        Log files or directories (*.json, *.jsonl, *.gz, searched recursively)
+    --jobs N    Worker processes (default: one per CPU)
+    --json      Print the report as JSON instead of a table
+    --accuracy  Relative accuracy of the latency percentiles (default: 0.01)
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import sys
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+
+LOG_SUFFIXES = (".json", ".jsonl", ".gz")
+DEFAULT_ACCURACY = 0.01
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class LogSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch).
+
+    Positive values are counted in logarithmic buckets
+    [gamma^(i-1), gamma^i) with gamma = (1 + a) / (1 - a), so every quantile
+    estimate is within a relative error a of the true value. Memory grows
+    with log(max / min), not with the number of values, and two sketches
+    with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket in relative terms.
+                estimate = 2 * self.gamma**index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+class ModelStats:
+    """Running totals for one model; constant size apart from the sketches."""
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self.costed_tokens = 0
+        # Output tokens and seconds of the requests with both a latency and
+        # a token count, for tokens/sec.
+        self.timed_output_tokens = 0
+        self.timed_seconds = 0.0
+        self.latency = LogSketch(accuracy)
+        self.ttft = LogSketch(accuracy)
+
+    def add(self, record):
+        self.requests += 1
+        self.errors += record["error"]
+        self.cache_hits += record["cache_hit"]
+        self.input_tokens += record["input_tokens"]
+        self.output_tokens += record["output_tokens"]
+        if record["cost"] is not None:
+            self.cost += record["cost"]
+            self.costed_tokens += record["input_tokens"] + record["output_tokens"]
+        if record["latency_ms"] is not None:
+            self.latency.add(record["latency_ms"])
+            if record["output_tokens"] and record["latency_ms"] > 0:
+                self.timed_output_tokens += record["output_tokens"]
+                self.timed_seconds += record["latency_ms"] / 1000
+        if record["ttft_ms"] is not None:
+            self.ttft.add(record["ttft_ms"])
+
+    def merge(self, other):
+        for name in (
+            "requests",
+            "errors",
+            "cache_hits",
+            "input_tokens",
+            "output_tokens",
+            "cost",
+            "costed_tokens",
+            "timed_output_tokens",
+            "timed_seconds",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.latency.merge(other.latency)
+        self.ttft.merge(other.ttft)
+
+    def summary(self):
+        def rounded(value, digits=1):
+            return None if value is None else round(value, digits)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {f"p{int(q * 100)}": rounded(self.latency.quantile(q)) for q in PERCENTILES},
+            "ttft_ms": {f"p{int(q * 100)}": rounded(self.ttft.quantile(q)) for q in (0.5, 0.99)},
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "output_tokens_per_second": rounded(
+                self.timed_output_tokens / self.timed_seconds if self.timed_seconds else None
+            ),
+            "cache_hit_ratio": rounded(self.cache_hits / self.requests if self.requests else None, 4),
+            "cost_usd": round(self.cost, 6),
+            "cost_per_1k_tokens": rounded(self.cost * 1000 / self.costed_tokens if self.costed_tokens else None, 6),
+        }
+
+
+# =============================================================================
+# Record parsing
+# =============================================================================
+
+
+def _get(record, *names):
+    """Return the first present, non-null field among camelCase/snake_case names."""
+    for name in names:
+        value = record.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace(" ", "T", 1))
+    except ValueError:
+        return None
+
+
+def _elapsed_ms(start, end):
+    start, end = _timestamp(start), _timestamp(end)
+    if start is None or end is None:
+        return None
+    try:
+        return (end - start).total_seconds() * 1000
+    except TypeError:
+        # One timestamp has a timezone and the other does not.
+        return (end.replace(tzinfo=None) - start.replace(tzinfo=None)).total_seconds() * 1000
+
+
+def _truthy(value):
+    return str(value).lower() in ("true", "1", "t", "yes")
+
+
+def parse_bedrock_record(record):
+    """Normalise a Bedrock model invocation log record."""
+    request = record.get("input") or {}
+    response = record.get("output") or {}
+    body = response.get("outputBodyJson")
+    body = body if isinstance(body, dict) else {}
+    usage = body.get("usage") or {}
+    metrics = body.get("metrics") or {}
+
+    return {
+        "model": record.get("modelId", "unknown"),
+        "error": bool(record.get("errorCode")),
+        "input_tokens": int(request.get("inputTokenCount") or 0),
+        "output_tokens": int(response.get("outputTokenCount") or 0),
+        # Converse responses report latency; InvokeModel bodies do not.
+        "latency_ms": metrics.get("latencyMs"),
+        "ttft_ms": None,
+        # Prompt caching: any input tokens read from the cache.
+        "cache_hit": bool(usage.get("cacheReadInputTokens")),
+        "cost": None,
+    }
+
+
+def parse_spend_record(record):
+    """Normalise a LiteLLM_SpendLogs row (camelCase or snake_case columns)."""
+    start = _get(record, "startTime", "start_time")
+    end = _get(record, "endTime", "end_time")
+    first_token = _get(record, "completionStartTime", "completion_start_time")
+    status = _get(record, "status")
+    stream = _get(record, "stream")
+    # LiteLLM sets completionStartTime to endTime when nothing was streamed,
+    # which would report total latency as time to first token.
+    streamed = (stream is None or _truthy(stream)) and _timestamp(first_token) != _timestamp(end)
+
+    return {
+        "model": _get(record, "model", "model_group") or "unknown",
+        "error": status is not None and status != "success",
+        "input_tokens": int(_get(record, "promptTokens", "prompt_tokens") or 0),
+        "output_tokens": int(_get(record, "completionTokens", "completion_tokens") or 0),
+        "latency_ms": _elapsed_ms(start, end),
+        "ttft_ms": _elapsed_ms(start, first_token) if streamed else None,
+        "cache_hit": _truthy(_get(record, "cache_hit", "cacheHit")),
+        "cost": _get(record, "spend", "totalCost", "total_cost"),
+    }
+
+
+def parse_record(record):
+    """Normalise a record of either format, or return None if unrecognised."""
+    if not isinstance(record, dict):
+        return None
+    if record.get("schemaType") == "ModelInvocationLog" or "modelId" in record:
+        return parse_bedrock_record(record)
+    if _get(record, "startTime", "start_time", "request_id", "model") is not None:
+        return parse_spend_record(record)
+    return None
+
+
+# =============================================================================
+# Shards
+# =============================================================================
+
+
+def open_log(path):
+    """Open a log file for line-by-line text reading, gunzipping by magic bytes."""
+    with open(path, "rb") as handle:
+        gzipped = handle.read(2) == b"\x1f\x8b"
+    if gzipped:
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "rt", encoding="utf-8", errors="replace")
+
+
+def analyze_shard(task):
+    """
+    Summarise one log file.
+
+    Args:
+        task: (path, accuracy) tuple, so it can be sent to a worker process.
+
+    Returns:
+        tuple: (stats by model, lines read, lines skipped).
+    """
+    path, accuracy = task
+    stats = {}
+    lines = skipped = 0
+    with open_log(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            lines += 1
+            try:
+                record = parse_record(json.loads(line))
+            except (ValueError, TypeError):
+                record = None
+            if record is None:
+                skipped += 1
+                continue
+            model = record["model"]
+            if model not in stats:
+                stats[model] = ModelStats(accuracy)
+            stats[model].add(record)
+    return stats, lines, skipped
+
+
+def find_log_files(paths):
+    """Expand files and directories into log files, sorted for stable output."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*") if p.is_file() and p.name.endswith(LOG_SUFFIXES))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+    return sorted(files)
+
+
+def analyze(files, jobs=None, accuracy=DEFAULT_ACCURACY):
+    """
+    Summarise log files in parallel and merge the per-shard statistics.
+
+    Returns:
+        tuple: (merged stats by model, lines read, lines skipped).
+    """
+    tasks = [(str(path), accuracy) for path in files]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+
+    merged = {}
+    lines = skipped = 0
+
+    def collect(results):
+        nonlocal lines, skipped
+        for stats, shard_lines, shard_skipped in results:
+            lines += shard_lines
+            skipped += shard_skipped
+            for model, model_stats in stats.items():
+                if model in merged:
+                    merged[model].merge(model_stats)
+                else:
+                    merged[model] = model_stats
+
+    if jobs == 1:
+        collect(map(analyze_shard, tasks))
+    else:
+        with Pool(jobs) as pool:
+            # Shards finish in any order; merging is order-independent.
+            collect(pool.imap_unordered(analyze_shard, tasks))
+    return merged, lines, skipped
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+
+def build_report(merged, files, lines, skipped):
+    return {
+        "files": len(files),
+        "lines": lines,
+        "skipped": skipped,
+        "models": {model: merged[model].summary() for model in sorted(merged)},
+    }
+
+
+def _cell(value, fmt="{:,.0f}"):
+    return "-" if value is None else fmt.format(value)
+
+
+def print_table(report):
+    header = (
+        f"{'Model':<48} {'Requests':>9} {'Errors':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+        f"{'TTFT p50':>9} {'Tok/s':>7} {'Cache':>6} {'$/1k tok':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for model, summary in report["models"].items():
+        latency = summary["latency_ms"]
+        cache = summary["cache_hit_ratio"]
+        print(
+            f"{model[:48]:<48} {summary['requests']:>9,} {summary['errors']:>7,} "
+            f"{_cell(latency['p50']):>8} {_cell(latency['p90']):>8} {_cell(latency['p99']):>8} "
+            f"{_cell(summary['ttft_ms']['p50']):>9} {_cell(summary['output_tokens_per_second'], '{:,.1f}'):>7} "
+            f"{_cell(None if cache is None else cache * 100, '{:.1f}%'):>6} "
+            f"{_cell(summary['cost_per_1k_tokens'], '{:.4f}'):>9}"
+        )
+    print()
+    print(f"{report['lines']:,} records from {report['files']} file(s), {report['skipped']:,} skipped")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summarise Bedrock invocation and LiteLLM spend logs per model.")
+    parser.add_argument("paths", nargs="+", help="Log files or directories")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "--accuracy",
+        type=float,
+        default=DEFAULT_ACCURACY,
+        help=f"Relative accuracy of percentiles (default: {DEFAULT_ACCURACY})",
+    )
+    args = parser.parse_args()
+    if not 0 < args.accuracy < 1:
+        parser.error("--accuracy must be between 0 and 1")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    try:
+        files = find_log_files(args.paths)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not files:
+        print("Error: no log files found", file=sys.stderr)
+        return 1
+
+    merged, lines, skipped = analyze(files, args.jobs, args.accuracy)
+    report = build_report(merged, files, lines, skipped)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+LiteLLM Proxy Benchmark for TrailLens AI
+
+Drives load against the LiteLLM proxy and reports, per load stage:
+- Request throughput, error rate and throttle (HTTP 429) rate
+- End-to-end latency p50/p95/p99
+- Time-to-first-token and inter-token latency p50/p95/p99, parsed from the
+  server-sent event stream of /v1/chat/completions
+- Output tokens per second per request
+
+Load comes from one pooled async HTTP client in one of two modes:
+- Closed loop (--concurrency 1,4,16): N workers each send the next request
+  as soon as the previous one finishes.
+- Open loop (--rate 1,5,10): requests arrive as a Poisson process at R per
+  second whether or not earlier ones have finished. Latency is measured from
+  the scheduled arrival time, so a saturated proxy shows up as queueing delay
+  instead of quietly lowering the request rate.
+
+Each comma-separated value is one stage, run for --duration seconds or
+--requests requests. The JSON report (--output) can be passed back with
+--compare on a later run to print p50/p95/p99 changes per stage.
+
+--fake starts a built-in OpenAI-compatible responder on localhost with
+configurable TTFT, inter-token latency and throttle rate, so the benchmark
+itself can be exercised without the proxy or Bedrock.
+
+Usage:
+    python scripts/benchmark-proxy.py [--endpoint chat|embeddings|rerank] [--concurrency 1,4,16 | --rate 2,5]
+                                      [--duration 30 | --requests 200] [--output report.json]
+                                      [--compare baseline.json] [--fake]
+
+Requires httpx (pip install -r scripts/requirements.txt).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+DEFAULT_URL = "http://localhost:8001"
+DEFAULT_API_KEY = "sk-test-1234567890"
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Endpoint path and default model (litellm-config.yaml model_name) by kind.
+ENDPOINTS = {
+    "chat": ("/v1/chat/completions", "claude-haiku-4-5"),
+    "embeddings": ("/v1/embeddings", "titan-embed-v2"),
+    "rerank": ("/rerank", "cohere-rerank-v3-5"),
+}
+
+PROMPT = "Write a Python function that checks whether a trail segment GPX track is closed."
+DOCUMENTS = [
+    "Trail closures are posted by the land manager at the trailhead.",
+    "Segments are closed loops when the first and last points coincide.",
+    "GPX tracks store points as latitude, longitude and elevation.",
+]
+
+
+# =============================================================================
+# Requests
+# =============================================================================
+
+
+def build_payload(endpoint, model, max_tokens, stream):
+    if endpoint == "chat":
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": PROMPT}],
+            "max_tokens": max_tokens,
+            "stream": stream,
+        }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+    if endpoint == "embeddings":
+        return {"model": model, "input": PROMPT}
+    return {"model": model, "query": PROMPT, "documents": DOCUMENTS, "top_n": len(DOCUMENTS)}
+
+
+class Sample:
+    """Timings for one request. Times are seconds from the scheduled start."""
+
+    __slots__ = ("status", "latency", "ttft", "itl", "output_tokens", "error")
+
+    def __init__(self):
+        self.status = None
+        self.latency = None
+        self.ttft = None
+        self.itl = []
+        self.output_tokens = 0
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 200
+
+    @property
+    def tokens_per_second(self):
+        if not self.ok or not self.output_tokens:
+            return None
+        if self.ttft is None:
+            return self.output_tokens / self.latency
+        # Streamed: decode rate after the first token, which excludes
+        # queueing and prompt processing.
+        if self.output_tokens < 2 or self.latency <= self.ttft:
+            return None
+        return (self.output_tokens - 1) / (self.latency - self.ttft)
+
+
+async def read_stream(response, sample, started):
+    """Parse an SSE chat completion stream, timing each content chunk."""
+    last = None
+    chunks = 0
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        event = json.loads(data)
+        usage = event.get("usage")
+        if usage:
+            sample.output_tokens = usage.get("completion_tokens") or 0
+        choices = event.get("choices") or []
+        if not choices or not (choices[0].get("delta") or {}).get("content"):
+            continue
+        now = time.perf_counter()
+        if last is None:
+            sample.ttft = now - started
+        else:
+            sample.itl.append(now - last)
+        last = now
+        chunks += 1
+    # Without a usage chunk, count content chunks as tokens.
+    sample.output_tokens = sample.output_tokens or chunks
+
+
+async def send(client, path, payload, started):
+    """Send one request and return its Sample. Never raises."""
+    sample = Sample()
+    try:
+        async with client.stream("POST", path, json=payload) as response:
+            sample.status = response.status_code
+            if response.status_code != 200:
+                await response.aread()
+                sample.error = f"HTTP {response.status_code}"
+            elif payload.get("stream"):
+                await read_stream(response, sample, started)
+            else:
+                # No first-token time without a stream; ttft stays None.
+                body = json.loads(await response.aread())
+                sample.output_tokens = (body.get("usage") or {}).get("completion_tokens") or 0
+    except (httpx.HTTPError, json.JSONDecodeError) as e:
+        sample.error = type(e).__name__
+    sample.latency = time.perf_counter() - started
+    return sample
+
+
+# =============================================================================
+# Load profiles
+# =============================================================================
+
+
+async def run_closed_loop(client, path, payload, concurrency, duration, requests):
+    samples = []
+    deadline = time.perf_counter() + duration if duration else None
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            samples.append(await send(client, path, payload, time.perf_counter()))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def run_open_loop(client, path, payload, rate, duration, requests):
+    start = time.perf_counter()
+    tasks = []
+    scheduled = start
+    while True:
+        scheduled += random.expovariate(rate)
+        if duration and scheduled - start >= duration:
+            break
+        if requests is not None and len(tasks) >= requests:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(client, path, payload, scheduled)))
+    return await asyncio.gather(*tasks)
+
+
+# =============================================================================
+# Statistics
+# =============================================================================
+
+
+def percentiles(values, scale=1000.0):
+    """p50/p95/p99 by linear interpolation, scaled (seconds to ms by default)."""
+    if not values:
+        return {f"p{round(q * 100)}": None for q in PERCENTILES}
+    ordered = sorted(values)
+    result = {}
+    for q in PERCENTILES:
+        rank = q * (len(ordered) - 1)
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        value = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+        result[f"p{round(q * 100)}"] = round(value * scale, 1)
+    return result
+
+
+def summarise(samples, elapsed):
+    ok = [sample for sample in samples if sample.ok]
+    throttled = sum(1 for sample in samples if sample.status == 429)
+    errors = len(samples) - len(ok) - throttled
+    total = len(samples) or 1
+    return {
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+        "error_rate": round(errors / total, 4),
+        "throttle_rate": round(throttled / total, 4),
+        "latency_ms": percentiles([sample.latency for sample in ok]),
+        "ttft_ms": percentiles([sample.ttft for sample in ok if sample.ttft is not None]),
+        "itl_ms": percentiles([gap for sample in ok for gap in sample.itl]),
+        "tokens_per_second": percentiles(
+            [rate for rate in (sample.tokens_per_second for sample in ok) if rate is not None], scale=1.0
+        ),
+        "output_tokens": sum(sample.output_tokens for sample in ok),
+        "error_types": sorted({sample.error for sample in samples if sample.error}),
+    }
+
+
+# =============================================================================
+# Fake responder
+# =============================================================================
+
+
+class FakeResponder:
+    """
+    Minimal OpenAI-compatible HTTP/1.1 server standing in for proxy + Bedrock.
+
+    Chat completions wait ttft, then emit one SSE chunk per token every itl
+    seconds (each +/- jitter). A throttle_rate fraction of requests get 429.
+    """
+
+    def __init__(self, ttft, itl, tokens, throttle_rate, jitter):
+        self.ttft = ttft
+        self.itl = itl
+        self.tokens = tokens
+        self.throttle_rate = throttle_rate
+        self.jitter = jitter
+        self.embedding = [round(random.uniform(-1, 1), 6) for _ in range(1024)]
+        self.server = None
+
+    def _delay(self, seconds):
+        return asyncio.sleep(seconds * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return f"http://{host}:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                _, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._respond(writer, path, json.loads(body) if body else {})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_json(writer, status, payload):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+
+    @staticmethod
+    def _write_chunk(writer, data):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _respond(self, writer, path, request):
+        if path == "/health/liveliness":
+            self._write_json(writer, 200, {"status": "healthy"})
+        elif random.random() < self.throttle_rate:
+            await self._delay(self.ttft / 4)
+            self._write_json(writer, 429, {"error": {"message": "ThrottlingException", "code": "429"}})
+        elif path == "/v1/chat/completions":
+            await self._chat(writer, request)
+        elif path == "/v1/embeddings":
+            await self._delay(self.ttft)
+            self._write_json(
+                writer,
+                200,
+                {
+                    "object": "list",
+                    "data": [{"object": "embedding", "index": 0, "embedding": self.embedding}],
+                    "usage": {"prompt_tokens": 16, "total_tokens": 16},
+                },
+            )
+        elif path in ("/rerank", "/v1/rerank"):
+            await self._delay(self.ttft)
+            documents = request.get("documents") or []
+            self._write_json(
+                writer,
+                200,
+                {"results": [{"index": index, "relevance_score": 1 / (index + 1)} for index in range(len(documents))]},
+            )
+        else:
+            self._write_json(writer, 404, {"error": {"message": f"No route for {path}"}})
+        await writer.drain()
+
+    async def _chat(self, writer, request):
+        tokens = min(self.tokens, request.get("max_tokens") or self.tokens)
+        usage = {"prompt_tokens": 24, "completion_tokens": tokens, "total_tokens": 24 + tokens}
+        await self._delay(self.ttft)
+        if not request.get("stream"):
+            await self._delay(self.itl * (tokens - 1))
+            self._write_json(
+                writer,
+                200,
+                {
+                    "object": "chat.completion",
+                    "model": request.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": "tok " * tokens}}],
+                    "usage": usage,
+                },
+            )
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        for index in range(tokens):
+            if index:
+                await self._delay(self.itl)
+            chunk = {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": "tok "}}]}
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n".encode())
+            await writer.drain()
+        self._write_chunk(writer, f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode())
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+
+def _cell(value, fmt="{:,.0f}"):
+    return "-" if value is None else fmt.format(value)
+
+
+def print_table(report):
+    header = (
+        f"{'Stage':<16} {'Reqs':>6} {'RPS':>7} {'Err %':>6} {'429 %':>6} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'TTFT p50':>9} {'TTFT p99':>9} {'ITL p50':>8} {'ITL p99':>8} {'Tok/s':>7}"
+    )
+    print(f"{report['endpoint']} {report['model']} @ {report['url']}")
+    print(header)
+    print("-" * len(header))
+    for stage in report["stages"]:
+        latency, ttft, itl = stage["latency_ms"], stage["ttft_ms"], stage["itl_ms"]
+        print(
+            f"{stage['name']:<16} {stage['requests']:>6,} {_cell(stage['throughput_rps'], '{:,.1f}'):>7} "
+            f"{stage['error_rate'] * 100:>6.1f} {stage['throttle_rate'] * 100:>6.1f} "
+            f"{_cell(latency['p50']):>8} {_cell(latency['p95']):>8} {_cell(latency['p99']):>8} "
+            f"{_cell(ttft['p50']):>9} {_cell(ttft['p99']):>9} {_cell(itl['p50'], '{:,.1f}'):>8} "
+            f"{_cell(itl['p99'], '{:,.1f}'):>8} {_cell(stage['tokens_per_second']['p50'], '{:,.1f}'):>7}"
+        )
+
+
+def print_comparison(report, baseline):
+    """Print p50/p95/p99 changes against a baseline report, stage by stage."""
+    previous = {stage["name"]: stage for stage in baseline.get("stages", [])}
+    print()
+    print(f"Compared with {baseline.get('started', 'baseline')} (negative is faster):")
+    for stage in report["stages"]:
+        before = previous.get(stage["name"])
+        if before is None:
+            print(f"  {stage['name']:<16} no matching baseline stage")
+            continue
+        changes = []
+        for metric in ("latency_ms", "ttft_ms", "itl_ms"):
+            for key in ("p50", "p95", "p99"):
+                old, new = before[metric].get(key), stage[metric].get(key)
+                if old and new is not None:
+                    changes.append(f"{metric[:-3]} {key} {(new - old) / old * 100:+.1f}%")
+        print(f"  {stage['name']:<16} {', '.join(changes) or 'no comparable metrics'}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+
+async def run(args):
+    fake = None
+    url = args.url
+    if args.fake:
+        fake = FakeResponder(
+            args.fake_ttft_ms / 1000, args.fake_itl_ms / 1000, args.fake_tokens, args.fake_throttle_rate, 0.2
+        )
+        url = await fake.start()
+
+    path, default_model = ENDPOINTS[args.endpoint]
+    model = args.model or default_model
+    payload = build_payload(args.endpoint, model, args.max_tokens, not args.no_stream)
+    mode, levels = ("rate", args.rate) if args.rate else ("concurrency", args.concurrency)
+    pool_size = max(levels) if mode == "concurrency" else args.max_connections
+
+    report = {
+        "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": url,
+        "endpoint": args.endpoint,
+        "model": model,
+        "stream": payload.get("stream", False),
+        "mode": mode,
+        "fake": args.fake,
+        "stages": [],
+    }
+
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    timeout = httpx.Timeout(args.timeout, connect=10.0)
+    headers = {"Authorization": f"Bearer {args.api_key}"}
+    try:
+        async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=timeout) as client:
+            for level in levels:
+                name = f"{mode}={level:g}"
+                print(f"Running {name}...", file=sys.stderr)
+                runner = run_open_loop if mode == "rate" else run_closed_loop
+                started = time.perf_counter()
+                samples = await runner(client, path, payload, level, args.duration, args.requests)
+                report["stages"].append({"name": name, mode: level, **summarise(samples, time.perf_counter() - started)})
+    finally:
+        if fake:
+            await fake.stop()
+    return report
+
+
+def _levels(value):
+    try:
+        levels = [float(level) for level in value.split(",") if level]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got {value!r}")
+    if not levels or min(levels) <= 0:
+        raise argparse.ArgumentTypeError("levels must be positive")
+    return levels
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the LiteLLM proxy under concurrent load.")
+    parser.add_argument("--url", default=os.environ.get("LITELLM_URL", DEFAULT_URL), help="Proxy base URL")
+    parser.add_argument("--api-key", default=os.environ.get("LITELLM_API_KEY", DEFAULT_API_KEY), help="Proxy API key")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="chat", help="Endpoint to load")
+    parser.add_argument("--model", help="Model name (default depends on --endpoint)")
+    profile = parser.add_mutually_exclusive_group()
+    profile.add_argument("--concurrency", type=_levels, default=[1.0, 4.0, 16.0], help="Closed-loop workers per stage")
+    profile.add_argument("--rate", type=_levels, help="Open-loop requests per second per stage")
+    length = parser.add_mutually_exclusive_group()
+    length.add_argument("--duration", type=float, default=30.0, help="Seconds per stage (default: 30)")
+    length.add_argument("--requests", type=int, help="Requests per stage instead of --duration")
+    parser.add_argument("--max-tokens", type=int, default=256, help="max_tokens for chat requests")
+    parser.add_argument("--no-stream", action="store_true", help="Send non-streaming chat requests")
+    parser.add_argument("--max-connections", type=int, default=64, help="Connection pool size for --rate")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    fake = parser.add_argument_group("fake responder")
+    fake.add_argument("--fake", action="store_true", help="Benchmark a built-in fake responder instead of --url")
+    fake.add_argument("--fake-ttft-ms", type=float, default=400.0, help="Fake time to first token")
+    fake.add_argument("--fake-itl-ms", type=float, default=15.0, help="Fake inter-token latency")
+    fake.add_argument("--fake-tokens", type=int, default=128, help="Fake completion length")
+    fake.add_argument("--fake-throttle-rate", type=float, default=0.0, help="Fraction of fake 429 responses")
+    args = parser.parse_args()
+    if args.requests is not None:
+        args.duration = None
+        if args.requests < 1:
+            parser.error("--requests must be at least 1")
+    if args.concurrency and not args.rate:
+        args.concurrency = [int(level) for level in args.concurrency]
+    if not 0 <= args.fake_throttle_rate < 1:
+        parser.error("--fake-throttle-rate must be between 0 and 1")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: cannot read baseline {args.compare}: {e}", file=sys.stderr)
+            return 1
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    if baseline:
+        print_comparison(report, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
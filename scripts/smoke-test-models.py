@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Bedrock Model Smoke Test for TrailLens AI
+
+Post-deploy check that every model behind the LiteLLM proxy answers:
+- LiteLLM health (aborts if the proxy is down) and the model list
+- One chat probe per text model, plus the image, embedding and rerank models
+- PostgreSQL cost tracking in litellm-db, with per-model spend for this run
+
+All probes are sent at once over one keep-alive connection pool, so the run
+takes about as long as the slowest model rather than the sum of all of them.
+Each response body is parsed once. Spend comes from one psql query that
+returns recent rows, per-model cost since the run started and the last-hour
+total as a single JSON document.
+
+Usage:
+    python scripts/smoke-test-models.py [--url URL] [--api-key KEY] [--no-cost] [--spend-wait S]
+
+Requires httpx (pip install -r scripts/requirements.txt).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+DEFAULT_URL = "http://localhost:8001"
+DEFAULT_API_KEY = "sk-test-1234567890"
+POSTGRES_CONTAINER = "litellm-db"
+POSTGRES_USER = "llmproxy"
+POSTGRES_DB = "litellm"
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+BLUE = "\033[0;34m"
+NC = "\033[0m"
+
+# (kind, model_name, input) in the order results are reported.
+PROBES = [
+    ("chat", "claude-haiku-4-5", "Say hello"),
+    ("chat", "claude-sonnet-4-6", "Name one color"),
+    ("chat", "claude-opus-4-6", "What is 2+2?"),
+    ("chat", "kimi-k2-5", "What is the weather like?"),
+    ("image", "titan-image-v2", "A red ball on a green field"),
+    ("embedding", "titan-embed-v2", "The quick brown fox jumps over the lazy dog"),
+    ("rerank", "cohere-rerank-v3-5", "What is the capital of France?"),
+]
+
+RERANK_DOCUMENTS = [
+    "Paris is the capital of France and its largest city.",
+    "London is the capital of England and the United Kingdom.",
+    "Berlin is the capital and largest city of Germany.",
+]
+
+STATUS_HINTS = {
+    401: "Unauthorized (check LITELLM_API_KEY)",
+    403: "Forbidden (check Bedrock IAM permissions)",
+    429: "Too Many Requests (Bedrock throttling)",
+}
+
+# One round trip for the whole cost report. :since is bound by psql -v.
+SPEND_QUERY = """
+SELECT json_build_object(
+  'recent', (
+    SELECT coalesce(json_agg(r), '[]'::json) FROM (
+      SELECT model, "startTime", "endTime", "spend", "prompt_tokens", "completion_tokens"
+      FROM "LiteLLM_SpendLogs" ORDER BY "startTime" DESC LIMIT 10
+    ) r
+  ),
+  'run', (
+    SELECT coalesce(json_object_agg(model, spend), '{}'::json) FROM (
+      SELECT model, sum("spend") AS spend FROM "LiteLLM_SpendLogs"
+      WHERE "startTime" >= to_timestamp(:since) GROUP BY model
+    ) s
+  ),
+  'hour_total', (
+    SELECT coalesce(sum("spend"), 0) FROM "LiteLLM_SpendLogs"
+    WHERE "startTime" > now() - interval '1 hour'
+  )
+);
+"""
+
+
+class Result:
+    """Outcome of one probe: a list of (passed, message) checks plus details."""
+
+    def __init__(self, title):
+        self.title = title
+        self.checks = []
+        self.details = []
+        self.body = None
+        self.elapsed = 0.0
+
+    def check(self, passed, message):
+        self.checks.append((passed, message))
+        return passed
+
+    @property
+    def passed(self):
+        return bool(self.checks) and all(passed for passed, _ in self.checks)
+
+
+# =============================================================================
+# Probes
+# =============================================================================
+
+
+def build_request(kind, model, text):
+    if kind == "chat":
+        return "/v1/chat/completions", {"model": model, "messages": [{"role": "user", "content": text}], "max_tokens": 50}
+    if kind == "embedding":
+        return "/v1/embeddings", {"model": model, "input": text}
+    if kind == "rerank":
+        return "/v1/rerank", {"model": model, "query": text, "documents": RERANK_DOCUMENTS, "top_n": 3}
+    return "/v1/images/generations", {"model": model, "prompt": text, "n": 1, "size": "512x512"}
+
+
+def validate(kind, model, body, result):
+    """Check the response structure and record the details worth printing."""
+    if not isinstance(body, dict):
+        result.check(False, "Response structure: not a JSON object")
+        return
+    if kind == "chat":
+        if not result.check(all(body.get(key) for key in ("model", "choices", "usage")), "Response structure"):
+            return
+        usage = body["usage"]
+        content = (body["choices"][0].get("message") or {}).get("content") or ""
+        result.details.append(f"Response: {content[:100]}...")
+        result.details.append(
+            f"Tokens: Input={usage.get('prompt_tokens')}, Output={usage.get('completion_tokens')}, "
+            f"Total={usage.get('total_tokens')}"
+        )
+    elif kind == "embedding":
+        if not result.check(bool(body.get("data") and body.get("usage")), "Response structure"):
+            return
+        result.details.append(f"Embedding dimensions: {len(body['data'][0].get('embedding') or [])}")
+        result.details.append(f"Tokens: {body['usage'].get('total_tokens')}")
+    elif kind == "rerank":
+        if not result.check(bool(body.get("results")), "Response structure"):
+            return
+        top = body["results"][0]
+        result.details.append(f"Results returned: {len(body['results'])}")
+        result.details.append(f"Top result: Document {top.get('index')} (score: {top.get('relevance_score')})")
+    else:
+        if not result.check(bool(body.get("data")), "Response structure"):
+            return
+        image = body["data"][0]
+        result.details.append(f"Images generated: {len(body['data'])}")
+        result.details.append(
+            "Image format: base64 encoded" if image.get("b64_json") else f"Image URL: {str(image.get('url'))[:50]}..."
+        )
+    result.check(True, f"Model {model}")
+
+
+async def probe(client, kind, model, text):
+    result = Result(f"{'Testing Model' if kind == 'chat' else f'Testing {kind.title()} Model'}: {model}")
+    path, payload = build_request(kind, model, text)
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, json=payload)
+    except httpx.HTTPError as e:
+        result.check(False, f"Connection failed ({type(e).__name__})")
+        return result
+    finally:
+        result.elapsed = time.perf_counter() - started
+
+    try:
+        result.body = response.json()
+    except ValueError:
+        result.body = response.text
+    if not result.check(
+        response.status_code == 200,
+        f"HTTP Status: {response.status_code} {STATUS_HINTS.get(response.status_code, response.reason_phrase)}",
+    ):
+        return result
+    validate(kind, model, result.body, result)
+    return result
+
+
+async def check_health(client):
+    result = Result("Testing LiteLLM Health")
+    try:
+        response = await client.get("/health/liveliness")
+    except httpx.HTTPError as e:
+        result.check(False, f"LiteLLM health check: Connection failed ({type(e).__name__})")
+        return result
+    result.check(response.status_code == 200, f"LiteLLM health check (HTTP {response.status_code})")
+    return result
+
+
+async def list_models(client):
+    result = Result("Listing Available Models")
+    try:
+        response = await client.get("/v1/models")
+        models = [model["id"] for model in response.json().get("data", [])] if response.status_code == 200 else None
+    except (httpx.HTTPError, ValueError) as e:
+        result.check(False, f"Models endpoint: {type(e).__name__}")
+        return result
+    if result.check(models is not None, f"Models endpoint (HTTP {response.status_code})"):
+        result.details.extend(f"  - {model}" for model in models)
+    return result
+
+
+async def run_probes(url, api_key, timeout):
+    limits = httpx.Limits(max_connections=len(PROBES) + 1, max_keepalive_connections=len(PROBES) + 1)
+    headers = {"Authorization": f"Bearer {api_key}"}
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=timeout) as client:
+        health = await check_health(client)
+        if not health.passed:
+            return health, None, []
+        models, *results = await asyncio.gather(
+            list_models(client), *(probe(client, kind, model, text) for kind, model, text in PROBES)
+        )
+    return health, models, results
+
+
+# =============================================================================
+# Cost tracking
+# =============================================================================
+
+
+def query_spend(since):
+    """Run SPEND_QUERY in the litellm-db container. Returns the parsed JSON."""
+    completed = subprocess.run(
+        [
+            "podman",
+            "exec",
+            "-i",
+            POSTGRES_CONTAINER,
+            "psql",
+            "-U",
+            POSTGRES_USER,
+            "-d",
+            POSTGRES_DB,
+            "-At",
+            "-v",
+            "ON_ERROR_STOP=1",
+            "-v",
+            f"since={since}",
+        ],
+        input=SPEND_QUERY,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+
+def print_header(title):
+    print()
+    print(f"{BLUE}[TEST]{NC} {title}")
+    print("-" * 40)
+
+
+def print_result(result):
+    print_header(f"{result.title} ({result.elapsed:.2f}s)" if result.elapsed else result.title)
+    for passed, message in result.checks:
+        print(f"{GREEN}✓{NC} {message}" if passed else f"{RED}✗{NC} {message}")
+    if not result.passed and result.body is not None:
+        print(json.dumps(result.body, indent=2) if isinstance(result.body, (dict, list)) else result.body)
+    for detail in result.details:
+        print(detail)
+
+
+def print_spend(spend):
+    print_header("Verifying PostgreSQL Cost Tracking")
+    print("Recent cost tracking logs:")
+    for row in spend["recent"]:
+        print(
+            f"  {row['model'] or '-':<40} {row['startTime']:<28} ${row['spend'] or 0:.6f} "
+            f"{row['prompt_tokens'] or 0:>6} in {row['completion_tokens'] or 0:>6} out"
+        )
+    if spend["run"]:
+        print()
+        print("Cost of this run:")
+        for model, cost in sorted(spend["run"].items()):
+            print(f"  {model:<40} ${cost:.6f}")
+    print()
+    print(f"{GREEN}✓{NC} PostgreSQL cost tracking: Operational")
+    print(f"{BLUE}Total cost (last hour):{NC} ${spend['hour_total']:.6f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Smoke test every Bedrock model behind the LiteLLM proxy.")
+    parser.add_argument("--url", default=os.environ.get("LITELLM_URL", DEFAULT_URL), help="Proxy base URL")
+    parser.add_argument("--api-key", default=os.environ.get("LITELLM_API_KEY", DEFAULT_API_KEY), help="Proxy API key")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--no-cost", action="store_true", help="Skip the PostgreSQL cost tracking check")
+    parser.add_argument(
+        "--spend-wait",
+        type=float,
+        default=0.0,
+        help="Seconds to wait for LiteLLM to flush spend logs before querying",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(f"{BLUE}========================================{NC}")
+    print(f"{BLUE}Bedrock Model Testing Suite{NC}")
+    print(f"{BLUE}========================================{NC}")
+
+    since = time.time()
+    started = time.perf_counter()
+    health, models, results = asyncio.run(run_probes(args.url, args.api_key, args.timeout))
+    wall = time.perf_counter() - started
+
+    print_result(health)
+    if not health.passed:
+        print()
+        print(f"{RED}CRITICAL: LiteLLM is not responding at {args.url}. Cannot continue tests.{NC}")
+        print(f"{YELLOW}Please ensure LiteLLM is running: ./manage.sh status{NC}")
+        return 1
+    print_result(models)
+    if not models.passed:
+        print(f"{YELLOW}Warning: Could not list models, but continuing tests...{NC}")
+    for result in results:
+        print_result(result)
+
+    if not args.no_cost:
+        time.sleep(args.spend_wait)
+        try:
+            print_spend(query_spend(since))
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            print_header("Verifying PostgreSQL Cost Tracking")
+            print(f"{RED}✗{NC} Failed to query PostgreSQL cost logs ({type(e).__name__})")
+            print(f"{YELLOW}Warning: Cost tracking check failed{NC}")
+
+    checks = [passed for result in [health, models, *results] for passed, _ in result.checks]
+    passed, failed = checks.count(True), checks.count(False)
+    print()
+    print(f"{BLUE}========================================{NC}")
+    print(f"{BLUE}Test Summary{NC}")
+    print(f"{BLUE}========================================{NC}")
+    print()
+    print(f"Tests Passed:  {GREEN}{passed}{NC}")
+    print(f"Tests Failed:  {RED}{failed}{NC}")
+    print(f"Wall time:     {wall:.2f}s (sequential would be ~{sum(result.elapsed for result in results):.2f}s)")
+    print()
+    if failed:
+        print(f"{RED}Some tests failed.{NC}")
+        return 1
+    print(f"{GREEN}All tests passed!{NC}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for the invocation log analyzer (analyze-invocation-logs.py).
+"""
+
+import gzip
+import importlib.util
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# The script's file name is not importable; register it under a module name
+# so worker processes can unpickle analyze_shard.
+_spec = importlib.util.spec_from_file_location(
+    "analyze_invocation_logs", Path(__file__).resolve().parents[1] / "analyze-invocation-logs.py"
+)
+analyzer = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = analyzer
+_spec.loader.exec_module(analyzer)
+
+MODEL = "claude-haiku-4-5"
+START = datetime(2026, 10, 1, 12, 0, 0)
+
+
+def _spend_row(index, latency_ms, ttft_ms=None, stream=True):
+    """A LiteLLM_SpendLogs row; non-streamed rows have completionStartTime = endTime."""
+    start = START + timedelta(seconds=index)
+    end = start + timedelta(milliseconds=latency_ms)
+    first_token = start + timedelta(milliseconds=ttft_ms) if stream else end
+    return {
+        "request_id": f"req-{index}",
+        "model": MODEL,
+        "startTime": start.isoformat(),
+        "endTime": end.isoformat(),
+        "completionStartTime": first_token.isoformat(),
+        "stream": stream,
+        "promptTokens": 100,
+        "completionTokens": 50,
+        "spend": 0.0001,
+        "status": "success",
+    }
+
+
+def _write(path, rows):
+    with gzip.open(path, "wt") as handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+    return path
+
+
+@pytest.fixture
+def mixed_rows():
+    """Streamed rows with 50-149 ms TTFT, and non-streamed rows of about 400 ms."""
+    streamed = [_spend_row(index, 1000 + index, ttft_ms=50 + index) for index in range(100)]
+    full = [_spend_row(100 + index, 400 + index, stream=False) for index in range(100)]
+    return streamed + full
+
+
+def test_non_streamed_rows_have_no_ttft(mixed_rows):
+    streamed = analyzer.parse_spend_record(mixed_rows[0])
+    full = analyzer.parse_spend_record(mixed_rows[-1])
+
+    assert streamed["ttft_ms"] == 50.0
+    assert full["ttft_ms"] is None
+    assert full["latency_ms"] == 499.0
+
+
+def test_ttft_equal_to_end_time_is_ignored_without_a_stream_column(mixed_rows):
+    row = {key: value for key, value in mixed_rows[-1].items() if key != "stream"}
+
+    assert analyzer.parse_spend_record(row)["ttft_ms"] is None
+
+
+def test_ttft_percentiles_come_from_streamed_rows_only(tmp_path, mixed_rows):
+    files = [_write(tmp_path / "spend.jsonl.gz", mixed_rows)]
+
+    merged, lines, skipped = analyzer.analyze(files, jobs=1)
+    summary = merged[MODEL].summary()
+
+    assert (lines, skipped, summary["requests"]) == (200, 0, 200)
+    assert summary["ttft_ms"]["p50"] == pytest.approx(99.5, rel=0.02)
+    assert summary["latency_ms"]["p50"] == pytest.approx(700, rel=0.5)
+
+
+def test_shards_merge_to_the_single_file_result(tmp_path, mixed_rows):
+    whole = [_write(tmp_path / "all.jsonl.gz", mixed_rows)]
+    shards = [_write(tmp_path / f"shard-{index}.jsonl.gz", mixed_rows[index::3]) for index in range(3)]
+
+    merged_whole, _, _ = analyzer.analyze(whole, jobs=1)
+    merged_shards, lines, _ = analyzer.analyze(shards, jobs=3)
+
+    assert lines == len(mixed_rows)
+    assert merged_shards[MODEL].latency.buckets == merged_whole[MODEL].latency.buckets
+    assert merged_shards[MODEL].summary() == merged_whole[MODEL].summary()
+
+
+def test_sketch_quantiles_are_within_the_relative_accuracy():
+    values = [float(value) for value in range(1, 10001)]
+    sketch = analyzer.LogSketch(0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in analyzer.PERCENTILES:
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_sketches_with_different_accuracy_do_not_merge():
+    with pytest.raises(ValueError):
+        analyzer.LogSketch(0.01).merge(analyzer.LogSketch(0.02))
@@ -14,16 +14,45 @@ Validates all Python code for:
 - Code formatting standards
 
 Usage:
-    python scripts/validate-python.py [--fix]
+    python scripts/validate-python.py [--fix] [--jobs N] [--no-cache] [--engine ENGINE]
+                                      [--changed [BASE]] [--watch]
+                                      [--report {text,json}] [--history FILE]
 
 Options:
-    --fix    Automatically fix formatting issues with black and isort
+    --fix             Automatically fix formatting issues with black and isort
+    --changed [BASE]  Only check files git reports as staged, modified or
+                      untracked, plus files changed since BASE when given
+    --watch           Keep running and re-validate files as they are saved
+    --report json     Print per-check wall/CPU times, file counts and cache
+                      hits as JSON on stdout (progress moves to stderr)
+    --history FILE    Append each run's timings to FILE (JSON lines) and warn
+                      when a check is much slower than its recent median
+    --jobs N          Number of checks to run at the same time (default: all)
+    --no-cache        Check every file, ignoring results cached in .validate-cache/
+    --engine ENGINE   auto (default), inprocess or subprocess; inprocess calls
+                      the black/isort/flake8 APIs instead of starting
+                      ``python -m <tool>`` for every check
 """
 
+import argparse
 import ast
+import ctypes
+import ctypes.util
+import hashlib
+import importlib.metadata
+import importlib.util
+import io
+import json
 import os
+import select
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -53,22 +82,132 @@ def print_warning(msg):
     print(f"{Colors.YELLOW}⚠{Colors.NC} {msg}")
 
 
+class _OutputRouter:
+    """Stand-in for sys.stdout that buffers output per worker thread.
+
+    Checks report through print(), so while they run in parallel each
+    worker thread gets its own buffer and the runner replays the buffers
+    in a fixed order. Threads without a buffer write straight through.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self.stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def run(self, func, *args):
+        """Call func(*args) with its output captured; return (result, output)."""
+        self._local.buffer = io.StringIO()
+        try:
+            return func(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+
+_current = threading.local()
+
+
+def current_stats():
+    """Return the stats dict of the check running on this thread.
+
+    Outside a check this is a throwaway dict, so callers never need to
+    test for it.
+    """
+    stats = getattr(_current, "stats", None)
+    return stats if stats is not None else {}
+
+
+def count_stat(name, value):
+    """Add value to a counter in the current check's stats."""
+    stats = current_stats()
+    stats[name] = stats.get(name, 0) + value
+
+
+def timed_check(name, func, args):
+    """Run one check and measure it.
+
+    CPU time covers this thread plus any tool subprocesses the check
+    started (see run_tool()), so it is comparable between engines.
+
+    Returns:
+        Stats dict with name, passed, wall_s, cpu_s and any counters the
+        check recorded (files, cached, file_times).
+    """
+    stats = {"name": name}
+    _current.stats = stats
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        stats["passed"] = func(*args)
+    finally:
+        _current.stats = None
+    stats["wall_s"] = time.perf_counter() - wall_start
+    stats["cpu_s"] = time.thread_time() - cpu_start + stats.pop("child_cpu_s", 0.0)
+    return stats
+
+
+def run_checks(checks, jobs=1):
+    """Run validation checks, in parallel when jobs > 1.
+
+    Args:
+        checks: List of (name, func, args) tuples. Each func returns a bool.
+        jobs: Maximum number of checks to run at the same time.
+
+    Returns:
+        List of stats dicts (see timed_check()) in the same order as checks.
+    """
+    if jobs <= 1 or len(checks) <= 1:
+        return [timed_check(name, func, args) for name, func, args in checks]
+
+    router = _OutputRouter(sys.stdout)
+    sys.stdout = router
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(router.run, timed_check, *check) for check in checks]
+            results = []
+            # Print each check's buffered output in list order as soon as it
+            # (and every check before it) has finished.
+            for future in futures:
+                stats, output = future.result()
+                router.stream.write(output)
+                router.stream.flush()
+                results.append(stats)
+    finally:
+        sys.stdout = router.stream
+
+    return results
+
+
+def tool_version(tool):
+    """Return the installed version of a tool, or None if it is missing."""
+    try:
+        return importlib.metadata.version(tool)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
 def check_tools():
     """Check if required tools are installed."""
     print_header("Checking Required Tools")
 
-    tools = {
-        "black": ["python", "-m", "black", "--version"],
-        "flake8": ["python", "-m", "flake8", "--version"],
-        "isort": ["python", "-m", "isort", "--version"],
-    }
-
+    # Read versions from package metadata rather than starting an
+    # interpreter per tool just to run --version.
     missing = []
-    for tool, cmd in tools.items():
-        try:
-            subprocess.run(cmd, capture_output=True, check=True)
-            print_success(f"{tool} is installed")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+    for tool in ("black", "flake8", "isort"):
+        version = tool_version(tool)
+        if version:
+            print_success(f"{tool} {version} is installed")
+        else:
             print_error(f"{tool} is not installed")
             missing.append(tool)
 
@@ -80,20 +219,285 @@ def check_tools():
     return True
 
 
-def check_syntax(python_files):
+class ResultCache:
+    """On-disk record of files that already passed a check.
+
+    Every check has its own key, built from the tool name, version and
+    flags, so upgrading a tool or changing a flag starts a fresh record.
+    Within a key a file is identified by the hash of its path and content.
+    Only passing files are recorded; files with problems are always
+    checked again. Entries unused for CACHE_MAX_AGE are evicted on save.
+    """
+
+    def __init__(self, cache_dir, enabled=True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self._sources = {}
+        self._digests = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._now = int(time.time())
+
+    @staticmethod
+    def key(*parts):
+        """Build a cache key from a tool name, version and flags."""
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+    def read(self, path):
+        """Return a file's content as bytes, reading it from disk once."""
+        if path not in self._sources:
+            self._sources[path] = Path(path).read_bytes()
+        return self._sources[path]
+
+    def digest(self, path):
+        """Return the hash of a file's path and content."""
+        if path not in self._digests:
+            self._digests[path] = hashlib.sha256(str(path).encode() + b"\0" + self.read(path)).hexdigest()
+        return self._digests[path]
+
+    def _load(self, key):
+        with self._lock:
+            if key not in self._entries:
+                entries = {}
+                if self.enabled:
+                    try:
+                        entries = json.loads((self.cache_dir / f"{key}.json").read_text())
+                    except (OSError, ValueError):
+                        pass
+                self._entries[key] = entries
+            return self._entries[key]
+
+    def pending(self, key, python_files):
+        """Return the files without a cached pass for key."""
+        entries = self._load(key)
+        todo = []
+        for path in python_files:
+            digest = self.digest(path)
+            if digest in entries:
+                entries[digest] = self._now
+            else:
+                todo.append(path)
+        return todo
+
+    def record(self, key, python_files, output="", returncode=0):
+        """
+        Record files as passing, except those named in the tool output.
+
+        A failure (returncode 1) only counts against the files it names. Any
+        other non-zero exit, or a failure that names none of the files
+        (the tool crashed or is not installed), records nothing.
+        """
+        named = [path for path in python_files if str(path) in output]
+        if returncode != 0 and (returncode != 1 or not named):
+            return
+        entries = self._load(key)
+        for path in python_files:
+            if path in named:
+                # The file failed or was rewritten by --fix; read and hash
+                # it again if a later check asks for it.
+                self._sources.pop(path, None)
+                self._digests.pop(path, None)
+            else:
+                entries[self.digest(path)] = self._now
+
+    def forget(self, paths):
+        """Drop in-memory contents of files changed on disk."""
+        for path in paths:
+            self._sources.pop(path, None)
+            self._digests.pop(path, None)
+
+    def save(self):
+        """Write touched keys to disk and evict old entries."""
+        if not self.enabled:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = self._now - CACHE_MAX_AGE
+        for key, entries in self._entries.items():
+            fresh = {digest: used for digest, used in entries.items() if used >= cutoff}
+            (self.cache_dir / f"{key}.json").write_text(json.dumps(fresh))
+
+        # Drop keys left behind by old tool versions or flags.
+        for path in self.cache_dir.glob("*.json"):
+            if path.stem not in self._entries and path.stat().st_mtime < cutoff:
+                path.unlink()
+
+
+def resolve_engine(engine):
+    """Pick the tool engine; "auto" prefers in-process when the tools import."""
+    if engine != "auto":
+        return engine
+    if all(importlib.util.find_spec(tool) for tool in ("black", "isort", "flake8")):
+        return "inprocess"
+    return "subprocess"
+
+
+def run_tool(tool, args, python_files, cache, engine, fix=False):
+    """Run black, isort or flake8 over python_files.
+
+    The subprocess engine starts ``python -m <tool>``. The in-process engine
+    calls the tool's Python API on the contents already read into the cache
+    and returns the same exit code and output as the command would.
+
+    Returns:
+        subprocess.CompletedProcess with returncode, stdout and stderr.
+    """
+    if engine == "subprocess":
+        cmd = [sys.executable, "-m", tool, *args, *map(str, python_files)]
+        return _run_measured(cmd)
+
+    if tool == "black":
+        return _black_in_process(python_files, cache, fix)
+    if tool == "isort":
+        return _isort_in_process(python_files, cache, fix)
+    return _flake8_in_process(args, python_files)
+
+
+def _run_measured(cmd):
+    """Run cmd like subprocess.run(capture_output=True, text=True).
+
+    Where os.wait4() exists the child's CPU time is added to the current
+    check's stats. Output goes to temporary files so the child can be
+    reaped with wait4() without risking a full pipe.
+    """
+    if not hasattr(os, "wait4"):
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as err:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=err, text=True)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        count_stat("child_cpu_s", usage.ru_utime + usage.ru_stime)
+        out.seek(0)
+        err.seek(0)
+        return subprocess.CompletedProcess(cmd, proc.returncode, out.read(), err.read())
+
+
+def _decode_source(data):
+    """Decode file bytes the way black does; return (text, encoding, newline)."""
+    buffer = io.BytesIO(data)
+    encoding, lines = tokenize.detect_encoding(buffer.readline)
+    if not lines:
+        return "", encoding, "\n"
+
+    newline = "\r\n" if lines[0][-2:] == b"\r\n" else "\n"
+    buffer.seek(0)
+    with io.TextIOWrapper(buffer, encoding) as text:
+        return text.read(), encoding, newline
+
+
+def _black_in_process(python_files, cache, fix):
+    import black
+
+    mode = black.Mode(line_length=LINE_LENGTH)
+    returncode, stdout, stderr = 0, [], []
+    for path in python_files:
+        src, encoding, newline = _decode_source(cache.read(path))
+        try:
+            dst = black.format_file_contents(src, fast=False, mode=mode)
+        except black.NothingChanged:
+            continue
+        except Exception as e:
+            stderr.append(f"error: cannot format {path}: {e}")
+            returncode = 123
+            continue
+
+        if fix:
+            with open(path, "w", encoding=encoding, newline=newline) as f:
+                f.write(dst)
+            stderr.append(f"reformatted {path}")
+        else:
+            stdout.append(black.diff(src, dst, str(path), str(path)))
+            stderr.append(f"would reformat {path}")
+            returncode = returncode or 1
+
+    return subprocess.CompletedProcess(["black"], returncode, "".join(stdout), "\n".join(stderr))
+
+
+def _isort_in_process(python_files, cache, fix):
+    import isort
+    from isort.format import show_unified_diff
+
+    config = isort.Config(profile="black")
+    returncode, stdout, stderr = 0, [], []
+    for path in python_files:
+        abs_path = Path(path).resolve()
+        src = cache.read(path).decode()
+        dst = isort.code(src, config=config, file_path=abs_path)
+        if dst == src:
+            continue
+
+        if fix:
+            with open(path, "w", newline="") as f:
+                f.write(dst)
+            stdout.append(f"Fixing {abs_path}\n")
+        else:
+            diff = io.StringIO()
+            show_unified_diff(file_input=src, file_output=dst, file_path=abs_path, output=diff)
+            stdout.append(diff.getvalue())
+            stderr.append(f"ERROR: {abs_path} Imports are incorrectly sorted and/or formatted.")
+            returncode = 1
+
+    return subprocess.CompletedProcess(["isort"], returncode, "".join(stdout), "\n".join(stderr))
+
+
+def _flake8_in_process(args, python_files):
+    from flake8.main.application import Application
+
+    # flake8 writes results to sys.stdout.buffer, so send them to a file
+    # instead; jobs=1 keeps it from forking worker processes.
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / "flake8.txt"
+        app = Application()
+        app.run(
+            [
+                *map(str, python_files),
+                *args,
+                "--jobs=1",
+                "--color=never",
+                f"--output-file={output_file}",
+            ]
+        )
+        stdout = output_file.read_text() if output_file.exists() else ""
+
+    return subprocess.CompletedProcess(["flake8"], app.exit_code(), stdout, "")
+
+
+def print_cached(python_files, todo):
+    """Report files whose result was replayed from the cache."""
+    cached = len(python_files) - len(todo)
+    count_stat("files", len(python_files))
+    count_stat("cached", cached)
+    if cached:
+        print_success(f"{cached} unchanged file(s) passed previously (cached)")
+
+
+def check_syntax(python_files, cache):
     """Check Python files for syntax errors using AST parser."""
     print_header("Checking Syntax (AST Compilation)")
 
+    key = cache.key("ast", sys.version)
+    todo = cache.pending(key, python_files)
+    count_stat("files", len(python_files))
+    count_stat("cached", len(python_files) - len(todo))
+    file_times = current_stats().setdefault("file_times", {})
+
     errors = []
     for filepath in python_files:
+        if filepath not in todo:
+            print_success(f"{filepath} (cached)")
+            continue
+        started = time.perf_counter()
         try:
-            with open(filepath, "r") as f:
-                ast.parse(f.read(), filename=str(filepath))
+            ast.parse(cache.read(filepath), filename=str(filepath))
             print_success(f"{filepath}")
         except SyntaxError as e:
             error_msg = f"{filepath}:{e.lineno}:{e.offset}: {e.msg}"
             errors.append(error_msg)
             print_error(error_msg)
+        file_times[str(filepath)] = time.perf_counter() - started
+
+    cache.record(key, todo, "\n".join(errors), 1 if errors else 0)
 
     if errors:
         print_error(f"\n{len(errors)} syntax error(s) found")
@@ -103,24 +507,21 @@ def check_syntax(python_files):
     return True
 
 
-def check_formatting(python_dirs, fix=False):
+def check_formatting(python_files, cache, engine, fix=False):
     """Check Python code formatting with black."""
     print_header("Checking Code Formatting (black)")
 
-    cmd = [
-        "python",
-        "-m",
-        "black",
-        "--line-length",
-        "125",
-        f"--exclude=({'|'.join(EXCLUDE_DIRS)})",
-    ]
-    if not fix:
-        cmd.extend(["--check", "--diff"])
+    args = [*BLACK_ARGS] if fix else [*BLACK_ARGS, "--check", "--diff"]
+    key = cache.key("black", tool_version("black"), *args)
+    todo = cache.pending(key, python_files)
+    print_cached(python_files, todo)
 
-    cmd.extend(python_dirs)
+    if not todo:
+        print_success("All files are properly formatted")
+        return True
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = run_tool("black", args, todo, cache, engine, fix)
+    cache.record(key, todo, result.stdout + result.stderr, result.returncode)
 
     if result.returncode == 0:
         if fix:
@@ -139,31 +540,21 @@ def check_formatting(python_dirs, fix=False):
         return False
 
 
-def check_imports(python_dirs, fix=False):
+def check_imports(python_files, cache, engine, fix=False):
     """Check and organize imports with isort."""
     print_header("Checking Import Organization (isort)")
 
-    cmd = ["python", "-m", "isort"]
-    if not fix:
-        cmd.extend(["--check-only", "--diff"])
-
-    cmd.extend(
-        [
-            "--profile",
-            "black",
-            "--skip",
-            ".venv",
-            "--skip",
-            "venv",
-            "--skip",
-            ".env",
-            "--skip",
-            "env",
-        ]
-    )
-    cmd.extend(python_dirs)
+    args = [*ISORT_ARGS] if fix else ["--check-only", "--diff", *ISORT_ARGS]
+    key = cache.key("isort", tool_version("isort"), *args)
+    todo = cache.pending(key, python_files)
+    print_cached(python_files, todo)
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    if not todo:
+        print_success("All imports are properly organized")
+        return True
+
+    result = run_tool("isort", args, todo, cache, engine, fix)
+    cache.record(key, todo, result.stdout + result.stderr, result.returncode)
 
     if result.returncode == 0:
         print_success("All imports are properly organized")
@@ -178,22 +569,20 @@ def check_imports(python_dirs, fix=False):
         return False
 
 
-def check_linting(python_dirs):
+def check_linting(python_files, cache, engine):
     """Check code quality with flake8."""
     print_header("Checking Code Quality (flake8)")
 
-    cmd = [
-        "python",
-        "-m",
-        "flake8",
-        *python_dirs,
-        "--max-line-length=125",
-        "--extend-ignore=E203,W503",
-        "--show-source",
-        f"--exclude={EXCLUDE_DIRS_STR}",
-    ]
+    key = cache.key("flake8", tool_version("flake8"), *FLAKE8_LINT_ARGS)
+    todo = cache.pending(key, python_files)
+    print_cached(python_files, todo)
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    if not todo:
+        print_success("No linting issues found")
+        return True
+
+    result = run_tool("flake8", FLAKE8_LINT_ARGS, todo, cache, engine)
+    cache.record(key, todo, result.stdout + result.stderr, result.returncode)
 
     if result.returncode == 0:
         print_success("No linting issues found")
@@ -204,21 +593,20 @@ def check_linting(python_dirs):
         return False
 
 
-def check_undefined_names(python_dirs):
+def check_undefined_names(python_files, cache, engine):
     """Check for undefined names and critical errors."""
     print_header("Checking for Undefined Names (flake8 critical)")
 
-    cmd = [
-        "python",
-        "-m",
-        "flake8",
-        *python_dirs,
-        "--select=E999,F821,F822,F823",
-        "--show-source",
-        f"--exclude={EXCLUDE_DIRS_STR}",
-    ]
+    key = cache.key("flake8", tool_version("flake8"), *FLAKE8_CRITICAL_ARGS)
+    todo = cache.pending(key, python_files)
+    print_cached(python_files, todo)
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    if not todo:
+        print_success("No undefined names or critical errors")
+        return True
+
+    result = run_tool("flake8", FLAKE8_CRITICAL_ARGS, todo, cache, engine)
+    cache.record(key, todo, result.stdout + result.stderr, result.returncode)
 
     if result.returncode == 0:
         print_success("No undefined names or critical errors")
@@ -244,8 +632,44 @@ EXCLUDE_DIRS = {
     "build",
 }
 
-# Comma-separated string for tools that accept --exclude flags.
-EXCLUDE_DIRS_STR = ",".join(EXCLUDE_DIRS)
+# Comma-separated string for tools that accept --exclude flags. Sorted so
+# the flags, and therefore the cache keys, are the same on every run.
+EXCLUDE_DIRS_STR = ",".join(sorted(EXCLUDE_DIRS))
+
+# Maximum line length enforced by black and flake8.
+LINE_LENGTH = 125
+
+# Tool flags shared by every run; they are also part of the cache keys.
+BLACK_ARGS = ["--line-length", str(LINE_LENGTH), f"--exclude=({'|'.join(sorted(EXCLUDE_DIRS))})"]
+ISORT_ARGS = ["--profile", "black", "--skip", ".venv", "--skip", "venv", "--skip", ".env", "--skip", "env"]
+FLAKE8_LINT_ARGS = [
+    f"--max-line-length={LINE_LENGTH}",
+    "--extend-ignore=E203,W503",
+    "--show-source",
+    f"--exclude={EXCLUDE_DIRS_STR}",
+]
+FLAKE8_CRITICAL_ARGS = [
+    "--select=E999,F821,F822,F823",
+    "--show-source",
+    f"--exclude={EXCLUDE_DIRS_STR}",
+]
+
+# Persistent cache of passing results, relative to the repository root.
+CACHE_DIR = ".validate-cache"
+
+# Cache entries (and whole keys) unused for this many seconds are evicted.
+CACHE_MAX_AGE = 14 * 24 * 60 * 60
+
+# Watch mode: seconds between scans when inotify is unavailable, and how
+# long to wait for more events before validating a burst of saves.
+POLL_INTERVAL = 0.5
+DEBOUNCE_INTERVAL = 0.05
+
+# --history keeps this many runs. A check is reported as slow when it takes
+# SLOWDOWN_FACTOR times its median and at least SLOWDOWN_MIN_SECONDS more.
+HISTORY_LIMIT = 200
+SLOWDOWN_FACTOR = 1.5
+SLOWDOWN_MIN_SECONDS = 0.1
 
 
 def find_python_files(base_dirs):
@@ -271,9 +695,382 @@ def find_python_files(base_dirs):
     return python_files
 
 
+def find_changed_python_files(base_dirs, base_ref=None):
+    """Find Python files that git reports as changed.
+
+    Collects staged, modified and untracked files, plus everything changed
+    since the merge base with base_ref when one is given. Deleted files,
+    files outside base_dirs and files under EXCLUDE_DIRS are dropped.
+
+    Args:
+        base_dirs: List of directory paths to limit the result to.
+        base_ref: Optional git ref (branch, tag or commit) to diff against.
+
+    Returns:
+        Sorted list of Path objects for the changed .py files.
+
+    Raises:
+        subprocess.CalledProcessError: If a git command fails.
+    """
+    commands = [
+        ["git", "diff", "--name-only", "-z", "--cached"],
+        ["git", "diff", "--name-only", "-z"],
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+    ]
+    if base_ref:
+        commands.append(["git", "diff", "--name-only", "-z", "--merge-base", base_ref])
+
+    names = set()
+    for cmd in commands:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        names.update(name for name in result.stdout.split("\0") if name)
+
+    roots = [Path(base_dir) for base_dir in base_dirs]
+    python_files = []
+    for name in sorted(names):
+        path = Path(name)
+        if path.suffix != ".py" or not path.is_file():
+            continue
+        if EXCLUDE_DIRS.intersection(path.parts[:-1]):
+            continue
+        if any(root in path.parents for root in roots):
+            python_files.append(path)
+
+    return python_files
+
+
+class FileWatcher:
+    """Report Python files that change under a set of directories.
+
+    Uses Linux inotify through ctypes when it is available and otherwise
+    polls file modification times every POLL_INTERVAL seconds.
+    """
+
+    # inotify event masks, from <sys/inotify.h>.
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, base_dirs):
+        self.base_dirs = base_dirs
+        self._fd = None
+        self._dirs = {}
+        try:
+            self._start_inotify()
+            self.backend = "inotify"
+        except (OSError, AttributeError):
+            self._snapshot = self._poll_snapshot()
+            self.backend = "polling"
+
+    def _start_inotify(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        for base_dir in self.base_dirs:
+            self._add_tree(base_dir)
+
+    def _add_tree(self, base_dir):
+        for root, dirs, _ in os.walk(base_dir):
+            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(root), self.WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {root}")
+            self._dirs[wd] = Path(root)
+
+    def _read_inotify(self, timeout):
+        """Return changed paths seen within timeout seconds (None blocks)."""
+        changed = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+
+        data = os.read(self._fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+            offset += struct.calcsize("iIII")
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were lost; treat every file as changed.
+                changed.update(find_python_files(self.base_dirs))
+                continue
+            if wd not in self._dirs:
+                continue
+            path = self._dirs[wd] / name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and name not in EXCLUDE_DIRS:
+                    self._add_tree(path)
+                    changed.update(find_python_files([path]))
+            elif name.endswith(".py"):
+                changed.add(path)
+        return changed
+
+    def _poll_snapshot(self):
+        snapshot = {}
+        for path in find_python_files(self.base_dirs):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self):
+        """Block until at least one Python file changes.
+
+        Events arriving within DEBOUNCE_INTERVAL of each other are grouped,
+        so an editor's write-then-rename counts as one change.
+
+        Returns:
+            Sorted list of Path objects for changed, created or deleted files.
+        """
+        if self._fd is not None:
+            changed = set()
+            while not changed:
+                changed = self._read_inotify(None)
+            while True:
+                more = self._read_inotify(DEBOUNCE_INTERVAL)
+                if not more:
+                    break
+                changed.update(more)
+            return sorted(changed)
+
+        while True:
+            time.sleep(POLL_INTERVAL)
+            snapshot = self._poll_snapshot()
+            changed = {
+                path for path in snapshot.keys() | self._snapshot.keys() if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return sorted(changed)
+
+    def close(self):
+        """Release the inotify file descriptor, if any."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Validate Python code in pulumi/, scripts/ and server/.")
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="automatically fix formatting issues with black and isort",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of checks to run at the same time (default: all of them)",
+    )
+    parser.add_argument(
+        "--changed",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="BASE",
+        help="only check staged, modified and untracked files, plus files changed since BASE if given",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-validate files as they are saved",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "inprocess", "subprocess"],
+        default="auto",
+        help="run tools through their Python APIs (inprocess) or as separate processes (subprocess)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["text", "json"],
+        default="text",
+        help="json prints a timing report on stdout and progress on stderr",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="FILE",
+        default=None,
+        help="append this run's timings to a JSON-lines file and warn about slowdowns",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"check every file, ignoring results cached in {CACHE_DIR}/",
+    )
+    return parser.parse_args()
+
+
+def validate(python_files, cache, engine, fix=False, jobs=None):
+    """Run every validation check over python_files.
+
+    The checks are independent of each other, so they run concurrently and
+    their output is printed in a fixed order.
+
+    Returns:
+        List of stats dicts, one per check (see timed_check()).
+    """
+    pending = [
+        ("Syntax", check_syntax, (python_files, cache)),
+        ("Formatting", check_formatting, (python_files, cache, engine, fix)),
+        ("Imports", check_imports, (python_files, cache, engine, fix)),
+        ("Undefined Names", check_undefined_names, (python_files, cache, engine)),
+        ("Linting", check_linting, (python_files, cache, engine)),
+    ]
+    order = [name for name, _, _ in pending]
+    jobs = jobs or len(pending)
+
+    results = []
+    if fix:
+        # black and isort rewrite files in place, so they run one after the
+        # other before the read-only checks look at the tree.
+        writers = [check for check in pending if check[0] in ("Formatting", "Imports")]
+        results.extend(run_checks(writers))
+        pending = [check for check in pending if check not in writers]
+    results.extend(run_checks(pending, jobs))
+
+    return sorted(results, key=lambda stats: order.index(stats["name"]))
+
+
+def print_summary(checks):
+    """Print the PASSED/FAILED summary; return True if every check passed."""
+    print_header("Validation Summary")
+
+    passed = sum(1 for check in checks if check["passed"])
+    total = len(checks)
+
+    for check in checks:
+        timing = f"({check['wall_s']:.2f}s)"
+        if check["passed"]:
+            print_success(f"{check['name']}: PASSED {timing}")
+        else:
+            print_error(f"{check['name']}: FAILED {timing}")
+
+    print(f"\n{passed}/{total} checks passed")
+    return passed == total
+
+
+def _cpu_seconds(times):
+    """Total user and system CPU of this process and its reaped children."""
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def update_history(history_file, report):
+    """Append a run to the JSON-lines history file, keeping HISTORY_LIMIT runs.
+
+    The per-file syntax timings are left out to keep the file small.
+
+    Returns:
+        List of earlier runs, oldest first, not including this one.
+    """
+    previous = []
+    if history_file.exists():
+        for line in history_file.read_text().splitlines():
+            try:
+                previous.append(json.loads(line))
+            except ValueError:
+                continue
+
+    entry = {**report, "checks": [{k: v for k, v in check.items() if k != "file_times"} for check in report["checks"]]}
+    runs = (previous + [entry])[-HISTORY_LIMIT:]
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    history_file.write_text("".join(json.dumps(run) + "\n" for run in runs))
+    return previous
+
+
+def print_slowdowns(report, previous):
+    """Warn about checks that ran much slower than their recent median.
+
+    Only earlier runs with the same engine, mode and file selection are
+    compared, so a --changed run is not measured against a full scan.
+    """
+    similar = [
+        run
+        for run in previous
+        if (run.get("engine"), run.get("mode"), run.get("changed_only"))
+        == (report["engine"], report["mode"], report["changed_only"])
+    ]
+    if not similar:
+        return
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2] if values else None
+
+    samples = [("Total", report["wall_s"], [run["wall_s"] for run in similar])]
+    for check in report["checks"]:
+        past = [c["wall_s"] for run in similar for c in run.get("checks", []) if c.get("name") == check["name"]]
+        samples.append((check["name"], check["wall_s"], past))
+
+    for name, current, past in samples:
+        baseline = median(past)
+        if baseline is None:
+            continue
+        if current > baseline * SLOWDOWN_FACTOR and current - baseline > SLOWDOWN_MIN_SECONDS:
+            print_warning(f"{name} took {current:.2f}s, {current / baseline:.1f}x its median of {baseline:.2f}s")
+
+
+def watch(python_dirs, cache, engine, fix=False, jobs=None):
+    """Re-validate Python files under python_dirs each time they change.
+
+    Runs until interrupted. Tool modules stay imported and unchanged files
+    stay in the in-memory cache, so each round only reads, parses and
+    checks the files that were saved.
+    """
+    if engine == "inprocess":
+        # Import the tools up front so the first save does not pay for it.
+        for module in ("black", "isort", "flake8.main.application"):
+            importlib.import_module(module)
+
+    watcher = FileWatcher(python_dirs)
+    print(f"\n{Colors.BLUE}Watching {', '.join(python_dirs)} ({watcher.backend}); press Ctrl+C to stop{Colors.NC}")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            cache.forget(changed)
+            python_files = [path for path in changed if path.is_file()]
+            if not python_files:
+                continue
+
+            started = time.perf_counter()
+            print(f"\n{Colors.BLUE}[{time.strftime('%H:%M:%S')}] Changed: {', '.join(map(str, python_files))}{Colors.NC}")
+            checks = validate(python_files, cache, engine, fix, jobs)
+            cache.save()
+            print_summary(checks)
+            print(f"Validated in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
 def main():
     """Main validation routine."""
-    fix = "--fix" in sys.argv
+    args = parse_args()
+    fix = args.fix
+    run_started, times_started = time.perf_counter(), os.times()
+
+    # With --report json the report owns stdout; progress goes to stderr.
+    report_stream = sys.stdout
+    if args.report == "json":
+        sys.stdout = sys.stderr
+
+    # Relative paths on the command line are relative to where we were run.
+    history_file = Path(args.history).resolve() if args.history else None
 
     # Get repository root (parent of scripts directory)
     repo_root = Path(__file__).parent.parent
@@ -281,42 +1078,65 @@ def main():
 
     print(f"\n{Colors.BLUE}TrailLens Python Code Validator{Colors.NC}")
     print(f"{Colors.BLUE}Repository: {repo_root.name}{Colors.NC}")
-    print(f"Mode: {'FIX' if fix else 'CHECK'}\n")
+    engine = resolve_engine(args.engine)
+    print(f"Mode: {'FIX' if fix else 'CHECK'}")
+    print(f"Engine: {engine}\n")
 
     # Define directories to check
-    python_dirs = ["pulumi/", "scripts/"]
-
-    # Find all Python files
-    python_files = find_python_files(python_dirs)
-    print(f"Found {len(python_files)} Python files\n")
-
-    # Run validation checks
-    checks = []
+    python_dirs = ["pulumi/", "scripts/", "server/"]
 
+    # Find all Python files, or only the ones git reports as changed
+    started = time.perf_counter()
+    if args.changed is None:
+        python_files = find_python_files(python_dirs)
+        print(f"Found {len(python_files)} Python files\n")
+    else:
+        try:
+            python_files = find_changed_python_files(python_dirs, args.changed)
+        except subprocess.CalledProcessError as e:
+            print_error(f"git failed: {e.stderr.strip()}")
+            sys.exit(1)
+        since = f" since {args.changed}" if args.changed else ""
+        print(f"Found {len(python_files)} changed Python files{since}\n")
+    phases = {"discovery_s": time.perf_counter() - started}
+
+    started = time.perf_counter()
     if not check_tools():
         sys.exit(1)
+    phases["tools_s"] = time.perf_counter() - started
 
-    checks.append(("Syntax", check_syntax(python_files)))
-    checks.append(("Formatting", check_formatting(python_dirs, fix)))
-    checks.append(("Imports", check_imports(python_dirs, fix)))
-    checks.append(("Undefined Names", check_undefined_names(python_dirs)))
-    checks.append(("Linting", check_linting(python_dirs)))
-
-    # Summary
-    print_header("Validation Summary")
-
-    passed = sum(1 for _, result in checks if result)
-    total = len(checks)
+    # Files that passed a check before and have not changed since are not
+    # sent to that check's tool again.
+    cache = ResultCache(repo_root / CACHE_DIR, enabled=not args.no_cache)
+    checks = validate(python_files, cache, engine, fix, args.jobs)
+    cache.save()
 
-    for check_name, result in checks:
-        if result:
-            print_success(f"{check_name}: PASSED")
-        else:
-            print_error(f"{check_name}: FAILED")
+    if args.watch:
+        print_summary(checks)
+        watch(python_dirs, cache, engine, fix, args.jobs)
+        sys.exit(0)
 
-    print(f"\n{passed}/{total} checks passed")
+    passed = print_summary(checks)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "engine": engine,
+        "mode": "fix" if fix else "check",
+        "changed_only": args.changed is not None,
+        "files": len(python_files),
+        "passed": passed,
+        **phases,
+        "wall_s": time.perf_counter() - run_started,
+        "cpu_s": _cpu_seconds(os.times()) - _cpu_seconds(times_started),
+        "checks": checks,
+    }
+    if history_file:
+        print_slowdowns(report, update_history(history_file, report))
+    if args.report == "json":
+        json.dump(report, report_stream, indent=2)
+        report_stream.write("\n")
 
-    if passed == total:
+    if passed:
         print_success("\n✅ All validation checks passed!")
         sys.exit(0)
     else:
@@ -0,0 +1,14 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+LiteLLM proxy hooks for TrailLens AI.
+
+Each module exposes a ``proxy_handler_instance`` that litellm-config.yaml
+registers under ``litellm_settings.callbacks``. LiteLLM resolves the dotted
+path relative to the config file, so podman-compose mounts this directory
+at /app/hooks next to /app/config.yaml and sets PYTHONPATH=/app for imports
+between modules.
+"""
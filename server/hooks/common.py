@@ -0,0 +1,206 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Helpers shared by the LiteLLM proxy hooks.
+
+- Settings from environment variables (set in podman-compose.yaml or the
+  environment_variables block of litellm-config.yaml)
+- Per-model settings from model_info in litellm-config.yaml
+- One Redis connection pool per worker process, on the same REDIS_HOST,
+  REDIS_PORT and REDIS_SSL as LiteLLM's own cache
+- Request normalisation and hashing
+- float16 vector packing and cosine similarity
+- Hit/miss counters kept in a Redis hash per hook
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+
+logger = logging.getLogger("traillens.hooks")
+
+KEY_PREFIX = "traillens:hooks"
+
+# Request fields that change the completion. Anything else (metadata,
+# user, stream, timeouts) is ignored when hashing.
+COMPLETION_FIELDS = (
+    "model",
+    "messages",
+    "temperature",
+    "top_p",
+    "top_k",
+    "max_tokens",
+    "max_completion_tokens",
+    "stop",
+    "tools",
+    "tool_choice",
+    "response_format",
+    "reasoning_effort",
+    "thinking",
+    "seed",
+)
+
+# Fields a hook's own call repeats from the caller's request although they
+# do not change the completion: the usage chunk and end-user attribution.
+FORWARDED_FIELDS = ("stream_options", "user")
+
+_redis = None
+
+
+def env_float(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, "") else float(value)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, "") else int(value)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    return default if value in (None, "") else value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_redis():
+    """Return this process's async Redis client, creating it on first use."""
+    global _redis
+    if _redis is None:
+        import redis.asyncio as redis
+
+        _redis = redis.Redis(
+            host=os.environ.get("REDIS_HOST", "redis"),
+            port=env_int("REDIS_PORT", 6379),
+            password=os.environ.get("REDIS_PASSWORD") or None,
+            ssl=env_bool("REDIS_SSL"),
+            socket_timeout=env_float("HOOKS_REDIS_TIMEOUT", 0.5),
+            socket_connect_timeout=env_float("HOOKS_REDIS_TIMEOUT", 0.5),
+            health_check_interval=30,
+        )
+    return _redis
+
+
+def get_router():
+    """The proxy's Router, or None outside the proxy."""
+    try:
+        from litellm.proxy.proxy_server import llm_router
+    except ImportError:
+        return None
+    return llm_router
+
+
+def get_prisma_client():
+    """The proxy's database client (DATABASE_URL), or None if not connected."""
+    try:
+        from litellm.proxy.proxy_server import prisma_client
+    except ImportError:
+        return None
+    return prisma_client
+
+
+def model_info(model_name):
+    """
+    Merged model_info for a model group in litellm-config.yaml.
+
+    Hooks read their per-model settings (thresholds, groups) from custom
+    model_info keys, so they are declared next to the model they apply to.
+    """
+    router = get_router()
+    if router is None:
+        return {}
+    info = {}
+    for deployment in router.get_model_list(model_name=model_name) or []:
+        info.update(deployment.get("model_info") or {})
+    return info
+
+
+def request_metadata(data):
+    """The request's metadata dict, created if missing."""
+    metadata = data.get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = data["metadata"] = {}
+    return metadata
+
+
+def logged_metadata(kwargs):
+    """Request metadata as seen by a logging callback."""
+    return (kwargs.get("litellm_params") or {}).get("metadata") or {}
+
+
+def normalize_text(text):
+    """Collapse whitespace so formatting-only differences hash the same."""
+    return " ".join(text.split())
+
+
+def message_text(message):
+    """Plain text of a chat message, including text parts of content lists."""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def digest(value):
+    """Stable SHA-256 hex digest of a JSON-serialisable value."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def completion_key(data):
+    """Hash of the fields that determine a completion."""
+    return digest({field: data.get(field) for field in COMPLETION_FIELDS if data.get(field) is not None})
+
+
+def completion_request(data):
+    """The caller's request, as a hook's own completion call repeats it."""
+    fields = (*COMPLETION_FIELDS, *FORWARDED_FIELDS)
+    return {field: data[field] for field in fields if data.get(field) is not None}
+
+
+def unit_vector(values):
+    norm = math.sqrt(sum(value * value for value in values)) or 1.0
+    return [value / norm for value in values]
+
+
+def pack_f16(values):
+    """Pack a vector as little-endian float16: 2 bytes per dimension."""
+    return struct.pack(f"<{len(values)}e", *values)
+
+
+def unpack_f16(data):
+    return struct.unpack(f"<{len(data) // 2}e", data)
+
+
+def dot(a, b):
+    """Dot product; the cosine similarity of two unit vectors."""
+    return sum(x * y for x, y in zip(a, b))
+
+
+class Counters:
+    """
+    Monotonic counters for one hook, kept in a Redis hash so every worker
+    process and replica adds to the same totals:
+
+        redis-cli HGETALL traillens:hooks:stats:semantic_cache
+    """
+
+    def __init__(self, name):
+        self.key = f"{KEY_PREFIX}:stats:{name}"
+
+    async def incr(self, field, amount=1):
+        try:
+            await get_redis().hincrby(self.key, field, amount)
+        except Exception as e:
+            logger.debug("counter %s.%s not updated: %s", self.key, field, e)
+
+    async def snapshot(self):
+        values = await get_redis().hgetall(self.key)
+        return {field.decode(): int(value) for field, value in values.items()}
@@ -0,0 +1,201 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Per-text embedding cache with batch splitting and deduplication.
+
+Continue's @codebase indexing sends many small embedding batches, and the
+request-level Redis cache misses whenever one chunk in a batch changes.
+This hook caches each text on its own:
+
+1. The batch is split into texts, and each is looked up by content hash in
+   one Redis MGET. Vectors are stored as float16, 2 bytes per dimension.
+2. Unique misses go to Bedrock as single-text calls through the router,
+   at most EMBEDDING_CACHE_CONCURRENCY at a time. Titan accepts one text per
+   invocation, so this is the same number of Bedrock calls as a batch, just
+   run in parallel, minus hits and duplicates. The new vectors are stored
+   with a TTL of EMBEDDING_CACHE_TTL seconds.
+3. The proxy call itself is answered with mock_response and no cache
+   read/write. The post-call hook then replaces its data with the vectors in
+   the original order and sets usage to the tokens actually sent to Bedrock.
+   The single-text calls are logged and billed to the caller's key, with
+   metadata hook=embedding_cache, so the proxy call's own cost is zeroed
+   before it is logged.
+
+If any single-text call fails, the texts that did embed are still stored,
+and the batch goes to Bedrock unchanged as if the hook were off.
+
+Re-indexing a mostly unchanged repository then costs one Bedrock call per
+changed chunk. Enable it per model in litellm-config.yaml:
+
+    model_info:
+      embedding_cache: true
+
+Counters (texts, hits, misses, duplicates, errors) are kept in
+traillens:hooks:stats:embedding_cache. If Redis is unavailable, the request
+still completes, with every text treated as a miss.
+"""
+
+import asyncio
+import uuid
+
+from hooks.common import (
+    KEY_PREFIX,
+    Counters,
+    digest,
+    env_int,
+    get_redis,
+    get_router,
+    logged_metadata,
+    logger,
+    model_info,
+    pack_f16,
+    request_metadata,
+    unpack_f16,
+)
+from litellm.integrations.custom_logger import CustomLogger
+from litellm.types.utils import Usage
+
+METADATA_KEY = "embedding_cache"
+# Requests whose vectors are waiting for the post-call hook.
+MAX_PENDING = 1024
+
+
+class EmbeddingCache(CustomLogger):
+    """Serve embedding batches text by text from a float16 Redis store."""
+
+    def __init__(self):
+        super().__init__()
+        self.ttl = env_int("EMBEDDING_CACHE_TTL", 30 * 86400)
+        self.concurrency = env_int("EMBEDDING_CACHE_CONCURRENCY", 8)
+        self.counters = Counters(METADATA_KEY)
+        self._pending = {}
+
+    async def async_pre_call_hook(self, user_api_key_dict, cache, data, call_type):
+        if call_type not in ("embeddings", "aembedding"):
+            return data
+        if not model_info(data.get("model")).get("embedding_cache"):
+            return data
+        texts = [data["input"]] if isinstance(data.get("input"), str) else data.get("input")
+        if not texts or not all(isinstance(text, str) for text in texts):
+            # Token arrays and empty input go to Bedrock unchanged.
+            return data
+
+        keys = [self._key(data, text) for text in texts]
+        vectors = dict(zip(keys, await self._get(keys)))
+        misses = {key: text for key, text in zip(keys, texts) if vectors[key] is None}
+        prompt_tokens = await self._embed_misses(data, misses, vectors)
+        if prompt_tokens is None:
+            await self.counters.incr("errors")
+            return data
+
+        hits = sum(1 for key in keys if key not in misses)
+        await asyncio.gather(
+            self.counters.incr("texts", len(texts)),
+            self.counters.incr("hits", hits),
+            self.counters.incr("misses", len(misses)),
+            self.counters.incr("duplicates", len(texts) - hits - len(misses)),
+        )
+
+        token = uuid.uuid4().hex
+        if len(self._pending) >= MAX_PENDING:
+            # Drop the oldest entry; its request failed before the post-call hook.
+            self._pending.pop(next(iter(self._pending)))
+        self._pending[token] = ([vectors[key] for key in keys], prompt_tokens)
+        request_metadata(data)[METADATA_KEY] = {"token": token, "hits": hits, "misses": len(misses)}
+
+        # Answer the proxy call locally. The post-call hook swaps in the
+        # real vectors; the placeholder must never reach LiteLLM's cache.
+        data["input"] = texts[:1]
+        data["mock_response"] = "embedding_cache"
+        data["cache"] = {"no-cache": True, "no-store": True}
+        return data
+
+    async def async_post_call_success_hook(self, data, user_api_key_dict, response):
+        entry = (data.get("metadata") or {}).get(METADATA_KEY)
+        pending = self._pending.pop(entry["token"], None) if entry else None
+        if pending is None:
+            return response
+        vectors, prompt_tokens = pending
+        response.data = [
+            {"object": "embedding", "index": index, "embedding": list(vector)} for index, vector in enumerate(vectors)
+        ]
+        response.usage = Usage(prompt_tokens=prompt_tokens, completion_tokens=0, total_tokens=prompt_tokens)
+        return response
+
+    async def async_logging_hook(self, kwargs, result, call_type):
+        # Runs after LiteLLM prices the proxy call and before spend is
+        # tracked. The single-text calls already carry the real cost.
+        entry = logged_metadata(kwargs).get(METADATA_KEY)
+        if entry and "token" in entry:
+            kwargs["response_cost"] = 0.0
+            if kwargs.get("standard_logging_object"):
+                kwargs["standard_logging_object"]["response_cost"] = 0.0
+        return kwargs, result
+
+    async def async_post_call_failure_hook(self, request_data, original_exception, user_api_key_dict, **kwargs):
+        entry = (request_data.get("metadata") or {}).get(METADATA_KEY)
+        if entry:
+            self._pending.pop(entry["token"], None)
+
+    @staticmethod
+    def _key(data, text):
+        # Texts are hashed exactly: whitespace can change an embedding.
+        options = {field: data.get(field) for field in ("model", "dimensions", "encoding_format")}
+        return f"{KEY_PREFIX}:embedding:{digest([options, text])}"
+
+    async def _get(self, keys):
+        try:
+            values = await get_redis().mget(keys)
+        except Exception as e:
+            logger.warning("embedding cache read skipped: %s", e)
+            return [None] * len(keys)
+        return [None if value is None else unpack_f16(value) for value in values]
+
+    async def _embed_misses(self, data, misses, vectors):
+        """
+        Embed each missing text, store it, and fill vectors.
+
+        Returns:
+            int: Prompt tokens sent to Bedrock, or None if any text failed.
+        """
+        if not misses:
+            return 0
+        router = get_router()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        options = {field: data[field] for field in ("dimensions", "encoding_format") if data.get(field) is not None}
+        # Keep the caller's metadata so spend is still attributed to their key.
+        metadata = {**(data.get("metadata") or {}), "hook": METADATA_KEY}
+
+        async def embed(text):
+            async with semaphore:
+                response = await router.aembedding(model=data["model"], input=[text], metadata=metadata, **options)
+            item = response.data[0]
+            usage = response.usage or {}
+            tokens = usage.get("prompt_tokens") if isinstance(usage, dict) else usage.prompt_tokens
+            return (item["embedding"] if isinstance(item, dict) else item.embedding), tokens or 0
+
+        results = await asyncio.gather(*(embed(text) for text in misses.values()), return_exceptions=True)
+        embedded = {key: result for key, result in zip(misses, results) if not isinstance(result, BaseException)}
+        for key, (vector, _) in embedded.items():
+            vectors[key] = vector
+
+        if embedded:
+            try:
+                async with get_redis().pipeline(transaction=False) as pipe:
+                    for key, (vector, _) in embedded.items():
+                        pipe.set(key, pack_f16(vector), ex=self.ttl)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning("embedding cache write skipped: %s", e)
+
+        failed = [result for result in results if isinstance(result, BaseException)]
+        if failed:
+            logger.warning("embedding cache: %d of %d texts failed: %s", len(failed), len(misses), failed[0])
+            return None
+        return sum(tokens for _, tokens in embedded.values())
+
+
+proxy_handler_instance = EmbeddingCache()
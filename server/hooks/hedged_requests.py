@@ -0,0 +1,301 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Hedged streaming requests for interactive chat models.
+
+A few slow Bedrock calls set our p99 chat latency. For models that opt in,
+this hook waits for the first token of a streamed completion for at most
+the model's hedge_percentile of recent time-to-first-token. If nothing has
+arrived by then, it sends the same request to an alternate deployment. That
+is another deployment of the same model (region or inference profile) if
+one exists, otherwise one from the model's equivalence_group. The first stream to
+produce a token is returned to the client and the other is closed:
+
+- A losing hedge is cancelled immediately.
+- A losing primary is closed at its first token, or after
+  HEDGE_LOSER_TIMEOUT seconds. This measures how long the client would have
+  waited, and Bedrock bills the input of a started request either way.
+
+Hedges are capped at HEDGE_MAX_RATE of the requests seen per model, up to
+the last HEDGE_WINDOW, so extra spend stays bounded even when a region is slow
+for everyone, including right after warm-up.
+No hedge is sent until HEDGE_MIN_SAMPLES first tokens have been seen. Enable
+per model in litellm-config.yaml:
+
+    model_info:
+      hedge_percentile: 95
+
+Metrics per model, including hedge rate, delivered and unhedged p99 TTFT, and
+the p99 latency saved, are in traillens:hooks:hedge:<model>. Counters
+(requests, hedged, hedge_wins, rate_capped) are in
+traillens:hooks:stats:hedged_requests. The hedge call is logged by LiteLLM
+like any other, with metadata hook=hedged_requests.
+
+The wait is measured from the request's arrival, recorded by the pre-call
+hook, so slow connection setup counts toward it. LiteLLM only hands the hook
+a stream once Bedrock has accepted the request, so a hedge cannot be sent
+during setup itself: a request whose setup alone overran the delay is hedged
+as soon as its stream opens.
+
+List this hook first under callbacks: each hook wraps the stream returned by
+the one before it, and only the raw stream identifies the primary deployment.
+"""
+
+import asyncio
+import collections
+import json
+import random
+import time
+
+from hooks.common import (
+    KEY_PREFIX,
+    Counters,
+    completion_request,
+    env_float,
+    env_int,
+    get_redis,
+    get_router,
+    logger,
+    model_info,
+    request_metadata,
+)
+from litellm.integrations.custom_logger import CustomLogger
+
+METADATA_KEY = "hedged_requests"
+# Publish metrics every this many requests per model.
+PUBLISH_EVERY = 20
+
+
+class ModelState:
+    """Recent first-token times and hedge decisions for one model."""
+
+    def __init__(self, window):
+        self.primary_ttft = collections.deque(maxlen=window)
+        self.delivered_ttft = collections.deque(maxlen=window)
+        self.hedged = collections.deque(maxlen=window)
+        self.requests = 0
+
+
+class HedgedRequests(CustomLogger):
+    """Race a second deployment when the first token is late."""
+
+    def __init__(self):
+        super().__init__()
+        self.max_rate = env_float("HEDGE_MAX_RATE", 0.05)
+        self.window = env_int("HEDGE_WINDOW", 500)
+        self.min_samples = env_int("HEDGE_MIN_SAMPLES", 50)
+        self.min_delay = env_float("HEDGE_MIN_DELAY", 0.25)
+        self.loser_timeout = env_float("HEDGE_LOSER_TIMEOUT", 30)
+        self.counters = Counters(METADATA_KEY)
+        self.models = {}
+
+    async def async_pre_call_hook(self, user_api_key_dict, cache, data, call_type):
+        if data.get("stream") and model_info(data.get("model")).get("hedge_percentile") is not None:
+            request_metadata(data)[METADATA_KEY] = {"start": time.monotonic()}
+        return data
+
+    async def async_post_call_streaming_iterator_hook(self, user_api_key_dict, response, request_data):
+        model = request_data.get("model")
+        percentile = model_info(model).get("hedge_percentile")
+        # Cache hits and single-flight followers are answered locally.
+        if percentile is None or "mock_response" in request_data:
+            async for chunk in response:
+                yield chunk
+            return
+
+        state = self.models.setdefault(model, ModelState(self.window))
+        arrival = ((request_data.get("metadata") or {}).get(METADATA_KEY) or {}).get("start")
+        start = time.monotonic() if arrival is None else arrival
+        primary = response.__aiter__()
+        primary_first = asyncio.ensure_future(_first_chunk(primary))
+        delay = self._delay(state, float(percentile))
+
+        hedge = None
+        winner = stream = None
+        try:
+            if delay is not None:
+                await asyncio.wait({primary_first}, timeout=max(start + delay - time.monotonic(), 0))
+                if not primary_first.done():
+                    alternate = self._alternate(model, getattr(response, "_hidden_params", {}).get("model_id"))
+                    if alternate is not None and self._allow(state):
+                        hedge = asyncio.create_task(self._start_hedge(alternate, request_data))
+                    elif alternate is not None:
+                        await self.counters.incr("rate_capped")
+            state.hedged.append(hedge is not None)
+
+            winner, stream, first = await self._race(primary_first, primary, hedge)
+            delivered = time.monotonic() - start
+            state.delivered_ttft.append(delivered)
+            if winner == "primary":
+                state.primary_ttft.append(delivered)
+            else:
+                await self.counters.incr("hedge_wins")
+                asyncio.create_task(self._drain_loser(primary_first, primary, state, start))
+            state.requests += 1
+            await self.counters.incr("requests")
+            if hedge is not None:
+                await self.counters.incr("hedged")
+            if state.requests % PUBLISH_EVERY == 0:
+                asyncio.create_task(self._publish(model, state, float(percentile)))
+
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            # Also runs when the client disconnects mid-race or mid-stream.
+            # A losing hedge is stopped by _race, a losing primary by _drain_loser.
+            if winner is None:
+                if hedge is not None:
+                    await _stop_hedge(hedge)
+                await _stop(primary_first, primary)
+            else:
+                await _close(stream)
+
+    # -------------------------------------------------------------------------
+    # Hedging decisions
+    # -------------------------------------------------------------------------
+
+    def _delay(self, state, percentile):
+        """Seconds to wait for the primary's first token, or None to never hedge."""
+        if len(state.primary_ttft) < self.min_samples:
+            return None
+        return max(_percentile(state.primary_ttft, percentile), self.min_delay)
+
+    def _allow(self, state):
+        """Keep the hedged share of recent requests, this one included, within HEDGE_MAX_RATE."""
+        return sum(state.hedged) + 1 <= self.max_rate * (len(state.hedged) + 1)
+
+    @staticmethod
+    def _alternate(model, primary_id):
+        """A deployment other than the primary: same model first, then its equivalence group."""
+        router = get_router()
+        if router is None:
+            return None
+        group = model_info(model).get("equivalence_group")
+        same_model, same_group = [], []
+        for deployment in router.model_list:
+            info = deployment.get("model_info") or {}
+            if info.get("id") == primary_id:
+                continue
+            if deployment["model_name"] == model:
+                same_model.append(info["id"])
+            elif group and info.get("equivalence_group") == group:
+                same_group.append(info["id"])
+        candidates = same_model or same_group
+        return random.choice(candidates) if candidates else None
+
+    # -------------------------------------------------------------------------
+    # Racing
+    # -------------------------------------------------------------------------
+
+    async def _start_hedge(self, deployment_id, request_data):
+        """Open the hedge stream; returns (stream, first chunk)."""
+        request = completion_request(request_data)
+        request["model"] = deployment_id
+        # Keep the caller's metadata so spend is still attributed to their key.
+        metadata = {**(request_data.get("metadata") or {}), "hook": METADATA_KEY}
+        stream = (await get_router().acompletion(**request, stream=True, metadata=metadata)).__aiter__()
+        try:
+            return stream, await _first_chunk(stream)
+        except BaseException:
+            # Lost the race (cancelled) or failed: release the connection.
+            await _close(stream)
+            raise
+
+    async def _race(self, primary_first, primary, hedge):
+        """Return (winner, stream, first chunk) for whichever produces a token first."""
+        if hedge is None:
+            return "primary", primary, await primary_first
+
+        pending = {primary_first: "primary", hedge: "hedge"}
+        error = None
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                role = pending.pop(task)
+                if task.exception() is not None:
+                    error = task.exception()
+                    logger.warning("hedged request: %s stream failed: %s", role, error)
+                    continue
+                if role == "primary":
+                    asyncio.create_task(_stop_hedge(hedge))
+                    return "primary", primary, task.result()
+                stream, first = task.result()
+                return "hedge", stream, first
+        raise error
+
+    async def _drain_loser(self, primary_first, primary, state, start):
+        """Measure the losing primary's first token for the metrics, then close it."""
+        try:
+            await asyncio.wait_for(asyncio.shield(primary_first), self.loser_timeout)
+        except Exception:
+            # Timed out or failed: record the lower bound.
+            pass
+        state.primary_ttft.append(time.monotonic() - start)
+        await _stop(primary_first, primary)
+
+    async def _publish(self, model, state, percentile):
+        delivered_p99 = _percentile(state.delivered_ttft, 99)
+        primary_p99 = _percentile(state.primary_ttft, 99)
+        metrics = {
+            "requests": state.requests,
+            "hedge_rate": round(sum(state.hedged) / len(state.hedged), 4),
+            "hedge_delay_ms": round((self._delay(state, percentile) or 0) * 1000, 1),
+            "ttft_p50_ms": round(_percentile(state.delivered_ttft, 50) * 1000, 1),
+            "ttft_p99_ms": round(delivered_p99 * 1000, 1),
+            "unhedged_ttft_p99_ms": round(primary_p99 * 1000, 1),
+            "p99_saved_ms": round((primary_p99 - delivered_p99) * 1000, 1),
+        }
+        try:
+            await get_redis().hset(f"{KEY_PREFIX}:hedge:{model}", mapping=metrics)
+        except Exception as e:
+            logger.debug("hedge metrics not published: %s (%s)", e, json.dumps(metrics))
+
+
+async def _first_chunk(stream):
+    """The stream's first chunk, or None if it ends without one."""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _close(stream):
+    close = getattr(stream, "aclose", None)
+    if close is not None:
+        try:
+            await close()
+        except Exception as e:
+            logger.debug("stream close failed: %s", e)
+
+
+async def _stop(task, stream):
+    """Cancel a pending first-chunk read, then close its stream."""
+    task.cancel()
+    # The stream cannot be closed while the read is still running in it.
+    await asyncio.wait({task})
+    await _close(stream)
+
+
+async def _stop_hedge(task):
+    """Cancel the hedge; close its stream if it produced its first token as it lost."""
+    task.cancel()
+    await asyncio.wait({task})
+    if not task.cancelled() and task.exception() is None:
+        stream, _ = task.result()
+        await _close(stream)
+
+
+def _percentile(values, percentile):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+proxy_handler_instance = HedgedRequests()
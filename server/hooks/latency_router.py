@@ -0,0 +1,285 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Latency-aware routing across equivalent models, with cooldowns.
+
+LiteLLM routes a request among the deployments of the model name it asks
+for. When claude-sonnet-4-6 is throttled or slow, requests keep going to
+it while claude-sonnet-4-5 sits idle. This hook installs a custom routing
+strategy on the proxy's Router:
+
+1. Models that declare the same model_info.equivalence_group form a group.
+   A request for any of them can go to any deployment in the group (model x
+   region/profile).
+2. Each deployment keeps an exponentially weighted moving average of its
+   latency (time to first token when streaming, total latency otherwise)
+   and of its error rate. Its score is latency x (1 + ROUTER_ERROR_WEIGHT x
+   error rate). Deployments of another model in the group score
+   ROUTER_ALTERNATE_PENALTY times worse, so the requested model wins unless
+   it is clearly slower. Deployments without samples yet score as well as the
+   best known one, so they get tried.
+3. A 408 (request timeout), 429 or 5xx puts the deployment in cooldown for
+   ROUTER_COOLDOWN seconds, doubling with each consecutive failure up to
+   ROUTER_MAX_COOLDOWN. If every deployment is cooling down, the one that
+   recovers first is used.
+4. A fraction ROUTER_EXPLORE of requests go to a random eligible deployment,
+   so scores of unused deployments stay current.
+
+Models without an equivalence group are routed by LiteLLM as before.
+Scores and cooldowns are kept per worker process. Routing decisions are
+published for inspection:
+
+    redis-cli LRANGE traillens:hooks:router:decisions 0 9   # last decisions
+    redis-cli HGETALL traillens:hooks:router:state          # scores per deployment
+    redis-cli HGETALL traillens:hooks:stats:latency_router  # routed/switched/cooldowns
+
+Each request's decision is also added to its metadata under latency_router.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from hooks.common import (
+    KEY_PREFIX,
+    Counters,
+    env_float,
+    get_redis,
+    get_router,
+    logger,
+    model_info,
+)
+from litellm.integrations.custom_logger import CustomLogger
+
+METADATA_KEY = "latency_router"
+DECISIONS_KEY = f"{KEY_PREFIX}:router:decisions"
+STATE_KEY = f"{KEY_PREFIX}:router:state"
+MAX_DECISIONS = 200
+COOLDOWN_STATUS_CODES = (408, 429)
+
+
+class DeploymentStats:
+    """EWMA latency and error rate, plus cooldown, for one deployment."""
+
+    def __init__(self):
+        self.latency = None
+        self.errors = 0.0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def record_success(self, latency, alpha):
+        self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        self.errors *= 1 - alpha
+        self.failures = 0
+
+    def record_failure(self, alpha, cooldown):
+        self.errors = alpha + (1 - alpha) * self.errors
+        self.failures += 1
+        if cooldown:
+            self.cooldown_until = time.monotonic() + cooldown
+
+    def as_dict(self):
+        return {
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "error_rate": round(self.errors, 4),
+            "cooldown_s": round(max(0.0, self.cooldown_until - time.monotonic()), 1),
+        }
+
+
+class LatencyRouter(CustomLogger):
+    """Route within equivalence groups by EWMA latency and error rate."""
+
+    def __init__(self):
+        super().__init__()
+        self.alpha = env_float("ROUTER_EWMA_ALPHA", 0.3)
+        self.error_weight = env_float("ROUTER_ERROR_WEIGHT", 4.0)
+        self.alternate_penalty = env_float("ROUTER_ALTERNATE_PENALTY", 1.5)
+        self.cooldown = env_float("ROUTER_COOLDOWN", 10)
+        self.max_cooldown = env_float("ROUTER_MAX_COOLDOWN", 120)
+        self.explore = env_float("ROUTER_EXPLORE", 0.05)
+        self.counters = Counters(METADATA_KEY)
+        self.stats = {}
+        self.labels = {}
+        self._router = None
+        self._default_async = None
+        self._default_sync = None
+
+    # -------------------------------------------------------------------------
+    # Installation
+    # -------------------------------------------------------------------------
+
+    async def async_pre_call_hook(self, user_api_key_dict, cache, data, call_type):
+        # The proxy builds its Router after loading callbacks, and rebuilds it
+        # when models change, so check on every request.
+        router = get_router()
+        if router is not None and router is not self._router:
+            self._install(router)
+        return data
+
+    def _install(self, router):
+        self._default_async = router.async_get_available_deployment
+        self._default_sync = router.get_available_deployment
+        router.set_custom_routing_strategy(self)
+        self._router = router
+        logger.info("latency router installed")
+
+    # -------------------------------------------------------------------------
+    # Routing strategy (called by the Router)
+    # -------------------------------------------------------------------------
+
+    # Extra keyword arguments from newer Router versions are passed through
+    # to the default strategy untouched.
+    async def async_get_available_deployment(
+        self, model, messages=None, input=None, specific_deployment=False, request_kwargs=None, **kwargs
+    ):
+        members = None if specific_deployment else self._group_members(model)
+        if not members:
+            return await self._default_async(
+                model=model,
+                messages=messages,
+                input=input,
+                specific_deployment=specific_deployment,
+                request_kwargs=request_kwargs or {},
+                **kwargs,
+            )
+        deployment, decision = self._choose(model, members)
+        self._record_decision(decision, request_kwargs)
+        return deployment
+
+    def get_available_deployment(
+        self, model, messages=None, input=None, specific_deployment=False, request_kwargs=None, **kwargs
+    ):
+        members = None if specific_deployment else self._group_members(model)
+        if not members:
+            return self._default_sync(
+                model=model,
+                messages=messages,
+                input=input,
+                specific_deployment=specific_deployment,
+                request_kwargs=request_kwargs,
+                **kwargs,
+            )
+        deployment, _ = self._choose(model, members)
+        return deployment
+
+    def _group_members(self, model):
+        group = model_info(model).get("equivalence_group")
+        if not group:
+            return None
+        return [
+            deployment
+            for deployment in self._router.model_list
+            if (deployment.get("model_info") or {}).get("equivalence_group") == group
+        ]
+
+    def _choose(self, model, members):
+        now = time.monotonic()
+        known = [self.stats[_id(d)].latency for d in members if _id(d) in self.stats]
+        known = [latency for latency in known if latency is not None]
+        optimistic = min(known) if known else 1.0
+        scores = {}
+        for deployment in members:
+            stats = self.stats.setdefault(_id(deployment), DeploymentStats())
+            self.labels[_id(deployment)] = _label(deployment)
+            score = (optimistic if stats.latency is None else stats.latency) * (1 + self.error_weight * stats.errors)
+            if deployment["model_name"] != model:
+                score *= self.alternate_penalty
+            scores[_id(deployment)] = score
+
+        by_id = {_id(deployment): deployment for deployment in members}
+        eligible = [deployment_id for deployment_id in by_id if self.stats[deployment_id].cooldown_until <= now]
+        if not eligible:
+            reason = "all_cooling_down"
+            chosen = min(by_id, key=lambda deployment_id: self.stats[deployment_id].cooldown_until)
+        elif len(eligible) > 1 and random.random() < self.explore:
+            reason = "explore"
+            chosen = random.choice(eligible)
+        else:
+            reason = "best_score"
+            chosen = min(eligible, key=scores.get)
+
+        deployment = by_id[chosen]
+        decision = {
+            "ts": round(time.time(), 3),
+            "requested": model,
+            "chosen": self.labels[chosen],
+            "reason": reason,
+            "switched": deployment["model_name"] != model,
+            "scores_ms": {self.labels[i]: round(score * 1000, 1) for i, score in scores.items()},
+            "cooling_down": [self.labels[i] for i in by_id if i not in eligible],
+        }
+        return deployment, decision
+
+    def _record_decision(self, decision, request_kwargs):
+        if request_kwargs is not None:
+            metadata = request_kwargs.get("metadata")
+            if isinstance(metadata, dict):
+                metadata[METADATA_KEY] = decision
+        # Routing must not wait on Redis.
+        asyncio.create_task(self._publish_decision(decision))
+
+    async def _publish_decision(self, decision):
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.lpush(DECISIONS_KEY, json.dumps(decision))
+                pipe.ltrim(DECISIONS_KEY, 0, MAX_DECISIONS - 1)
+                pipe.hincrby(self.counters.key, "routed", 1)
+                if decision["switched"]:
+                    pipe.hincrby(self.counters.key, "switched", 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.debug("routing decision not published: %s", e)
+
+    # -------------------------------------------------------------------------
+    # Observations
+    # -------------------------------------------------------------------------
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        payload = kwargs.get("standard_logging_object") or {}
+        stats = self.stats.get(payload.get("model_id"))
+        if stats is None or payload.get("cache_hit"):
+            return
+        start, end = payload.get("startTime"), payload.get("endTime")
+        first_token = payload.get("completionStartTime")
+        if start is None or end is None:
+            return
+        latency = (first_token if payload.get("stream") and first_token is not None else end) - start
+        stats.record_success(max(latency, 0.0), self.alpha)
+        await self._publish_state(payload["model_id"], stats)
+
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        payload = kwargs.get("standard_logging_object") or {}
+        stats = self.stats.get(payload.get("model_id"))
+        if stats is None:
+            return
+        status = getattr(kwargs.get("exception"), "status_code", None)
+        cools = status in COOLDOWN_STATUS_CODES or (isinstance(status, int) and status >= 500)
+        cooldown = min(self.cooldown * 2**stats.failures, self.max_cooldown) if cools else 0
+        stats.record_failure(self.alpha, cooldown)
+        if cooldown:
+            logger.info("deployment %s cooling down for %.0fs after %s", payload["model_id"], cooldown, status)
+            await self.counters.incr("cooldowns")
+        await self._publish_state(payload["model_id"], stats)
+
+    async def _publish_state(self, deployment_id, stats):
+        try:
+            await get_redis().hset(STATE_KEY, self.labels[deployment_id], json.dumps(stats.as_dict()))
+        except Exception as e:
+            logger.debug("router state not published: %s", e)
+
+
+def _id(deployment):
+    return deployment["model_info"]["id"]
+
+
+def _label(deployment):
+    params = deployment.get("litellm_params") or {}
+    region = params.get("aws_region_name")
+    return f"{deployment['model_name']}:{params.get('model')}" + (f"@{region}" if region else "")
+
+
+proxy_handler_instance = LatencyRouter()
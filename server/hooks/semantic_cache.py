@@ -0,0 +1,250 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Semantic response cache for chat completions.
+
+LiteLLM's Redis cache only hits on byte-identical requests. This hook also
+serves a cached completion when the last user message is close in meaning
+to one answered before, in the same conversation context:
+
+1. The scope is a hash of everything except the last user message: model,
+   earlier messages (whitespace-normalised), sampling parameters and
+   tools. Only requests with the same scope can match, so a hit never
+   changes the conversation or its settings, just the final wording.
+2. If the scope has stored entries, the normalised last user message is
+   embedded with titan-embed-v2 through the proxy's router and compared
+   with the scope's float16 vectors (2 bytes per dimension). A scope with
+   nothing stored yet is not embedded on the request path.
+3. At or above the model's semantic_cache_threshold, the cached text is
+   returned as the response via LiteLLM's mock_response, streamed or not,
+   without calling Bedrock. Otherwise the embedding (or the prompt, if it
+   was not embedded) is parked in Redis for SEMANTIC_CACHE_PENDING_TTL
+   seconds under the entry id, which is all the request metadata carries,
+   and the completion is stored when it succeeds.
+
+Enable it per model in litellm-config.yaml:
+
+    model_info:
+      semantic_cache_threshold: 0.96   # cosine similarity, 0-1
+
+Each scope holds at most SEMANTIC_CACHE_MAX_ENTRIES entries, evicted least
+recently used, and expires SEMANTIC_CACHE_TTL seconds after its last write.
+Hits, misses, stores and evictions are counted in
+traillens:hooks:stats:semantic_cache. Lookups time out after
+SEMANTIC_CACHE_LOOKUP_TIMEOUT seconds and every failure falls through to
+Bedrock, so the cache can slow a request by at most that timeout. Requests
+with tools, n > 1 or cache: {no-cache: true} are never served from the cache.
+"""
+
+import asyncio
+import json
+import time
+
+from hooks.common import (
+    KEY_PREFIX,
+    Counters,
+    completion_key,
+    digest,
+    dot,
+    env_float,
+    env_int,
+    get_redis,
+    get_router,
+    logged_metadata,
+    logger,
+    message_text,
+    model_info,
+    normalize_text,
+    pack_f16,
+    request_metadata,
+    unit_vector,
+    unpack_f16,
+)
+from litellm.integrations.custom_logger import CustomLogger
+
+EMBEDDING_MODEL = "titan-embed-v2"
+METADATA_KEY = "semantic_cache"
+MAX_PROMPT_CHARS = 8000
+
+
+class SemanticCache(CustomLogger):
+    """Serve near-duplicate chat completions from a per-scope vector index."""
+
+    def __init__(self):
+        super().__init__()
+        self.ttl = env_int("SEMANTIC_CACHE_TTL", 86400)
+        self.max_entries = env_int("SEMANTIC_CACHE_MAX_ENTRIES", 128)
+        self.dimensions = env_int("SEMANTIC_CACHE_DIMENSIONS", 512)
+        self.lookup_timeout = env_float("SEMANTIC_CACHE_LOOKUP_TIMEOUT", 0.5)
+        self.pending_ttl = env_int("SEMANTIC_CACHE_PENDING_TTL", 900)
+        self.counters = Counters(METADATA_KEY)
+
+    # -------------------------------------------------------------------------
+    # Request path
+    # -------------------------------------------------------------------------
+
+    async def async_pre_call_hook(self, user_api_key_dict, cache, data, call_type):
+        if call_type not in ("completion", "acompletion"):
+            return data
+        threshold = model_info(data.get("model")).get("semantic_cache_threshold")
+        prompt = self._cacheable_prompt(data)
+        if threshold is None or prompt is None:
+            return data
+
+        scope = self._scope(data)
+        entry_id = digest(prompt)[:32]
+        try:
+            match = await asyncio.wait_for(self._lookup(scope, entry_id, prompt, float(threshold)), self.lookup_timeout)
+        except Exception as e:
+            logger.warning("semantic cache lookup skipped: %s", e)
+            await self.counters.incr("errors")
+            return data
+
+        metadata = request_metadata(data)
+        if match is not None:
+            similarity, content = match
+            await self.counters.incr("hits")
+            metadata[METADATA_KEY] = {"hit": True, "similarity": round(similarity, 4)}
+            # LiteLLM answers with this text, streamed if requested, without
+            # calling the provider.
+            data["mock_response"] = content
+        else:
+            await self.counters.incr("misses")
+            metadata[METADATA_KEY] = {"hit": False, "scope": scope, "entry": entry_id}
+        return data
+
+    @staticmethod
+    def _cacheable_prompt(data):
+        """Normalised last user message, or None if the request can't be cached."""
+        if data.get("tools") or data.get("functions") or (data.get("n") or 1) > 1:
+            return None
+        if (data.get("cache") or {}).get("no-cache"):
+            return None
+        messages = data.get("messages") or []
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        prompt = normalize_text(message_text(messages[-1]))
+        return prompt[:MAX_PROMPT_CHARS] or None
+
+    @staticmethod
+    def _scope(data):
+        context = [
+            {"role": message.get("role"), "content": normalize_text(message_text(message))}
+            for message in data["messages"][:-1]
+        ]
+        return completion_key({**data, "messages": context})
+
+    def _keys(self, scope):
+        base = f"{KEY_PREFIX}:semantic:{scope}"
+        return f"{base}:vectors", f"{base}:responses", f"{base}:lru"
+
+    @staticmethod
+    def _pending_key(scope, entry_id):
+        return f"{KEY_PREFIX}:semantic:{scope}:pending:{entry_id}"
+
+    async def _embed(self, text):
+        response = await get_router().aembedding(
+            model=EMBEDDING_MODEL,
+            input=[text],
+            dimensions=self.dimensions,
+            metadata={"hook": METADATA_KEY},
+        )
+        item = response.data[0]
+        return unit_vector(item["embedding"] if isinstance(item, dict) else item.embedding)
+
+    async def _lookup(self, scope, entry_id, prompt, threshold):
+        """
+        Return (similarity, content) of the best match, or None.
+
+        On a miss, parks what the store needs under the pending key: the
+        vector if the prompt was embedded, otherwise the prompt itself.
+        """
+        vectors_key, responses_key, lru_key = self._keys(scope)
+        redis = get_redis()
+        stored = await redis.hgetall(vectors_key)
+        # Nothing to compare with: embed when storing, off the request path.
+        vector = await self._embed(prompt) if stored else None
+
+        best_id, best = _best_match(vector, stored, threshold) if vector else (None, threshold)
+        if best_id is not None:
+            cached = await redis.hget(responses_key, best_id)
+            if cached is not None:
+                await redis.zadd(lru_key, {best_id: time.time()})
+                return best, json.loads(cached)["content"]
+
+        pending = {"vector": pack_f16(vector)} if vector else {"prompt": prompt}
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._pending_key(scope, entry_id))
+            pipe.hset(self._pending_key(scope, entry_id), mapping=pending)
+            pipe.expire(self._pending_key(scope, entry_id), self.pending_ttl)
+            await pipe.execute()
+        return None
+
+    # -------------------------------------------------------------------------
+    # Store on success
+    # -------------------------------------------------------------------------
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        entry = logged_metadata(kwargs).get(METADATA_KEY)
+        if not entry or entry.get("hit"):
+            return
+        try:
+            choice = response_obj.choices[0]
+            content = choice.message.content
+            if not content or choice.finish_reason not in ("stop", "end_turn"):
+                return
+            packed = await self._pending_vector(entry["scope"], entry["entry"])
+            if packed is not None:
+                await self._store(entry["scope"], entry["entry"], packed, content)
+        except Exception as e:
+            logger.warning("semantic cache store skipped: %s", e)
+            await self.counters.incr("errors")
+
+    async def _pending_vector(self, scope, entry_id):
+        """The parked vector for a miss, embedding its prompt if needed; None if expired."""
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hgetall(self._pending_key(scope, entry_id))
+            pipe.delete(self._pending_key(scope, entry_id))
+            pending, _ = await pipe.execute()
+        if b"vector" in pending:
+            return pending[b"vector"]
+        if b"prompt" in pending:
+            return pack_f16(await self._embed(pending[b"prompt"].decode()))
+        return None
+
+    async def _store(self, scope, entry_id, packed, content):
+        vectors_key, responses_key, lru_key = self._keys(scope)
+        redis = get_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(vectors_key, entry_id, packed)
+            pipe.hset(responses_key, entry_id, json.dumps({"content": content, "stored_at": int(time.time())}))
+            pipe.zadd(lru_key, {entry_id: time.time()})
+            for key in (vectors_key, responses_key, lru_key):
+                pipe.expire(key, self.ttl)
+            pipe.zcard(lru_key)
+            *_, size = await pipe.execute()
+        await self.counters.incr("stores")
+
+        if size > self.max_entries:
+            evicted = await redis.zpopmin(lru_key, size - self.max_entries)
+            if evicted:
+                ids = [entry for entry, _ in evicted]
+                await redis.hdel(vectors_key, *ids)
+                await redis.hdel(responses_key, *ids)
+                await self.counters.incr("evictions", len(ids))
+
+
+def _best_match(vector, stored, threshold):
+    """(entry id, similarity) of the closest stored vector at or above threshold, or (None, threshold)."""
+    best_id, best = None, threshold
+    for entry_id, packed in stored.items():
+        similarity = dot(vector, unpack_f16(packed))
+        if similarity >= best:
+            best_id, best = entry_id, similarity
+    return best_id, best
+
+
+proxy_handler_instance = SemanticCache()
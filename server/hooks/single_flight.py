@@ -0,0 +1,320 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Single-flight coalescing of identical in-flight chat completions.
+
+LiteLLM's Redis cache only fills once a response finishes, so duplicate
+requests arriving together (several sessions, CI-triggered reviews) each go
+to Bedrock. With this hook only the first request (the leader) does:
+
+1. Requests are keyed by a hash of the fields that determine the completion,
+   plus whether they stream. The leader claims the key with SET NX in Redis,
+   so coalescing works across uvicorn workers and proxy replicas. The claim
+   is a short lease of SINGLE_FLIGHT_LEASE seconds, renewed by a heartbeat
+   while the leader's request is alive, for at most
+   SINGLE_FLIGHT_MAX_DURATION seconds.
+2. Followers attach to the leader's Redis stream. The leader publishes each
+   streamed chunk, or the final response, from a background task so its own
+   stream never waits on Redis. Followers replay the stream from the
+   start, so late joiners get every chunk.
+3. When the leader finishes it publishes "done" and releases the key. If it
+   fails, or its request ends without a result (client disconnected, stream
+   never iterated), it publishes "error". Followers that have not received
+   anything yet then make their own call. If the leader's worker dies, the
+   lease lapses within SINGLE_FLIGHT_LEASE seconds; followers check the key
+   whenever they are waiting and give up as soon as it is gone. A follower
+   also gives up after SINGLE_FLIGHT_IDLE_TIMEOUT seconds without a new entry.
+
+Non-streaming followers wait in the pre-call hook and are answered with
+mock_response. Streaming followers get a local placeholder call whose stream
+is replaced by the leader's chunks. Neither touches LiteLLM's cache.
+Enable per model in litellm-config.yaml:
+
+    model_info:
+      single_flight: true
+
+Counters (leaders, followers, fallbacks) are in
+traillens:hooks:stats:single_flight.
+"""
+
+import asyncio
+import json
+import uuid
+
+from hooks.common import (
+    KEY_PREFIX,
+    Counters,
+    completion_key,
+    completion_request,
+    env_float,
+    get_redis,
+    get_router,
+    logger,
+    model_info,
+    request_metadata,
+)
+from litellm.integrations.custom_logger import CustomLogger
+from litellm.types.utils import ModelResponseStream
+
+METADATA_KEY = "single_flight"
+# Finished streams stay readable briefly for followers still replaying.
+STREAM_RETENTION = 60
+# Must stay below HOOKS_REDIS_TIMEOUT.
+BLOCK_MS = 200
+
+
+class LeaderFailed(Exception):
+    """The leader's call failed or went silent; followers must call Bedrock."""
+
+
+class SingleFlight(CustomLogger):
+    """Share one Bedrock call among identical concurrent requests."""
+
+    def __init__(self):
+        super().__init__()
+        self.lease = env_float("SINGLE_FLIGHT_LEASE", 5)
+        self.max_duration = env_float("SINGLE_FLIGHT_MAX_DURATION", 600)
+        self.idle_timeout = env_float("SINGLE_FLIGHT_IDLE_TIMEOUT", 30)
+        self.counters = Counters(METADATA_KEY)
+        self._publishers = {}
+
+    # -------------------------------------------------------------------------
+    # Pre-call: elect a leader or attach as a follower
+    # -------------------------------------------------------------------------
+
+    async def async_pre_call_hook(self, user_api_key_dict, cache, data, call_type):
+        if call_type not in ("completion", "acompletion") or "mock_response" in data:
+            return data
+        if not model_info(data.get("model")).get("single_flight") or (data.get("n") or 1) > 1:
+            return data
+
+        key = f"{KEY_PREFIX}:flight:{completion_key(data)}:{'stream' if data.get('stream') else 'full'}"
+        stream = f"{key}:{uuid.uuid4().hex}"
+        try:
+            claimed = await get_redis().set(key, stream, nx=True, px=int(self.lease * 1000))
+            leader_stream = stream if claimed else await get_redis().get(key)
+        except Exception as e:
+            logger.warning("single-flight skipped: %s", e)
+            return data
+        if leader_stream is None:
+            # The leader finished between SET and GET; run normally.
+            return data
+
+        metadata = request_metadata(data)
+        if claimed:
+            await self.counters.incr("leaders")
+            metadata[METADATA_KEY] = {"role": "leader", "key": key, "stream": stream}
+            # The request's task outlives the call only while the client is
+            # connected; the heartbeat ends the flight if it finishes first.
+            self._publishers[stream] = Publisher(
+                key, stream, self.lease, self.max_duration, asyncio.current_task(), self._publishers
+            )
+            return data
+
+        leader_stream = leader_stream.decode() if isinstance(leader_stream, bytes) else leader_stream
+        await self.counters.incr("followers")
+        metadata[METADATA_KEY] = {"role": "follower", "stream": leader_stream}
+        if data.get("stream"):
+            # The placeholder stream is replaced in the iterator hook.
+            data["mock_response"] = METADATA_KEY
+            data["cache"] = {"no-cache": True, "no-store": True}
+            return data
+
+        try:
+            async for kind, payload in self._follow(leader_stream):
+                if kind == "response":
+                    data["mock_response"] = payload
+                    data["cache"] = {"no-cache": True, "no-store": True}
+                    return data
+        except LeaderFailed:
+            pass
+        await self.counters.incr("fallbacks")
+        metadata[METADATA_KEY]["role"] = "fallback"
+        return data
+
+    # -------------------------------------------------------------------------
+    # Leader: publish the result
+    # -------------------------------------------------------------------------
+
+    async def async_post_call_streaming_iterator_hook(self, user_api_key_dict, response, request_data):
+        flight = (request_data.get("metadata") or {}).get(METADATA_KEY) or {}
+        if flight.get("role") == "follower":
+            async for chunk in self._follow_stream(flight["stream"], request_data):
+                yield chunk
+            return
+
+        publisher = self._publishers.pop(flight.get("stream"), None) if flight.get("role") == "leader" else None
+        if publisher is None:
+            async for chunk in response:
+                yield chunk
+            return
+
+        completed = False
+        try:
+            async for chunk in response:
+                publisher.publish("chunk", chunk.model_dump_json(exclude_none=True))
+                yield chunk
+            completed = True
+        finally:
+            publisher.finish("done" if completed else "error")
+
+    async def async_post_call_success_hook(self, data, user_api_key_dict, response):
+        flight = (data.get("metadata") or {}).get(METADATA_KEY) or {}
+        publisher = self._publishers.pop(flight.get("stream"), None)
+        if publisher is not None and flight.get("role") == "leader":
+            content = response.choices[0].message.content if getattr(response, "choices", None) else None
+            if content is None:
+                # Tool calls and other structured results are not replayable.
+                publisher.finish("error")
+            else:
+                publisher.publish("response", content)
+                publisher.finish("done")
+        return response
+
+    async def async_post_call_failure_hook(self, request_data, original_exception, user_api_key_dict, **kwargs):
+        flight = (request_data.get("metadata") or {}).get(METADATA_KEY) or {}
+        publisher = self._publishers.pop(flight.get("stream"), None)
+        if publisher is not None:
+            publisher.finish("error")
+
+    # -------------------------------------------------------------------------
+    # Followers: replay the leader's stream
+    # -------------------------------------------------------------------------
+
+    async def _follow(self, stream):
+        """Yield (kind, payload) entries from the leader's stream until it ends."""
+        loop = asyncio.get_running_loop()
+        key = stream.rsplit(":", 1)[0]
+        last_id = "0-0"
+        deadline = loop.time() + self.idle_timeout
+        orphaned = False
+        while True:
+            # Block in short slices: the shared client has a sub-second
+            # socket timeout. XREAD still returns as soon as an entry lands.
+            entries = await get_redis().xread({stream: last_id}, block=BLOCK_MS, count=256)
+            if not entries:
+                if orphaned:
+                    raise LeaderFailed("leader lease lapsed")
+                if loop.time() > deadline:
+                    raise LeaderFailed(f"no entries for {self.idle_timeout}s")
+                # A finished leader writes its last entry before releasing
+                # the key, so read once more before giving up.
+                orphaned = (await get_redis().get(key) or b"").decode() != stream
+                continue
+            deadline = loop.time() + self.idle_timeout
+            for entry_id, fields in entries[0][1]:
+                last_id = entry_id
+                kind = fields[b"kind"].decode()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise LeaderFailed("leader call failed")
+                yield kind, fields[b"payload"].decode()
+
+    async def _follow_stream(self, stream, request_data):
+        received = False
+        try:
+            async for kind, payload in self._follow(stream):
+                if kind == "chunk":
+                    received = True
+                    yield ModelResponseStream(**json.loads(payload))
+            return
+        except LeaderFailed:
+            if received:
+                raise
+        # Nothing sent yet: make this request's own call instead.
+        await self.counters.incr("fallbacks")
+        request = completion_request(request_data)
+        # Keep the caller's metadata so spend is still attributed to their key.
+        metadata = {**(request_data.get("metadata") or {}), "hook": METADATA_KEY}
+        async for chunk in await get_router().acompletion(**request, stream=True, metadata=metadata):
+            yield chunk
+
+
+class Publisher:
+    """
+    Writes one leader's results to its Redis stream from a background task,
+    so the leader's response never waits on Redis, and renews its lease
+    while the leader's request (owner task) is alive.
+    """
+
+    def __init__(self, key, stream, lease, max_duration, owner, registry):
+        self.key = key
+        self.stream = stream
+        self.lease = lease
+        self.max_duration = max_duration
+        self.owner = owner
+        self.registry = registry
+        self.finished = False
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+        self.heartbeat = asyncio.create_task(self._heartbeat())
+
+    def publish(self, kind, payload):
+        self.queue.put_nowait({"kind": kind, "payload": payload})
+
+    def finish(self, kind):
+        if self.finished:
+            return
+        self.finished = True
+        self.queue.put_nowait({"kind": kind})
+        self.queue.put_nowait(None)
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_duration
+        redis = get_redis()
+        while not self.finished:
+            await asyncio.sleep(self.lease / 3)
+            if self.finished:
+                return
+            if self.owner is None or self.owner.done() or loop.time() > deadline:
+                logger.warning("single-flight leader abandoned: %s", self.stream)
+                self.finish("error")
+                return
+            try:
+                if (await redis.get(self.key) or b"").decode() != self.stream:
+                    return
+                await redis.pexpire(self.key, int(self.lease * 1000))
+            except Exception as e:
+                logger.debug("single-flight lease not renewed: %s", e)
+
+    async def _run(self):
+        redis = get_redis()
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                async with redis.pipeline(transaction=False) as pipe:
+                    for entry in batch:
+                        if entry is not None:
+                            pipe.xadd(self.stream, entry)
+                    pipe.expire(self.stream, STREAM_RETENTION if None in batch else 3600)
+                    await pipe.execute()
+                if None in batch:
+                    return
+        except Exception as e:
+            logger.warning("single-flight publish failed: %s", e)
+            # Followers must not replay a stream with missing entries.
+            try:
+                await redis.xadd(self.stream, {"kind": "error"})
+                await redis.expire(self.stream, STREAM_RETENTION)
+            except Exception as e:
+                logger.warning("single-flight error not published: %s", e)
+        finally:
+            self.finished = True
+            self.heartbeat.cancel()
+            self.registry.pop(self.stream, None)
+            # Release the key only if this leader still holds it.
+            try:
+                if (await redis.get(self.key) or b"").decode() == self.stream:
+                    await redis.delete(self.key)
+            except Exception as e:
+                logger.warning("single-flight release failed: %s", e)
+
+
+proxy_handler_instance = SingleFlight()
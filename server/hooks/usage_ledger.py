@@ -0,0 +1,249 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Batched per-request usage ledger in the proxy's PostgreSQL database.
+
+Writes one row per completed or failed request to traillens_usage_ledger in
+litellm-db. Each row records the model, latency, time to first token, token
+counts, cache hit and caller. Writes never happen on the request path:
+
+1. LiteLLM's logging callbacks put a row on an in-memory queue holding at most
+   USAGE_LEDGER_MAX_BUFFER rows.
+2. A background task flushes the queue with one multi-row INSERT, through
+   LiteLLM's own database client. It flushes when USAGE_LEDGER_BATCH_SIZE
+   rows are queued, or USAGE_LEDGER_FLUSH_INTERVAL seconds after the first
+   row of a batch, whichever comes first.
+3. Failed writes are retried with exponential backoff, up to
+   USAGE_LEDGER_MAX_RETRIES times. While Postgres is slow or down the queue
+   fills up. Logging callbacks then wait up to USAGE_LEDGER_ENQUEUE_TIMEOUT
+   seconds for room, and the row is dropped after that. Memory stays bounded
+   and client requests never wait on the ledger.
+
+Calls the hooks make themselves (embedding_cache's per-text embeddings,
+hedged_requests' hedges, semantic_cache's embeddings, single_flight's
+fallbacks) are recorded too, since they are billed, with the hook's name in
+the hook column. Filter on hook IS NULL to count client requests.
+
+The table is created on first flush. Example:
+
+    SELECT model_group, count(*),
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY ttft_ms) AS p95_ttft_ms,
+           avg(cache_hit::int) AS hit_rate
+    FROM traillens_usage_ledger
+    WHERE created_at > now() - interval '1 hour' AND hook IS NULL
+    GROUP BY 1;
+
+Counters (rows, batches, retries, dropped) are in
+traillens:hooks:stats:usage_ledger.
+"""
+
+import asyncio
+
+from hooks.common import (
+    Counters,
+    env_float,
+    env_int,
+    get_prisma_client,
+    logged_metadata,
+    logger,
+)
+from litellm.integrations.custom_logger import CustomLogger
+
+TABLE = "traillens_usage_ledger"
+
+CREATE_TABLE = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    id BIGSERIAL PRIMARY KEY,
+    request_id TEXT,
+    created_at TIMESTAMPTZ NOT NULL,
+    call_type TEXT,
+    status TEXT NOT NULL,
+    model_group TEXT,
+    model TEXT,
+    caller TEXT,
+    team TEXT,
+    latency_ms DOUBLE PRECISION,
+    ttft_ms DOUBLE PRECISION,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    cache_hit BOOLEAN NOT NULL,
+    cache_source TEXT,
+    spend DOUBLE PRECISION,
+    error TEXT,
+    hook TEXT
+);
+CREATE INDEX IF NOT EXISTS {TABLE}_created_at_idx ON {TABLE} (created_at);
+"""
+
+# Insert order. created_at is passed as epoch seconds.
+COLUMNS = (
+    "request_id",
+    "created_at",
+    "call_type",
+    "status",
+    "model_group",
+    "model",
+    "caller",
+    "team",
+    "latency_ms",
+    "ttft_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "cache_hit",
+    "cache_source",
+    "spend",
+    "error",
+    "hook",
+)
+MAX_ERROR_CHARS = 500
+# Postgres allows 32767 parameters per statement.
+MAX_BATCH_SIZE = 32767 // len(COLUMNS)
+
+
+class UsageLedger(CustomLogger):
+    """Buffer usage rows in memory and write them to Postgres in batches."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_size = min(env_int("USAGE_LEDGER_BATCH_SIZE", 500), MAX_BATCH_SIZE)
+        self.flush_interval = env_float("USAGE_LEDGER_FLUSH_INTERVAL", 2.0)
+        self.max_retries = env_int("USAGE_LEDGER_MAX_RETRIES", 5)
+        self.retry_delay = env_float("USAGE_LEDGER_RETRY_DELAY", 0.5)
+        self.enqueue_timeout = env_float("USAGE_LEDGER_ENQUEUE_TIMEOUT", 1.0)
+        self.queue = asyncio.Queue(maxsize=env_int("USAGE_LEDGER_MAX_BUFFER", 10000))
+        self.counters = Counters("usage_ledger")
+        self._flusher = None
+        self._table_ready = False
+
+    # -------------------------------------------------------------------------
+    # Logging callbacks
+    # -------------------------------------------------------------------------
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        await self._enqueue(kwargs, "success")
+
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        await self._enqueue(kwargs, "failure")
+
+    async def _enqueue(self, kwargs, status):
+        payload = kwargs.get("standard_logging_object")
+        if not payload:
+            return
+        try:
+            row = self._row(payload, logged_metadata(kwargs), status)
+        except Exception as e:
+            logger.warning("usage ledger row skipped: %s", e)
+            return
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        try:
+            await asyncio.wait_for(self.queue.put(row), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            await self.counters.incr("dropped")
+
+    @staticmethod
+    def _row(payload, metadata, status):
+        start, end = payload.get("startTime"), payload.get("endTime")
+        first_token = payload.get("completionStartTime")
+        user = payload.get("metadata") or {}
+        cache_source = _cache_source(payload, metadata)
+        row = {
+            "request_id": payload.get("id"),
+            "created_at": start,
+            "call_type": payload.get("call_type"),
+            "status": status,
+            "model_group": payload.get("model_group"),
+            "model": payload.get("model"),
+            "caller": user.get("user_api_key_alias") or user.get("user_api_key_user_id") or payload.get("end_user"),
+            "team": user.get("user_api_key_team_alias") or user.get("user_api_key_team_id"),
+            "latency_ms": (end - start) * 1000 if start and end else None,
+            # Non-streaming calls report the end time as the first token.
+            "ttft_ms": (first_token - start) * 1000 if payload.get("stream") and start and first_token else None,
+            "prompt_tokens": payload.get("prompt_tokens"),
+            "completion_tokens": payload.get("completion_tokens"),
+            "cache_hit": cache_source is not None,
+            "cache_source": cache_source,
+            "spend": payload.get("response_cost"),
+            "error": (payload.get("error_str") or "")[:MAX_ERROR_CHARS] or None,
+            # Set on calls a hook made itself, not the client.
+            "hook": metadata.get("hook"),
+        }
+        return tuple(row[column] for column in COLUMNS)
+
+    # -------------------------------------------------------------------------
+    # Background flush
+    # -------------------------------------------------------------------------
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            await self._write(batch)
+
+    async def _write(self, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                client = get_prisma_client()
+                if client is None:
+                    raise RuntimeError("database not connected")
+                if not self._table_ready:
+                    for statement in CREATE_TABLE.split(";"):
+                        if statement.strip():
+                            await client.db.execute_raw(statement)
+                    self._table_ready = True
+                query, args = self._insert(batch)
+                await client.db.execute_raw(query, *args)
+                await self.counters.incr("rows", len(batch))
+                await self.counters.incr("batches")
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.warning("usage ledger dropped %d rows: %s", len(batch), e)
+                    await self.counters.incr("dropped", len(batch))
+                    return
+                await self.counters.incr("retries")
+                # The queue keeps filling meanwhile; that is the backpressure.
+                await asyncio.sleep(min(self.retry_delay * 2**attempt, 30))
+
+    @staticmethod
+    def _insert(batch):
+        """One multi-row INSERT with positional parameters."""
+        values, args = [], []
+        for row in batch:
+            placeholders = []
+            for column, value in zip(COLUMNS, row):
+                args.append(value)
+                placeholder = f"${len(args)}"
+                placeholders.append(f"to_timestamp({placeholder})" if column == "created_at" else placeholder)
+            values.append(f"({', '.join(placeholders)})")
+        return f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES {', '.join(values)}", args
+
+
+def _cache_source(payload, metadata):
+    """Which cache answered the request, or None if Bedrock did."""
+    if payload.get("cache_hit"):
+        return "litellm"
+    if (metadata.get("semantic_cache") or {}).get("hit"):
+        return "semantic_cache"
+    if (metadata.get("single_flight") or {}).get("role") == "follower":
+        return "single_flight"
+    embedding = metadata.get("embedding_cache") or {}
+    if embedding and not embedding.get("misses"):
+        return "embedding_cache"
+    return None
+
+
+proxy_handler_instance = UsageLedger()
@@ -0,0 +1,146 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Offline test harness for the LiteLLM proxy hooks (server/hooks).
+
+The hooks run inside the LiteLLM image. Here, Redis is fakeredis and the
+proxy's Router is a FakeRouter, patched into every hook for each test. When
+litellm is not installed, stand-ins for the few classes the hooks import
+from it are registered first, so the suite only needs requirements-test.txt.
+
+Async tests run in a fresh event loop each; no pytest plugin is needed.
+
+Usage (from the server/ directory):
+    pip install -r requirements-test.txt
+    python -m pytest
+"""
+
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import sys
+import types
+
+import pytest
+
+HOOKS = ("embedding_cache", "hedged_requests", "latency_router", "semantic_cache", "single_flight", "usage_ledger")
+
+
+def _stand_in_litellm():
+    """Register minimal litellm modules for the names the hooks import."""
+
+    class CustomLogger:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class ModelResponseStream:
+        def __init__(self, **fields):
+            self.__dict__.update(fields)
+
+        def model_dump_json(self, exclude_none=False):
+            return json.dumps({key: value for key, value in self.__dict__.items() if value is not None or not exclude_none})
+
+    class Usage(dict):
+        def __init__(self, **fields):
+            super().__init__(**fields)
+            self.__dict__.update(fields)
+
+    modules = {
+        name: types.ModuleType(name)
+        for name in (
+            "litellm",
+            "litellm.integrations",
+            "litellm.integrations.custom_logger",
+            "litellm.types",
+            "litellm.types.utils",
+        )
+    }
+    modules["litellm.integrations.custom_logger"].CustomLogger = CustomLogger
+    modules["litellm.types.utils"].ModelResponseStream = ModelResponseStream
+    modules["litellm.types.utils"].Usage = Usage
+    sys.modules.update(modules)
+
+
+if importlib.util.find_spec("litellm") is None:
+    _stand_in_litellm()
+
+import hooks.common as common  # noqa: E402
+
+
+def embed_text(text, dimensions=64):
+    """Deterministic bag-of-words embedding: texts sharing words are similar."""
+    vector = [0.0] * dimensions
+    for word in text.lower().split():
+        vector[int(hashlib.sha256(word.encode()).hexdigest(), 16) % dimensions] += 1.0
+    return vector
+
+
+class FakeRouter:
+    """The parts of litellm.Router the hooks use, recording every call."""
+
+    def __init__(self):
+        self.model_list = []
+        self.embedding_calls = []
+        self.completion_calls = []
+        # Test-provided async function(**kwargs) returning a completion.
+        self.completion = None
+        # Texts whose embedding call raises.
+        self.failing_texts = set()
+
+    def add(self, model_name, deployment_id, **info):
+        self.model_list.append(
+            {
+                "model_name": model_name,
+                "litellm_params": {"model": f"bedrock/{model_name}", "aws_region_name": "ca-central-1"},
+                "model_info": {"id": deployment_id, **info},
+            }
+        )
+
+    def get_model_list(self, model_name=None):
+        return [deployment for deployment in self.model_list if deployment["model_name"] == model_name]
+
+    async def aembedding(self, model, input, **kwargs):
+        self.embedding_calls.append({"model": model, "input": list(input), **kwargs})
+        await asyncio.sleep(0)
+        if self.failing_texts & set(input):
+            raise RuntimeError("embedding failed")
+        data = [{"object": "embedding", "index": index, "embedding": embed_text(text)} for index, text in enumerate(input)]
+        tokens = sum(len(text.split()) for text in input)
+        return types.SimpleNamespace(data=data, usage={"prompt_tokens": tokens, "total_tokens": tokens})
+
+    async def acompletion(self, **kwargs):
+        self.completion_calls.append(kwargs)
+        return await self.completion(**kwargs)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(common, "_redis", client)
+    return client
+
+
+@pytest.fixture
+def router(monkeypatch):
+    fake = FakeRouter()
+    for module in (common, *(importlib.import_module(f"hooks.{name}") for name in HOOKS)):
+        if hasattr(module, "get_router"):
+            monkeypatch.setattr(module, "get_router", lambda: fake)
+    return fake
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run async test functions in a fresh event loop."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
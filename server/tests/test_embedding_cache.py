@@ -0,0 +1,103 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for the per-text embedding cache (hooks/embedding_cache.py).
+"""
+
+import types
+
+import pytest
+from conftest import embed_text
+from hooks.common import pack_f16, unpack_f16
+from hooks.embedding_cache import METADATA_KEY, EmbeddingCache
+
+MODEL = "titan-embed-v2"
+
+
+@pytest.fixture
+def cache(redis, router):
+    router.add(MODEL, "titan-1", embedding_cache=True)
+    return EmbeddingCache()
+
+
+async def _embed(cache, texts, metadata=None):
+    """Run the pre-call and post-call hooks; returns (data, response)."""
+    data = {"model": MODEL, "input": texts, "metadata": dict(metadata or {})}
+    data = await cache.async_pre_call_hook(None, None, data, "aembedding")
+    response = types.SimpleNamespace(data=None, usage=None)
+    if "mock_response" in data:
+        response = await cache.async_post_call_success_hook(data, None, response)
+    return data, response
+
+
+def _rounded(vector):
+    return list(unpack_f16(pack_f16(vector)))
+
+
+async def test_batch_is_split_deduplicated_and_reassembled_in_order(cache, router, redis):
+    await cache._embed_misses({"model": MODEL}, {cache._key({"model": MODEL}, "cached text"): "cached text"}, {})
+    router.embedding_calls.clear()
+    texts = ["alpha beta", "cached text", "alpha beta", "gamma delta epsilon"]
+
+    data, response = await _embed(cache, texts, {"user_api_key_alias": "dev"})
+
+    assert sorted(call["input"][0] for call in router.embedding_calls) == ["alpha beta", "gamma delta epsilon"]
+    assert all(len(call["input"]) == 1 for call in router.embedding_calls)
+    assert [item["index"] for item in response.data] == [0, 1, 2, 3]
+    for item, text in zip(response.data, texts):
+        assert _rounded(item["embedding"]) == _rounded(embed_text(text))
+    assert response.usage["prompt_tokens"] == 5
+    assert data["metadata"][METADATA_KEY]["hits"] == 1
+    assert data["metadata"][METADATA_KEY]["misses"] == 2
+    counters = await cache.counters.snapshot()
+    assert (counters["texts"], counters["hits"], counters["misses"], counters["duplicates"]) == (4, 1, 2, 1)
+
+
+async def test_repeat_batch_is_served_from_the_cache(cache, router):
+    await _embed(cache, ["one two", "three four"])
+    router.embedding_calls.clear()
+
+    data, response = await _embed(cache, ["three four", "one two"])
+
+    assert not router.embedding_calls
+    assert data["metadata"][METADATA_KEY]["misses"] == 0
+    assert _rounded(response.data[0]["embedding"]) == _rounded(embed_text("three four"))
+
+
+async def test_inner_calls_are_billed_and_the_proxy_call_is_not(cache, router):
+    data, _ = await _embed(cache, ["alpha beta"], {"user_api_key_alias": "dev"})
+
+    (call,) = router.embedding_calls
+    assert call["metadata"] == {"user_api_key_alias": "dev", "hook": METADATA_KEY}
+
+    outer = {"litellm_params": {"metadata": data["metadata"]}, "response_cost": 0.5}
+    outer["standard_logging_object"] = {"response_cost": 0.5}
+    outer, _ = await cache.async_logging_hook(outer, None, "aembedding")
+    assert outer["response_cost"] == outer["standard_logging_object"]["response_cost"] == 0.0
+
+    inner = {"litellm_params": {"metadata": call["metadata"]}, "standard_logging_object": {"response_cost": 0.5}}
+    inner, _ = await cache.async_logging_hook(inner, None, "aembedding")
+    assert inner["standard_logging_object"]["response_cost"] == 0.5
+
+
+async def test_failed_text_sends_the_batch_to_bedrock(cache, router, redis):
+    router.failing_texts = {"broken text"}
+    texts = ["alpha beta", "broken text"]
+
+    data, _ = await _embed(cache, texts)
+
+    assert "mock_response" not in data
+    assert data["input"] == texts
+    assert METADATA_KEY not in data["metadata"]
+    assert await redis.get(cache._key(data, "alpha beta")) is not None
+    assert (await cache.counters.snapshot())["errors"] == 1
+
+
+async def test_token_arrays_pass_through(cache, router):
+    data, _ = await _embed(cache, [[1, 2, 3]])
+
+    assert "mock_response" not in data
+    assert not router.embedding_calls
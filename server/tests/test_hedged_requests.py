@@ -0,0 +1,177 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for hedged streaming requests (hooks/hedged_requests.py).
+"""
+
+import asyncio
+
+import pytest
+from hooks.hedged_requests import METADATA_KEY, HedgedRequests
+from litellm.types.utils import ModelResponseStream
+
+MODEL = "claude-sonnet-4-6"
+
+
+class FakeStream:
+    """A streamed completion whose first chunk arrives after `delay` seconds."""
+
+    def __init__(self, name, delay=0.0, chunks=2, model_id=None):
+        self.name = name
+        self.delay = delay
+        self.chunks = [f"{name}-{index}" for index in range(chunks)]
+        self.closed = False
+        self._hidden_params = {"model_id": model_id}
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+            self.delay = 0
+        if self.closed or not self.chunks:
+            raise StopAsyncIteration
+        return ModelResponseStream(id=self.name, text=self.chunks.pop(0))
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def hook(redis, router):
+    router.add(MODEL, "sonnet-1", hedge_percentile=95)
+    router.add(MODEL, "sonnet-2", hedge_percentile=95)
+    hook = HedgedRequests()
+    hook.min_samples = 0
+    hook.min_delay = 0.05
+    hook.loser_timeout = 0.1
+    hook.max_rate = 1.0
+    return hook
+
+
+@pytest.fixture
+def hedge_stream(router):
+    stream = FakeStream("hedge")
+
+    async def completion(**kwargs):
+        return stream
+
+    router.completion = completion
+    return stream
+
+
+async def _request(hook, **fields):
+    data = {"model": MODEL, "messages": [{"role": "user", "content": "hello"}], "stream": True, **fields}
+    return await hook.async_pre_call_hook(None, None, data, "acompletion")
+
+
+async def _texts(hook, primary, data):
+    return [chunk.text async for chunk in hook.async_post_call_streaming_iterator_hook(None, primary, data)]
+
+
+async def _settle():
+    """Let background closes finish, then check nothing is left running."""
+    await asyncio.sleep(0.2)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_primary_that_wins_the_race_closes_the_hedge(hook, router, hedge_stream):
+    hedge_stream.delay = 1.0
+    primary = FakeStream("primary", delay=0.1, model_id="sonnet-1")
+
+    assert await _texts(hook, primary, await _request(hook)) == ["primary-0", "primary-1"]
+
+    assert router.completion_calls[0]["model"] == "sonnet-2"
+    assert router.completion_calls[0]["metadata"]["hook"] == METADATA_KEY
+    await _settle()
+    assert hedge_stream.closed and primary.closed
+    counters = await hook.counters.snapshot()
+    assert (counters["hedged"], counters.get("hedge_wins")) == (1, None)
+
+
+async def test_hedge_that_wins_the_race_is_streamed(hook, router, hedge_stream):
+    primary = FakeStream("primary", delay=1.0, model_id="sonnet-1")
+    data = await _request(hook, stream_options={"include_usage": True}, user="trail-crew")
+
+    assert await _texts(hook, primary, data) == ["hedge-0", "hedge-1"]
+
+    (call,) = router.completion_calls
+    assert call["stream_options"] == {"include_usage": True}
+    assert call["user"] == "trail-crew"
+    await _settle()
+    # The losing primary is closed after HEDGE_LOSER_TIMEOUT.
+    assert primary.closed and hedge_stream.closed
+    assert (await hook.counters.snapshot())["hedge_wins"] == 1
+    assert len(hook.models[MODEL].primary_ttft) == 1
+
+
+async def test_slow_setup_counts_toward_the_delay(hook, router, hedge_stream):
+    data = await _request(hook)
+    assert data["metadata"][METADATA_KEY]["start"] > 0
+    # Bedrock took longer than the hedge delay to accept the request.
+    await asyncio.sleep(0.1)
+    primary = FakeStream("primary", delay=0.03, model_id="sonnet-1")
+
+    assert await _texts(hook, primary, data) == ["hedge-0", "hedge-1"]
+    await _settle()
+
+
+async def test_hedges_are_rate_capped(hook, router, hedge_stream):
+    hook.max_rate = 0
+    primary = FakeStream("primary", delay=0.1, model_id="sonnet-1")
+
+    assert await _texts(hook, primary, await _request(hook)) == ["primary-0", "primary-1"]
+
+    assert not router.completion_calls
+    counters = await hook.counters.snapshot()
+    assert (counters["rate_capped"], counters.get("hedged")) == (1, None)
+
+
+async def test_hedge_rate_holds_from_the_first_request(hook, router):
+    hook.max_rate, hook.window = 0.1, 40
+    # Every primary is slow, as in a regional slowdown right after warm-up.
+    hook._delay = lambda state, percentile: 0.01
+
+    async def completion(**kwargs):
+        return FakeStream("hedge")
+
+    router.completion = completion
+    for _ in range(hook.window):
+        await _texts(hook, FakeStream("primary", delay=0.03, model_id="sonnet-1"), await _request(hook))
+
+    hedged = list(hook.models[MODEL].hedged)
+    assert sum(hedged) == 4
+    assert all(sum(hedged[:count]) <= hook.max_rate * count for count in range(1, len(hedged) + 1))
+    assert (await hook.counters.snapshot())["rate_capped"] == 36
+    await _settle()
+
+
+async def test_disconnect_during_the_race_stops_both_streams(hook, router, hedge_stream):
+    hedge_stream.delay = 1.0
+    primary = FakeStream("primary", delay=1.0, model_id="sonnet-1")
+    stream = hook.async_post_call_streaming_iterator_hook(None, primary, await _request(hook))
+
+    reader = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0.1)
+    assert router.completion_calls
+    reader.cancel()
+    await asyncio.wait({reader})
+
+    assert primary.closed and hedge_stream.closed
+    await _settle()
+
+
+async def test_disconnect_mid_stream_closes_the_winner(hook, router, hedge_stream):
+    primary = FakeStream("primary", chunks=3, model_id="sonnet-1")
+    stream = hook.async_post_call_streaming_iterator_hook(None, primary, await _request(hook))
+
+    assert (await stream.__anext__()).text == "primary-0"
+    await stream.aclose()
+
+    assert primary.closed
+    assert not router.completion_calls
+    await _settle()
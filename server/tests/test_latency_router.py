@@ -0,0 +1,184 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for latency-aware routing (hooks/latency_router.py).
+"""
+
+import asyncio
+import time
+import types
+
+import pytest
+from hooks import latency_router
+from hooks.latency_router import METADATA_KEY, DeploymentStats, LatencyRouter
+
+SONNET = "claude-sonnet-4-6"
+ALTERNATE = "claude-sonnet-4-5"
+
+
+@pytest.fixture
+def hook(redis, router):
+    router.add(SONNET, "sonnet-1", equivalence_group="sonnet")
+    router.add(SONNET, "sonnet-2", equivalence_group="sonnet")
+    router.add(ALTERNATE, "alternate-1", equivalence_group="sonnet")
+    router.add("titan-embed-v2", "titan-1")
+    router.default_calls = []
+
+    async def default_async(**kwargs):
+        router.default_calls.append(kwargs)
+        return "default"
+
+    def default_sync(**kwargs):
+        router.default_calls.append(kwargs)
+        return "default"
+
+    hook = LatencyRouter()
+    hook.explore = 0.0
+    hook._router, hook._default_async, hook._default_sync = router, default_async, default_sync
+    return hook
+
+
+def _members(router):
+    return [deployment for deployment in router.model_list if deployment["model_info"].get("equivalence_group")]
+
+
+def _latencies(hook, **latencies):
+    for deployment_id, latency in latencies.items():
+        hook.stats.setdefault(deployment_id.replace("_", "-"), DeploymentStats()).record_success(latency, hook.alpha)
+
+
+def _failure(deployment_id, status_code):
+    exception = types.SimpleNamespace(status_code=status_code)
+    return {"standard_logging_object": {"model_id": deployment_id}, "exception": exception}
+
+
+def test_ewma_tracks_latency_and_decays_errors():
+    stats = DeploymentStats()
+    stats.record_success(1.0, 0.5)
+    stats.record_success(2.0, 0.5)
+    assert stats.latency == 1.5
+
+    stats.record_failure(0.5, 0)
+    stats.record_failure(0.5, 0)
+    assert (stats.errors, stats.failures) == (0.75, 2)
+    stats.record_success(1.5, 0.5)
+    assert (stats.errors, stats.failures) == (0.375, 0)
+
+
+def test_fastest_deployment_of_the_requested_model_wins(hook, router):
+    _latencies(hook, sonnet_1=0.8, sonnet_2=0.5, alternate_1=0.4)
+
+    deployment, decision = hook._choose(SONNET, _members(router))
+
+    # The alternate is faster, but not by more than ROUTER_ALTERNATE_PENALTY.
+    assert deployment["model_info"]["id"] == "sonnet-2"
+    assert decision["reason"] == "best_score"
+    assert decision["switched"] is False
+    assert decision["scores_ms"]["claude-sonnet-4-5:bedrock/claude-sonnet-4-5@ca-central-1"] == 600.0
+
+
+def test_clearly_faster_alternate_is_chosen(hook, router):
+    _latencies(hook, sonnet_1=1.0, sonnet_2=1.0, alternate_1=0.5)
+
+    deployment, decision = hook._choose(SONNET, _members(router))
+
+    assert deployment["model_name"] == ALTERNATE
+    assert decision["switched"] is True
+
+
+def test_errors_raise_the_score(hook, router):
+    _latencies(hook, sonnet_1=0.5, sonnet_2=0.6, alternate_1=1.0)
+    hook.stats["sonnet-1"].record_failure(hook.alpha, 0)
+
+    deployment, _ = hook._choose(SONNET, _members(router))
+
+    # 0.5 x (1 + 4 x 0.3) = 1.1 against 0.6.
+    assert deployment["model_info"]["id"] == "sonnet-2"
+
+
+def test_unsampled_deployment_scores_as_well_as_the_best(hook, router):
+    _latencies(hook, sonnet_1=0.9, alternate_1=0.3)
+
+    deployment, decision = hook._choose(SONNET, _members(router))
+
+    # sonnet-2 borrows the alternate's 0.3s; the alternate pays the penalty.
+    assert deployment["model_info"]["id"] == "sonnet-2"
+    assert decision["scores_ms"]["claude-sonnet-4-5:bedrock/claude-sonnet-4-5@ca-central-1"] == 450.0
+
+
+def test_exploration_picks_a_random_eligible_deployment(hook, router, monkeypatch):
+    _latencies(hook, sonnet_1=0.1, sonnet_2=5.0, alternate_1=5.0)
+    hook.explore = 1.0
+    monkeypatch.setattr(latency_router.random, "choice", lambda eligible: eligible[-1])
+
+    deployment, decision = hook._choose(SONNET, _members(router))
+
+    assert deployment["model_info"]["id"] == "alternate-1"
+    assert decision["reason"] == "explore"
+
+
+async def test_cooldown_doubles_per_failure_up_to_the_cap(hook, router):
+    hook.cooldown, hook.max_cooldown = 10, 30
+    hook._choose(SONNET, _members(router))
+    cooldowns = []
+    for _ in range(4):
+        await hook.async_log_failure_event(_failure("sonnet-1", 429), None, None, None)
+        cooldowns.append(round(hook.stats["sonnet-1"].cooldown_until - time.monotonic()))
+
+    assert cooldowns == [10, 20, 30, 30]
+    assert (await hook.counters.snapshot())["cooldowns"] == 4
+
+    await hook.async_log_failure_event(_failure("sonnet-2", 400), None, None, None)
+    assert hook.stats["sonnet-2"].cooldown_until == 0.0
+
+
+@pytest.mark.parametrize("status_code", [408, 503])
+async def test_timeouts_and_server_errors_cool_down(hook, router, status_code):
+    hook._choose(SONNET, _members(router))
+
+    await hook.async_log_failure_event(_failure("sonnet-1", status_code), None, None, None)
+
+    assert round(hook.stats["sonnet-1"].cooldown_until - time.monotonic()) == hook.cooldown
+    deployment, decision = hook._choose(SONNET, _members(router))
+    assert deployment["model_info"]["id"] != "sonnet-1"
+    assert len(decision["cooling_down"]) == 1
+
+
+def test_cooling_deployments_are_skipped_until_all_are(hook, router):
+    _latencies(hook, sonnet_1=0.1, sonnet_2=0.2, alternate_1=0.3)
+    now = time.monotonic()
+    hook.stats["sonnet-1"].cooldown_until = now + 60
+
+    deployment, decision = hook._choose(SONNET, _members(router))
+    assert deployment["model_info"]["id"] == "sonnet-2"
+    assert len(decision["cooling_down"]) == 1
+
+    hook.stats["sonnet-2"].cooldown_until = now + 30
+    hook.stats["alternate-1"].cooldown_until = now + 90
+    deployment, decision = hook._choose(SONNET, _members(router))
+    assert deployment["model_info"]["id"] == "sonnet-2"
+    assert decision["reason"] == "all_cooling_down"
+
+
+async def test_grouped_request_records_its_decision(hook, router, redis):
+    request_kwargs = {"metadata": {}}
+
+    deployment = await hook.async_get_available_deployment(SONNET, request_kwargs=request_kwargs)
+    await asyncio.sleep(0.05)
+
+    assert request_kwargs["metadata"][METADATA_KEY]["chosen"] == latency_router._label(deployment)
+    assert await redis.llen(latency_router.DECISIONS_KEY) == 1
+    assert not router.default_calls
+
+
+async def test_other_requests_pass_extra_arguments_to_the_default(hook, router):
+    span = object()
+
+    assert await hook.async_get_available_deployment("titan-embed-v2", parent_otel_span=span) == "default"
+    assert hook.get_available_deployment(SONNET, specific_deployment=True, parent_otel_span=span) == "default"
+
+    assert [call["parent_otel_span"] for call in router.default_calls] == [span, span]
+    assert router.default_calls[0]["request_kwargs"] == {}
@@ -0,0 +1,125 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for the semantic response cache (hooks/semantic_cache.py).
+"""
+
+import types
+
+import pytest
+from hooks.semantic_cache import METADATA_KEY, SemanticCache
+
+MODEL = "claude-haiku-4-5"
+PROMPT = "how do I reverse a list in python"
+
+
+@pytest.fixture
+def cache(redis, router):
+    router.add(MODEL, "haiku-1", semantic_cache_threshold=0.9)
+    return SemanticCache()
+
+
+def _request(prompt, history=(), **fields):
+    messages = [*history, {"role": "user", "content": prompt}]
+    return {"model": MODEL, "messages": messages, **fields}
+
+
+def _response(content):
+    choice = types.SimpleNamespace(message=types.SimpleNamespace(content=content), finish_reason="stop")
+    return types.SimpleNamespace(choices=[choice])
+
+
+async def _complete(cache, data, content):
+    """Run the pre-call hook and, unless it hit, the success callback."""
+    data = await cache.async_pre_call_hook(None, None, data, "acompletion")
+    if "mock_response" not in data:
+        await cache.async_log_success_event({"litellm_params": {"metadata": data["metadata"]}}, _response(content), 0, 1)
+    return data
+
+
+def test_scope_ignores_whitespace_and_the_last_message():
+    history = [{"role": "system", "content": "You are  terse.\n"}]
+    scope = SemanticCache._scope(_request(PROMPT, history))
+
+    assert SemanticCache._scope(_request("something else", [{"role": "system", "content": "You are terse."}])) == scope
+    assert SemanticCache._scope(_request(PROMPT, history, metadata={"user": "a"}, stream=True)) == scope
+    assert SemanticCache._scope(_request(PROMPT, [{"role": "system", "content": "You are verbose."}])) != scope
+    assert SemanticCache._scope(_request(PROMPT, history, temperature=0.2)) != scope
+    assert SemanticCache._scope({**_request(PROMPT, history), "model": "claude-sonnet-4-6"}) != scope
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        _request(PROMPT, tools=[{"type": "function"}]),
+        _request(PROMPT, n=2),
+        _request(PROMPT, cache={"no-cache": True}),
+        {"model": MODEL, "messages": [{"role": "user", "content": PROMPT}, {"role": "assistant", "content": "x"}]},
+        _request("   "),
+    ],
+)
+def test_uncacheable_requests(data):
+    assert SemanticCache._cacheable_prompt(data) is None
+
+
+async def test_empty_scope_is_not_embedded_on_the_request_path(cache, router, redis):
+    data = await cache.async_pre_call_hook(None, None, _request(PROMPT), "acompletion")
+
+    assert not router.embedding_calls
+    entry = data["metadata"][METADATA_KEY]
+    assert set(entry) == {"hit", "scope", "entry"}
+    pending = await redis.hgetall(cache._pending_key(entry["scope"], entry["entry"]))
+    assert pending == {b"prompt": PROMPT.encode()}
+
+    await cache.async_log_success_event({"litellm_params": {"metadata": data["metadata"]}}, _response("reversed"), 0, 1)
+
+    assert [call["input"] for call in router.embedding_calls] == [[PROMPT]]
+    assert router.embedding_calls[0]["metadata"] == {"hook": METADATA_KEY}
+    vectors_key, responses_key, _ = cache._keys(entry["scope"])
+    assert await redis.hkeys(vectors_key) == [entry["entry"].encode()]
+    assert not await redis.exists(cache._pending_key(entry["scope"], entry["entry"]))
+
+
+async def test_similar_prompt_hits_and_dissimilar_prompt_misses(cache, router):
+    await _complete(cache, _request(PROMPT), "use reversed()")
+
+    hit = await _complete(cache, _request(PROMPT + " please"), "unused")
+    assert hit["mock_response"] == "use reversed()"
+    assert hit["metadata"][METADATA_KEY]["hit"] is True
+    assert hit["metadata"][METADATA_KEY]["similarity"] >= 0.9
+
+    miss = await _complete(cache, _request("what is the capital of france"), "Paris")
+    assert "mock_response" not in miss
+    assert miss["metadata"][METADATA_KEY]["hit"] is False
+
+
+async def test_miss_in_a_populated_scope_parks_the_vector(cache, router, redis):
+    await _complete(cache, _request(PROMPT), "use reversed()")
+    router.embedding_calls.clear()
+
+    data = await cache.async_pre_call_hook(None, None, _request("explain python decorators"), "acompletion")
+    entry = data["metadata"][METADATA_KEY]
+    pending = await redis.hgetall(cache._pending_key(entry["scope"], entry["entry"]))
+    assert set(pending) == {b"vector"}
+
+    await cache.async_log_success_event({"litellm_params": {"metadata": data["metadata"]}}, _response("wraps"), 0, 1)
+    # Stored from the parked vector, without embedding again.
+    assert len(router.embedding_calls) == 1
+
+
+async def test_least_recently_used_entry_is_evicted(cache, redis):
+    cache.max_entries = 2
+    prompts = ["reverse a python list", "sort a dictionary by value", "read a csv file with pandas"]
+    await _complete(cache, _request(prompts[0]), "first")
+    await _complete(cache, _request(prompts[1]), "second")
+    # A hit refreshes the first entry, so the second is now the oldest.
+    assert (await _complete(cache, _request(prompts[0]), "unused"))["mock_response"] == "first"
+    await _complete(cache, _request(prompts[2]), "third")
+
+    assert (await _complete(cache, _request(prompts[0]), "unused"))["mock_response"] == "first"
+    assert (await _complete(cache, _request(prompts[2]), "unused"))["mock_response"] == "third"
+    assert "mock_response" not in await _complete(cache, _request(prompts[1]), "again")
+    assert int((await redis.hget(cache.counters.key, "evictions")) or 0) >= 1
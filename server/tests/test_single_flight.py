@@ -0,0 +1,195 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for single-flight coalescing (hooks/single_flight.py).
+"""
+
+import asyncio
+import types
+
+import pytest
+from hooks.single_flight import METADATA_KEY, SingleFlight
+from litellm.types.utils import ModelResponseStream
+
+MODEL = "claude-haiku-4-5"
+
+
+@pytest.fixture
+def flight(redis, router):
+    router.add(MODEL, "haiku-1", single_flight=True)
+    hook = SingleFlight()
+    hook.lease = 0.3
+    hook.idle_timeout = 5
+    return hook
+
+
+def _request(stream=False):
+    return {"model": MODEL, "messages": [{"role": "user", "content": "review this diff"}], "stream": stream}
+
+
+def _response(content):
+    message = types.SimpleNamespace(content=content)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+async def _leader(flight, data):
+    """Claim the flight from a task that stays alive until the returned event is set."""
+    claimed, release = asyncio.Event(), asyncio.Event()
+
+    async def request():
+        await flight.async_pre_call_hook(None, None, data, "acompletion")
+        claimed.set()
+        await release.wait()
+
+    task = asyncio.create_task(request())
+    await claimed.wait()
+    assert data["metadata"][METADATA_KEY]["role"] == "leader"
+    return task, release
+
+
+async def _chunks(*texts):
+    for text in texts:
+        yield ModelResponseStream(id="leader", text=text)
+
+
+async def test_follower_is_answered_with_the_leaders_response(flight, redis):
+    leader = _request()
+    task, release = await _leader(flight, leader)
+
+    follower = asyncio.create_task(flight.async_pre_call_hook(None, None, _request(), "acompletion"))
+    await asyncio.sleep(0.05)
+    await flight.async_post_call_success_hook(leader, None, _response("looks good"))
+    data = await asyncio.wait_for(follower, 2)
+    release.set()
+    await task
+
+    assert data["mock_response"] == "looks good"
+    assert data["metadata"][METADATA_KEY]["role"] == "follower"
+    await asyncio.sleep(0.05)
+    assert not await redis.exists(leader["metadata"][METADATA_KEY]["key"])
+
+
+async def test_streaming_follower_replays_every_chunk(flight):
+    leader = _request(stream=True)
+    task, release = await _leader(flight, leader)
+    follower = await flight.async_pre_call_hook(None, None, _request(stream=True), "acompletion")
+    assert follower["metadata"][METADATA_KEY]["role"] == "follower"
+
+    sent = [chunk.text async for chunk in flight.async_post_call_streaming_iterator_hook(None, _chunks("a", "b"), leader)]
+    replayed = [
+        chunk.text async for chunk in flight.async_post_call_streaming_iterator_hook(None, _chunks("unused"), follower)
+    ]
+    release.set()
+    await task
+
+    assert sent == replayed == ["a", "b"]
+
+
+async def test_follower_falls_back_when_the_leader_fails(flight):
+    leader = _request()
+    task, release = await _leader(flight, leader)
+
+    follower = asyncio.create_task(flight.async_pre_call_hook(None, None, _request(), "acompletion"))
+    await asyncio.sleep(0.05)
+    await flight.async_post_call_failure_hook(leader, RuntimeError("throttled"), None)
+    data = await asyncio.wait_for(follower, 2)
+    release.set()
+    await task
+
+    assert "mock_response" not in data
+    assert data["metadata"][METADATA_KEY]["role"] == "fallback"
+
+
+async def test_streaming_follower_falls_back_with_the_callers_fields(flight, router):
+    async def completion(**kwargs):
+        return _chunks("own")
+
+    router.completion = completion
+    leader = _request(stream=True)
+    task, release = await _leader(flight, leader)
+    caller = {"stream_options": {"include_usage": True}, "user": "trail-crew", "metadata": {"user_api_key_alias": "dev"}}
+    follower = await flight.async_pre_call_hook(None, None, {**_request(stream=True), **caller}, "acompletion")
+
+    replay = flight.async_post_call_streaming_iterator_hook(None, _chunks("unused"), follower)
+    reader = asyncio.create_task(replay.__anext__())
+    await asyncio.sleep(0.05)
+    await flight.async_post_call_failure_hook(leader, RuntimeError("throttled"), None)
+    first = await asyncio.wait_for(reader, 2)
+    release.set()
+    await task
+
+    assert first.text == "own"
+    (call,) = router.completion_calls
+    assert call["stream_options"] == {"include_usage": True}
+    assert call["user"] == "trail-crew"
+    assert call["metadata"]["user_api_key_alias"] == "dev"
+    assert call["metadata"]["hook"] == METADATA_KEY
+
+
+async def test_abandoned_leader_releases_its_followers(flight, redis):
+    leader = _request()
+    task, release = await _leader(flight, leader)
+    follower = asyncio.create_task(flight.async_pre_call_hook(None, None, _request(), "acompletion"))
+
+    # The client disconnects: the leader's request ends without a result.
+    release.set()
+    await task
+    data = await asyncio.wait_for(follower, 2)
+
+    assert data["metadata"][METADATA_KEY]["role"] == "fallback"
+    await asyncio.sleep(0.05)
+    assert not await redis.exists(leader["metadata"][METADATA_KEY]["key"])
+    assert not flight._publishers
+
+
+async def test_lapsed_lease_releases_followers_before_the_idle_timeout(flight, redis):
+    leader = _request()
+    task, release = await _leader(flight, leader)
+    # The leader's worker dies: nothing renews or releases the lease.
+    publisher = flight._publishers.pop(leader["metadata"][METADATA_KEY]["stream"])
+    publisher.heartbeat.cancel()
+    publisher.task.cancel()
+    await asyncio.sleep(0)
+    await redis.set(publisher.key, publisher.stream, px=300)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    data = await asyncio.wait_for(flight.async_pre_call_hook(None, None, _request(), "acompletion"), 2)
+    release.set()
+    await task
+
+    assert data["metadata"][METADATA_KEY]["role"] == "fallback"
+    assert loop.time() - start < flight.idle_timeout
+
+
+async def test_heartbeat_renews_the_lease_of_a_live_leader(flight, redis):
+    leader = _request()
+    task, release = await _leader(flight, leader)
+    key = leader["metadata"][METADATA_KEY]["key"]
+
+    await asyncio.sleep(flight.lease * 3)
+    assert await redis.exists(key)
+
+    await flight.async_post_call_success_hook(leader, None, _response("done"))
+    release.set()
+    await task
+
+
+async def test_publish_failure_is_published_as_an_error(flight, redis, monkeypatch):
+    def broken_pipeline(*args, **kwargs):
+        raise ConnectionError("redis went away")
+
+    leader = _request()
+    task, release = await _leader(flight, leader)
+    follower = asyncio.create_task(flight.async_pre_call_hook(None, None, _request(), "acompletion"))
+    await asyncio.sleep(0.05)
+    monkeypatch.setattr(redis, "pipeline", broken_pipeline)
+    await flight.async_post_call_success_hook(leader, None, _response("lost"))
+    data = await asyncio.wait_for(follower, 2)
+    release.set()
+    await task
+
+    assert data["metadata"][METADATA_KEY]["role"] == "fallback"
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 TrailLensCo
+# All rights reserved.
+#
+# This file is proprietary and confidential.
+
+"""
+Tests for the batched usage ledger (hooks/usage_ledger.py).
+"""
+
+import asyncio
+import types
+
+import pytest
+from hooks import usage_ledger
+from hooks.usage_ledger import COLUMNS, TABLE, UsageLedger
+
+
+class FakeDatabase:
+    """Records execute_raw calls; fails the first `failures` inserts."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.inserts = []
+        self.gate = None
+
+    async def execute_raw(self, query, *args):
+        if not query.startswith("INSERT"):
+            return 0
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.inserts.append((query, args))
+        return len(args) // len(COLUMNS)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    fake = FakeDatabase()
+    monkeypatch.setattr(usage_ledger, "get_prisma_client", lambda: types.SimpleNamespace(db=fake))
+    return fake
+
+
+@pytest.fixture
+def ledger(redis, database, monkeypatch):
+    monkeypatch.setenv("USAGE_LEDGER_BATCH_SIZE", "3")
+    monkeypatch.setenv("USAGE_LEDGER_FLUSH_INTERVAL", "0.05")
+    monkeypatch.setenv("USAGE_LEDGER_RETRY_DELAY", "0.01")
+    monkeypatch.setenv("USAGE_LEDGER_MAX_RETRIES", "2")
+    return UsageLedger()
+
+
+def _kwargs(request_id, metadata=None, **payload):
+    standard = {
+        "id": request_id,
+        "call_type": "acompletion",
+        "model_group": "claude-haiku-4-5",
+        "model": "bedrock/claude-haiku-4-5",
+        "startTime": 1760000000.0,
+        "endTime": 1760000001.5,
+        "completionStartTime": 1760000000.25,
+        "stream": True,
+        "prompt_tokens": 10,
+        "completion_tokens": 20,
+        "response_cost": 0.001,
+        "metadata": {"user_api_key_alias": "dev"},
+        **payload,
+    }
+    return {"standard_logging_object": standard, "litellm_params": {"metadata": metadata or {}}}
+
+
+async def _drain(ledger):
+    while not ledger.queue.empty():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+
+
+def _rows(database):
+    rows = []
+    for _, args in database.inserts:
+        rows.extend(dict(zip(COLUMNS, args[index : index + len(COLUMNS)])) for index in range(0, len(args), len(COLUMNS)))
+    return rows
+
+
+async def test_rows_are_written_in_batches(ledger, database):
+    for index in range(7):
+        await ledger.async_log_success_event(_kwargs(f"req-{index}"), None, None, None)
+    await _drain(ledger)
+
+    assert [len(args) // len(COLUMNS) for _, args in database.inserts] == [3, 3, 1]
+    query, args = database.inserts[0]
+    assert query.startswith(f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES ($1, to_timestamp($2), ")
+    assert query.count("to_timestamp(") == 3
+    assert f"${len(args)})" in query
+    row = _rows(database)[0]
+    assert (row["request_id"], row["caller"], row["status"]) == ("req-0", "dev", "success")
+    assert row["latency_ms"] == 1500.0
+    assert row["ttft_ms"] == 250.0
+    assert row["hook"] is None
+    counters = await ledger.counters.snapshot()
+    assert (counters["rows"], counters["batches"]) == (7, 3)
+    ledger._flusher.cancel()
+
+
+async def test_hook_calls_are_tagged(ledger, database):
+    await ledger.async_log_success_event(_kwargs("client"), None, None, None)
+    await ledger.async_log_success_event(_kwargs("inner", metadata={"hook": "embedding_cache"}), None, None, None)
+    await _drain(ledger)
+
+    assert {row["request_id"]: row["hook"] for row in _rows(database)} == {"client": None, "inner": "embedding_cache"}
+    ledger._flusher.cancel()
+
+
+async def test_failed_writes_are_retried_with_backoff(ledger, database):
+    database.failures = 2
+    await ledger.async_log_success_event(_kwargs("req"), None, None, None)
+    await _drain(ledger)
+
+    assert [row["request_id"] for row in _rows(database)] == ["req"]
+    counters = await ledger.counters.snapshot()
+    assert counters["retries"] == 2
+    assert "dropped" not in counters
+    ledger._flusher.cancel()
+
+
+async def test_batch_is_dropped_after_the_last_retry(ledger, database):
+    database.failures = 3
+    await ledger.async_log_failure_event(_kwargs("req", error_str="throttled"), None, None, None)
+    await _drain(ledger)
+
+    assert not database.inserts
+    counters = await ledger.counters.snapshot()
+    assert (counters["retries"], counters["dropped"]) == (2, 1)
+    ledger._flusher.cancel()
+
+
+async def test_rows_are_dropped_when_the_buffer_is_full(redis, database, monkeypatch):
+    monkeypatch.setenv("USAGE_LEDGER_BATCH_SIZE", "2")
+    monkeypatch.setenv("USAGE_LEDGER_FLUSH_INTERVAL", "0.05")
+    monkeypatch.setenv("USAGE_LEDGER_MAX_BUFFER", "3")
+    monkeypatch.setenv("USAGE_LEDGER_ENQUEUE_TIMEOUT", "0.01")
+    ledger = UsageLedger()
+    database.gate = asyncio.Event()
+
+    for index in range(10):
+        await ledger.async_log_success_event(_kwargs(f"req-{index}"), None, None, None)
+    # The flusher holds one batch while Postgres is stalled; the queue holds the rest.
+    dropped = (await ledger.counters.snapshot())["dropped"]
+    assert dropped == 10 - 2 - 3
+
+    database.gate.set()
+    await _drain(ledger)
+    assert len(_rows(database)) == 5
+    ledger._flusher.cancel()